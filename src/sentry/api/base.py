@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import functools
 import logging
+import random
 import time
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 from typing import Any, Callable, Iterable, List, Mapping, Optional, Type
 
@@ -19,16 +21,17 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from sentry import analytics, tsdb
+from sentry import analytics, options, tsdb
 from sentry.apidocs.hooks import HTTP_METHODS_SET
 from sentry.auth import access
 from sentry.models import Environment
 from sentry.ratelimits.config import DEFAULT_RATE_LIMIT_CONFIG, RateLimitConfig
 from sentry.silo import SiloLimit, SiloMode
-from sentry.utils import json
+from sentry.utils import json, metrics
 from sentry.utils.audit import create_audit_entry
 from sentry.utils.cursors import Cursor
 from sentry.utils.dates import to_datetime
+from sentry.utils.db import count_queries
 from sentry.utils.http import is_valid_origin, origin_from_request
 from sentry.utils.sdk import capture_exception
 
@@ -298,12 +301,22 @@ class Endpoint(APIView):
                     # setup default access
                     request.access = access.from_request(request)
 
+            # Serializer lookups make up most of the queries of many endpoints, so tracking the
+            # number of queries per endpoint surfaces N+1 regressions.
+            count_db_queries = random.random() < options.get("api.endpoint-query-count.sample-rate")
             with sentry_sdk.start_span(
                 op="base.dispatch.execute",
                 description=f"{type(self).__name__}.{handler.__name__}",
-            ):
+            ), (count_queries() if count_db_queries else nullcontext()) as query_counter:
                 response = handler(request, *args, **kwargs)
 
+            if query_counter is not None:
+                metrics.timing(
+                    "api.endpoint.db_queries",
+                    query_counter.count,
+                    tags={"endpoint": type(self).__name__, "method": request.method},
+                )
+
         except Exception as exc:
             response = self.handle_exception(request, exc)
 
@@ -2,6 +2,7 @@ import re
 from collections import namedtuple
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, List, Mapping, NamedTuple, Sequence, Set, Tuple, Union
 
 from django.utils.functional import cached_property
@@ -1135,6 +1136,18 @@ default_config = SearchConfig(
 )
 
 
+@lru_cache(maxsize=1000)
+def _parse_search_grammar(query: str) -> Node:
+    """
+    Parse trees only depend on the query string and are not modified by the
+    visitor, so they're memoized for queries that are run over and over again,
+    eg. by dashboard widgets and alert subscriptions. Resolving the parse tree
+    still happens per request, since it depends on the params and the current
+    time.
+    """
+    return event_search_grammar.parse(query)
+
+
 def parse_search_query(
     query, config=None, params=None, builder=None, config_overrides=None
 ) -> Sequence[SearchFilter]:
@@ -1142,7 +1155,7 @@ def parse_search_query(
         config = default_config
 
     try:
-        tree = event_search_grammar.parse(query)
+        tree = _parse_search_grammar(query)
     except IncompleteParseError as e:
         idx = e.column()
         prefix = query[max(0, idx - 5) : idx]
@@ -9,9 +9,11 @@ from rest_framework.response import Response
 
 from sentry import eventstream
 from sentry.api.base import audit_logger
+from sentry.grouping import grouphash_cache
 from sentry.issues.grouptype import GroupCategory
 from sentry.models import Group, GroupHash, GroupInbox, GroupStatus, Project
 from sentry.signals import issue_deleted
+from sentry.tagstore import summaries as tagstore_summaries
 from sentry.tasks.deletion import delete_groups as delete_groups_task
 from sentry.utils.audit import create_audit_entry
 
@@ -42,6 +44,9 @@ def delete_group_list(
     eventstream_state = eventstream.start_delete_groups(project.id, group_ids)
     transaction_id = uuid4().hex
 
+    grouphash_cache.invalidate_groups(group_ids)
+    tagstore_summaries.reset_projects([project.id])
+
     # We do not want to delete split hashes as they are necessary for keeping groups... split.
     GroupHash.objects.filter(
         project_id=project.id, group__id__in=group_ids, state=GroupHash.State.SPLIT
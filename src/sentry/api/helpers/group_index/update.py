@@ -17,6 +17,7 @@ from sentry import analytics, eventstream, features
 from sentry.api.serializers import serialize
 from sentry.api.serializers.models.actor import ActorSerializer
 from sentry.db.models.query import create_or_update
+from sentry.grouping import grouphash_cache
 from sentry.issues.grouptype import GroupCategory
 from sentry.models import (
     TOMBSTONE_FIELDS_FROM_GROUP,
@@ -99,6 +100,7 @@ def handle_discard(
             else:
                 groups_to_delete[group.project_id].append(group)
 
+                grouphash_cache.invalidate_groups([group.id])
                 GroupHash.objects.filter(group=group).update(
                     group=None, group_tombstone_id=tombstone.id
                 )
@@ -0,0 +1,114 @@
+"""
+Request-scoped batching and deduplication of serializer lookups.
+
+Serializers are frequently nested (e.g. a list of groups serializes the assigned users and teams, and the same
+users show up again as resolution or ignore actors). Each of them runs its own ``get_attrs`` and thereby repeats
+lookups that were already done for the same response. A ``Loader`` wraps a batch function that fetches many
+objects by key at once and remembers the results, so that only keys which have not been seen yet are fetched.
+
+Within a request, loaders are shared through ``get_loader`` and discarded once the request (or task) finishes.
+Outside of a request a fresh loader is returned, so that nothing is cached across unrelated work.
+"""
+
+import threading
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    TypeVar,
+)
+
+from celery.signals import task_failure, task_success
+from django.core.signals import request_finished
+
+from sentry import app
+from sentry.utils import metrics
+
+__all__ = ["Loader", "get_loader", "clear_loaders"]
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_local = threading.local()
+
+
+class Loader(Generic[K, V]):
+    """
+    Batches lookups by key through ``batch_fn`` and memoizes the results.
+
+    ``batch_fn`` receives a list of keys which have not been loaded yet and returns a mapping from key to value.
+    Keys missing from the returned mapping are remembered as missing and not fetched again.
+    """
+
+    def __init__(self, name: str, batch_fn: Callable[[List[K]], Mapping[K, V]]) -> None:
+        self.name = name
+        self.batch_fn = batch_fn
+        self._values: Dict[K, V] = {}
+        self._missing: Set[K] = set()
+
+    def prime(self, key: K, value: V) -> None:
+        """Stores a value that was already loaded by other means."""
+        self._values[key] = value
+        self._missing.discard(key)
+
+    def load_many(self, keys: Iterable[K]) -> Dict[K, V]:
+        """Returns the values of all given keys that exist, fetching unknown keys in a single batch."""
+        keys = list(dict.fromkeys(keys))
+        pending = [key for key in keys if key not in self._values and key not in self._missing]
+
+        if pending:
+            loaded = self.batch_fn(pending)
+            self._values.update(loaded)
+            self._missing.update(key for key in pending if key not in loaded)
+
+        hits = len(keys) - len(pending)
+        if hits:
+            metrics.incr(
+                "api.serializers.loader.keys", amount=hits, tags={"loader": self.name, "hit": True}
+            )
+        if pending:
+            metrics.incr(
+                "api.serializers.loader.keys",
+                amount=len(pending),
+                tags={"loader": self.name, "hit": False},
+            )
+
+        return {key: self._values[key] for key in keys if key in self._values}
+
+    def load(self, key: K) -> Optional[V]:
+        return self.load_many([key]).get(key)
+
+
+def get_loader(name: str, batch_fn: Callable[[List[Any]], Mapping[Any, Any]]) -> Loader[Any, Any]:
+    """
+    Returns the loader registered under ``name`` for the current request, creating it with ``batch_fn`` if needed.
+
+    The name identifies the loaded data, so all callers using the same name must return the same values for a key.
+    """
+    if app.env.request is None:
+        return Loader(name, batch_fn)
+
+    loaders = getattr(_local, "loaders", None)
+    if loaders is None:
+        loaders = _local.loaders = {}
+
+    loader = loaders.get(name)
+    if loader is None:
+        loader = loaders[name] = Loader(name, batch_fn)
+    return loader
+
+
+def clear_loaders(**kwargs: Any) -> None:
+    _local.loaders = {}
+
+
+request_finished.connect(clear_loaders)
+task_failure.connect(clear_loaders)
+task_success.connect(clear_loaders)
@@ -28,6 +28,7 @@ from django.db.models import Min, prefetch_related_objects
 
 from sentry import analytics, tagstore
 from sentry.api.serializers import Serializer, register, serialize
+from sentry.api.serializers.loader import get_loader
 from sentry.api.serializers.models.actor import ActorSerializer
 from sentry.api.serializers.models.plugin import is_plugin_deprecated
 from sentry.api.serializers.models.user import UserSerializerResponse
@@ -92,6 +93,32 @@ def merge_list_dictionaries(
         dict1.setdefault(key, []).extend(val)
 
 
+def _load_teams(team_ids: Iterable[int]) -> Mapping[int, Team]:
+    return get_loader(
+        "teams", lambda ids: {team.id: team for team in Team.objects.filter(id__in=ids)}
+    ).load_many(team_ids)
+
+
+def _load_users(user_ids: Iterable[int]) -> Mapping[int, Any]:
+    return get_loader(
+        "users",
+        lambda ids: {user.id: user for user in user_service.get_many(filter=dict(user_ids=ids))},
+    ).load_many(user_ids)
+
+
+def _load_serialized_active_users(user_ids: Iterable[int], as_user: Any) -> Mapping[int, Any]:
+    # The serialized representation depends on the user it is serialized for.
+    return get_loader(
+        f"serialized_active_users:{getattr(as_user, 'id', None)}",
+        lambda ids: {
+            int(u["id"]): u
+            for u in user_service.serialize_many(
+                filter={"user_ids": ids, "is_active": True}, as_user=as_user
+            )
+        },
+    ).load_many(user_ids)
+
+
 class GroupStatusDetailsResponseOptional(TypedDict, total=False):
     autoResolved: bool
     ignoreCount: int
@@ -195,11 +222,11 @@ class GroupSerializerBase(Serializer, ABC):
             if g.user_id:
                 all_user_ids[g.user_id].add(g.group_id)
 
-        for team in Team.objects.filter(id__in=all_team_ids.keys()):
-            for group_id in all_team_ids[team.id]:
+        for team_id, team in _load_teams(all_team_ids.keys()).items():
+            for group_id in all_team_ids[team_id]:
                 result[group_id] = team
-        for user in user_service.get_many(filter=dict(user_ids=list(all_user_ids.keys()))):
-            for group_id in all_user_ids[user.id]:
+        for user_id, user in _load_users(all_user_ids.keys()).items():
+            for group_id in all_user_ids[user_id]:
                 result[group_id] = user
 
         return result
@@ -238,14 +265,7 @@ class GroupSerializerBase(Serializer, ABC):
 
         actor_ids = {r[-1] for r in release_resolutions.values()}
         actor_ids.update(r.actor_id for r in ignore_items.values())
-        if actor_ids:
-            serialized_users = user_service.serialize_many(
-                filter={"user_ids": actor_ids, "is_active": True},
-                as_user=user,
-            )
-            actors = {id: u for id, u in zip(actor_ids, serialized_users)}
-        else:
-            actors = {}
+        actors = _load_serialized_active_users(actor_ids, as_user=user) if actor_ids else {}
 
         share_ids = dict(
             GroupShare.objects.filter(group__in=item_list).values_list("group_id", "uuid")
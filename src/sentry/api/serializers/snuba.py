@@ -347,6 +347,9 @@ class SnubaTSResultSerializer(BaseSnubaSerializer):
         elif "order" in result.data:
             res["order"] = result.data["order"]
         res["isMetricsData"] = result.data.get("isMetricsData", False)
+        # Partial results list the queries which are missing from them
+        if result.data.get("errors"):
+            res["errors"] = result.data["errors"]
 
         if hasattr(result, "start") and hasattr(result, "end"):
             timeframe = calculate_time_frame(result.start, result.end, result.rollup)
@@ -1644,6 +1644,14 @@ SENTRY_NODESTORE_OPTIONS = {}
 SENTRY_TAGSTORE = os.environ.get("SENTRY_TAGSTORE", "sentry.tagstore.snuba.SnubaTagStorage")
 SENTRY_TAGSTORE_OPTIONS = {}
 
+# Which cluster is used to store materialized tag summaries, see
+# ``sentry.tagstore.summaries``.
+SENTRY_TAGSTORE_SUMMARIES_REDIS_CLUSTER = "default"
+
+# Which cluster is used to store the deadlines of cron monitors, see
+# ``sentry.monitors.schedule``.
+SENTRY_MONITORS_SCHEDULE_REDIS_CLUSTER = "default"
+
 # Search backend
 SENTRY_SEARCH = os.environ.get(
     "SENTRY_SEARCH", "sentry.search.snuba.EventsDatasetSnubaSearchBackend"
@@ -4,6 +4,7 @@ from sentry.api.utils import get_date_range_from_params
 from sentry.models import Environment, Group, Project
 from sentry.search.events.fields import get_function_alias
 from sentry.snuba import discover
+from sentry.utils.snuba import bulk_snql_query
 
 from ..base import ExportError
 
@@ -42,6 +43,13 @@ class DiscoverProcessor:
             params=self.params,
             sort=discover_query.get("sort"),
         )
+        self.bulk_data_fn = self.get_bulk_data_fn(
+            fields=discover_query["field"],
+            equations=equations,
+            query=discover_query["query"],
+            params=self.params,
+            sort=discover_query.get("sort"),
+        )
 
     @staticmethod
     def get_projects(organization_id, query):
@@ -90,6 +98,39 @@ class DiscoverProcessor:
 
         return data_fn
 
+    @staticmethod
+    def get_bulk_data_fn(fields, equations, query, params, sort):
+        def bulk_data_fn(pages):
+            """
+            Fetches several pages at once, given as ``(offset, limit)`` pairs. Only the
+            Snuba requests run concurrently, the queries are built on this thread.
+            """
+            builders = [
+                discover.get_query_builder(
+                    selected_columns=fields,
+                    equations=equations,
+                    query=query,
+                    params=params,
+                    offset=offset,
+                    orderby=sort,
+                    limit=limit,
+                    auto_fields=True,
+                    auto_aggregations=True,
+                    use_aggregate_conditions=True,
+                )
+                for offset, limit in pages
+            ]
+            results = bulk_snql_query(
+                [builder.get_snql_query() for builder in builders],
+                referrer="data_export.tasks.discover",
+            )
+            return [
+                discover.transform_query_results(builder, result)
+                for builder, result in zip(builders, results)
+            ]
+
+        return bulk_data_fn
+
     def handle_fields(self, result_list):
         # Find issue short_id if present
         # (originally in `/api/bases/organization_events.py`)
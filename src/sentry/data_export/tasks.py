@@ -18,6 +18,7 @@ from django.core.files.base import ContentFile
 from django.db import IntegrityError, router
 from django.utils import timezone
 
+from sentry import options
 from sentry.models import (
     DEFAULT_BLOB_SIZE,
     MAX_FILE_SIZE,
@@ -127,23 +128,42 @@ def assemble_download(
 
                 rows = []
 
-                for _ in range(MAX_FRAGMENTS_PER_BATCH):
-                    # the number of rows to export in the next batch fragment
-                    fragment_row_count = min(batch_size, max(export_limit - next_offset, 1))
-
-                    rows = process_rows(processor, data_export, fragment_row_count, next_offset)
-                    writer.writerows(rows)
-
-                    fragment_offset += len(rows)
-                    next_offset = offset + fragment_offset
-
-                    if (
-                        not rows
-                        or len(rows) < batch_size
-                        # the batch may exceed MAX_BATCH_SIZE but immediately stops
-                        or tf.tell() - starting_pos >= MAX_BATCH_SIZE
+                # the number of batch fragments which are fetched at once
+                concurrency = get_fragment_concurrency(data_export)
+
+                fragment_count = 0
+                finished = False
+                while not finished and fragment_count < MAX_FRAGMENTS_PER_BATCH:
+                    # the offsets and number of rows of the next batch fragments, fragments past
+                    # the export limit are only fetched if they come first
+                    pages = []
+                    for fragment_start in range(
+                        next_offset,
+                        next_offset
+                        + min(concurrency, MAX_FRAGMENTS_PER_BATCH - fragment_count) * batch_size,
+                        batch_size,
                     ):
-                        break
+                        if pages and fragment_start >= export_limit:
+                            break
+                        pages.append(
+                            (fragment_start, min(batch_size, max(export_limit - fragment_start, 1)))
+                        )
+                    fragment_count += len(pages)
+
+                    for rows in process_pages(processor, data_export, pages):
+                        writer.writerows(rows)
+
+                        fragment_offset += len(rows)
+                        next_offset = offset + fragment_offset
+
+                        if (
+                            not rows
+                            or len(rows) < batch_size
+                            # the batch may exceed MAX_BATCH_SIZE but immediately stops
+                            or tf.tell() - starting_pos >= MAX_BATCH_SIZE
+                        ):
+                            finished = True
+                            break
 
                 tf.seek(0)
                 new_bytes_written = store_export_chunk_as_blob(data_export, bytes_written, tf)
@@ -201,6 +221,14 @@ def assemble_download(
                     },
                     countdown=3,
                 )
+                logger.info(
+                    "dataexport.progress",
+                    extra={
+                        "data_export_id": data_export_id,
+                        "row_count": next_offset,
+                        "file_size": bytes_written,
+                    },
+                )
             else:
                 metrics.timing("dataexport.row_count", next_offset, sample_rate=1.0)
                 metrics.timing("dataexport.file_size", bytes_written, sample_rate=1.0)
@@ -234,15 +262,30 @@ def get_processor(data_export, environment_id):
         raise
 
 
-def process_rows(processor, data_export, batch_size, offset):
+def get_fragment_concurrency(data_export):
+    # Pages of discover queries can be fetched independently from each other
+    if data_export.query_type == ExportQueryType.DISCOVER:
+        return max(options.get("dataexport.discover.fragment-concurrency"), 1)
+    return 1
+
+
+def process_pages(processor, data_export, pages):
+    """
+    Returns the rows of each of the given ``(offset, limit)`` pages in order. Pages of discover
+    queries are fetched at once.
+    """
     try:
         if data_export.query_type == ExportQueryType.ISSUES_BY_TAG:
-            rows = process_issues_by_tag(processor, batch_size, offset)
+            return [
+                process_issues_by_tag(processor, batch_size, offset) for offset, batch_size in pages
+            ]
         elif data_export.query_type == ExportQueryType.DISCOVER:
-            rows = process_discover(processor, batch_size, offset)
+            if len(pages) == 1:
+                [(offset, batch_size)] = pages
+                return [process_discover(processor, batch_size, offset)]
+            return process_discover_pages(processor, pages)
         else:
             raise ExportError(f"No processor found for this query type: {data_export.query_type}")
-        return rows
     except ExportError as error:
         error_str = str(error)
         metrics.incr("dataexport.error", tags={"error": error_str}, sample_rate=1.0)
@@ -262,6 +305,11 @@ def process_discover(processor, limit, offset):
     return processor.handle_fields(raw_data_unicode)
 
 
+@handle_snuba_errors(logger)
+def process_discover_pages(processor, pages):
+    return [processor.handle_fields(result["data"]) for result in processor.bulk_data_fn(pages)]
+
+
 class ExportDataFileTooBig(Exception):
     pass
 
@@ -1,10 +1,25 @@
 import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from uuid import uuid4
 
+from django.core.cache import cache
 from django.db import connections, router
 from django.utils import timezone
 
+from sentry.utils import metrics
+
+logger = logging.getLogger("sentry.cleanup")
+
+#: Smallest range of primary keys deleted at once by `BulkDeleteQuery.execute_in_ranges`.
+MIN_RANGE_SIZE = 100
+
+#: Checkpoints are only used to resume runs which were interrupted recently.
+CHECKPOINT_TTL = 24 * 60 * 60
+
 
 class BulkDeleteQuery:
     def __init__(self, model, project_id=None, dtfield=None, days=None, order_by=None):
@@ -63,6 +78,147 @@ class BulkDeleteQuery:
 
         return self._continuous_query(query)
 
+    def execute_in_ranges(
+        self,
+        chunk_size=10000,
+        concurrency=1,
+        target_duration=1.0,
+        max_replication_lag=None,
+        checkpoint_key=None,
+    ):
+        """
+        Deletes matching rows in batches over consecutive ranges of primary keys, which
+        unlike `execute` never rescans rows it already looked at. Each batch is a short
+        transaction on its own, so that deletes don't hold locks for long.
+
+        The ranges are deleted by up to ``concurrency`` threads. Their size is adapted so
+        that a batch deletes at most about ``chunk_size`` rows and takes about
+        ``target_duration`` seconds. With ``max_replication_lag``, batches are paused
+        while replicas are lagging behind further than that many seconds.
+
+        With a ``checkpoint_key``, progress is stored in the cache, so that an interrupted
+        run resumes where it stopped. Returns the number of deleted rows.
+        """
+        quote_name = connections[self.using].ops.quote_name
+        table = quote_name(self.model._meta.db_table)
+
+        where = ["id >= %s", "id < %s"]
+        parameters = []
+        if self.dtfield and self.days is not None:
+            where.append(f"{quote_name(self.dtfield)} < %s")
+            parameters.append(timezone.now() - timedelta(days=self.days))
+        if self.project_id:
+            where.append("project_id = %s")
+            parameters.append(self.project_id)
+        query = "delete from {table} where {conditions}".format(
+            table=table, conditions=" and ".join(where)
+        )
+
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f"select min(id), max(id) from {table}")
+            min_id, max_id = cursor.fetchone()
+        if min_id is None:
+            return 0
+
+        if checkpoint_key is not None:
+            min_id = max(min_id, cache.get(checkpoint_key) or min_id)
+
+        lock = threading.Lock()
+        state = {
+            "next_start": min_id,
+            "range_size": chunk_size,
+            "in_flight": set(),
+            "deleted": 0,
+            "stopped": False,
+        }
+        start_time = time.monotonic()
+
+        def delete_ranges():
+            try:
+                while True:
+                    with lock:
+                        start = state["next_start"]
+                        if state["stopped"] or start > max_id:
+                            return
+                        end = start + state["range_size"]
+                        state["next_start"] = end
+                        state["in_flight"].add(start)
+
+                    if max_replication_lag is not None:
+                        self._wait_for_replication(max_replication_lag)
+
+                    batch_start_time = time.monotonic()
+                    with connections[self.using].cursor() as cursor:
+                        cursor.execute(query, [start, end] + parameters)
+                        deleted = cursor.rowcount
+                    duration = time.monotonic() - batch_start_time
+
+                    with lock:
+                        state["in_flight"].discard(start)
+                        state["deleted"] += deleted
+                        range_size = state["range_size"]
+                        if duration > target_duration:
+                            state["range_size"] = max(
+                                range_size // 2, min(MIN_RANGE_SIZE, chunk_size)
+                            )
+                        elif duration < target_duration / 2 and deleted < chunk_size / 2:
+                            state["range_size"] = range_size * 2
+                        # Everything below the oldest range which is still being deleted is done
+                        checkpoint = min(state["in_flight"], default=state["next_start"])
+
+                    if checkpoint_key is not None:
+                        cache.set(checkpoint_key, checkpoint, CHECKPOINT_TTL)
+            except Exception:
+                with lock:
+                    state["stopped"] = True
+                raise
+
+        if concurrency > 1:
+
+            def delete_ranges_in_thread():
+                try:
+                    delete_ranges()
+                finally:
+                    connections[self.using].close()
+
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = [executor.submit(delete_ranges_in_thread) for _ in range(concurrency)]
+            for future in futures:
+                future.result()
+        else:
+            delete_ranges()
+
+        if checkpoint_key is not None:
+            cache.delete(checkpoint_key)
+
+        duration = time.monotonic() - start_time
+        tags = {"model": self.model.__name__}
+        metrics.incr("cleanup.bulk_delete.rows", amount=state["deleted"], tags=tags)
+        metrics.timing("cleanup.bulk_delete.duration", duration, tags=tags)
+        logger.info(
+            "cleanup.bulk_delete.completed",
+            extra={
+                "model": self.model.__name__,
+                "deleted": state["deleted"],
+                "duration": duration,
+                "rows_per_second": state["deleted"] / duration if duration else None,
+            },
+        )
+        return state["deleted"]
+
+    def _wait_for_replication(self, max_replication_lag):
+        while True:
+            with connections[self.using].cursor() as cursor:
+                # Without the privileges to see the lag of replicas, this is never throttled.
+                cursor.execute(
+                    "select coalesce(max(extract(epoch from replay_lag)), 0) from pg_stat_replication"
+                )
+                lag = float(cursor.fetchone()[0])
+            if lag <= max_replication_lag:
+                return
+            metrics.incr("cleanup.bulk_delete.throttled", tags={"model": self.model.__name__})
+            time.sleep(min(lag, 10))
+
     def _continuous_query(self, query):
         results = True
         cursor = connections[self.using].cursor()
@@ -30,6 +30,7 @@ from sentry.db.models.manager import M, make_key
 from sentry.db.models.manager.base_query_set import BaseQuerySet
 from sentry.db.models.query import create_or_update
 from sentry.silo import SiloLimit, SiloMode
+from sentry.utils import metrics
 from sentry.utils.cache import cache
 from sentry.utils.hashlib import md5_text
 
@@ -39,6 +40,9 @@ _local_cache = threading.local()
 _local_cache_generation = 0
 _local_cache_enabled = False
 
+#: Cached in place of rows that do not exist, see ``modelcache.negative-cache-ttl``.
+_MISSING = "__modelcache_missing__"
+
 
 class ModelManagerTriggerCondition(IntEnum):
     QUERY = auto()
@@ -86,7 +90,7 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
             _local_cache_enabled = False
             _local_cache_generation += 1
 
-    def _get_local_cache(self) -> Optional[MutableMapping[str, M]]:
+    def _get_local_cache(self) -> Optional[MutableMapping[str, Any]]:
         if not _local_cache_enabled:
             return None
 
@@ -237,6 +241,69 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
     def __get_lookup_cache_key(self, **kwargs: Any) -> str:
         return make_key(self.model, "modelcache", kwargs)
 
+    def __cache_instances(self, instances: Sequence[M]) -> None:
+        """
+        Stores instances and their lookup pointers in the cache with a single
+        round-trip.
+        """
+        pk_name = self.model._meta.pk.name
+        values: Dict[str, Any] = {}
+        for instance in instances:
+            for key in self.cache_fields:
+                if key in ("pk", pk_name):
+                    continue
+                value = self.__value_for_field(instance, key)
+                values[self.__get_lookup_cache_key(**{key: value})] = instance.pk
+            values[self.__get_lookup_cache_key(**{pk_name: instance.pk})] = instance
+
+        # Ensure we don't serialize the database into the cache
+        dbs = [instance._state.db for instance in instances]
+        for instance in instances:
+            instance._state.db = None
+        try:
+            cache.set_many(values, timeout=self.cache_ttl, version=self.cache_version)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+        finally:
+            for instance, db in zip(instances, dbs):
+                instance._state.db = db
+
+    def __cache_missing(
+        self, cache_keys: Sequence[str], local_cache: Optional[MutableMapping[str, Any]]
+    ) -> None:
+        """
+        Remembers lookups that did not match any row for a short time, so that
+        repeated lookups of deleted or invalid keys do not hit the database.
+        Saving a matching row overwrites the entry.
+        """
+        from sentry import options
+
+        ttl = options.get("modelcache.negative-cache-ttl")
+        if not ttl or not cache_keys:
+            return
+
+        cache.set_many(
+            {cache_key: _MISSING for cache_key in cache_keys},
+            timeout=ttl,
+            version=self.cache_version,
+        )
+        if local_cache is not None:
+            for cache_key in cache_keys:
+                local_cache[cache_key] = _MISSING
+
+    def __record_lookups(self, source: str, amount: int = 1) -> None:
+        if amount:
+            metrics.incr(
+                "modelcache.lookup",
+                amount=amount,
+                tags={"model": self.model.__name__, "source": source},
+            )
+
+    def __does_not_exist(self) -> Exception:
+        return self.model.DoesNotExist(
+            "%s matching query does not exist." % self.model._meta.object_name
+        )
+
     def __value_for_field(self, instance: M, key: str) -> Any:
         """
         Return the cacheable value for a field.
@@ -286,12 +353,27 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
             local_cache = self._get_local_cache()
             if local_cache is not None:
                 result = local_cache.get(cache_key)
+                if result == _MISSING:
+                    self.__record_lookups("negative")
+                    raise self.__does_not_exist()
                 if result is not None:
+                    self.__record_lookups("local")
                     return result
 
             retval = cache.get(cache_key, version=self.cache_version)
+            if retval == _MISSING:
+                self.__record_lookups("negative")
+                raise self.__does_not_exist()
+
             if retval is None:
-                result = self.using_replica().get(**kwargs) if use_replica else self.get(**kwargs)
+                self.__record_lookups("db")
+                try:
+                    result = (
+                        self.using_replica().get(**kwargs) if use_replica else self.get(**kwargs)
+                    )
+                except self.model.DoesNotExist:
+                    self.__cache_missing([cache_key], local_cache)
+                    raise
                 # need to satisfy mypy
                 assert result
                 # Ensure we're pushing it into the cache
@@ -300,6 +382,8 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
                     local_cache[cache_key] = result
                 return result
 
+            self.__record_lookups("cache")
+
             # If we didn't look up by pk we need to hit the reffed
             # key
             if key != pk_name:
@@ -343,6 +427,12 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
 
         For most models, if one attempts to use a non-PK value this will just
         degrade to a DB query, like with `get_from_cache`.
+
+        Lookups are resolved tier by tier, each with a single round-trip for
+        all remaining values: the local cache (see `local_cache`), the shared
+        cache (first resolving secondary keys to primary keys, then the
+        objects) and finally the database. Values that do not match any row
+        are skipped and may be cached as missing.
         """
 
         pk_name = self.model._meta.pk.name
@@ -361,17 +451,24 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
         cache_lookup_cache_keys = []
         cache_lookup_values = []
 
+        negative_hits = 0
+
         local_cache = self._get_local_cache()
         for value in values:
             cache_key = self.__get_lookup_cache_key(**{key: value})
             result = local_cache and local_cache.get(cache_key)
-            if result is not None:
+            if result == _MISSING:
+                negative_hits += 1
+            elif result is not None:
                 final_results.append(result)
             else:
                 cache_lookup_cache_keys.append(cache_key)
                 cache_lookup_values.append(value)
 
+        self.__record_lookups("local", len(final_results))
+
         if not cache_lookup_cache_keys:
+            self.__record_lookups("negative", negative_hits)
             return final_results
 
         cache_results = cache.get_many(cache_lookup_cache_keys, version=self.cache_version)
@@ -389,6 +486,10 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
                 db_lookup_values.append(value)
                 continue
 
+            if cache_result == _MISSING:
+                negative_hits += 1
+                continue
+
             # If we didn't look up by pk we need to hit the reffed key
             if key != pk_name:
                 nested_lookup_cache_keys.append(cache_key)
@@ -411,8 +512,16 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
                 db_lookup_values.append(value)
                 continue
 
+            if local_cache is not None:
+                local_cache[cache_key] = cache_result
+
             final_results.append(cache_result)
 
+        self.__record_lookups("negative", negative_hits)
+        self.__record_lookups(
+            "cache", len(cache_lookup_values) - len(db_lookup_values) - negative_hits
+        )
+
         if nested_lookup_values:
             nested_results = self.get_many_from_cache(nested_lookup_values, key=pk_name)
             final_results.extend(nested_results)
@@ -425,13 +534,18 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
         if not db_lookup_values:
             return final_results
 
+        self.__record_lookups("db", len(db_lookup_values))
+
         cache_writes = []
+        missing_cache_keys = []
 
         db_results = {getattr(x, key): x for x in self.filter(**{key + "__in": db_lookup_values})}
         for cache_key, value in zip(db_lookup_cache_keys, db_lookup_values):
             db_result = db_results.get(value)
             if db_result is None:
-                continue  # This model ultimately does not exist
+                # This model ultimately does not exist
+                missing_cache_keys.append(cache_key)
+                continue
 
             # Ensure we're pushing it into the cache
             cache_writes.append(db_result)
@@ -440,9 +554,9 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
 
             final_results.append(db_result)
 
-        # XXX: Should use set_many here, but __post_save code is too complex
-        for instance in cache_writes:
-            self.__post_save(instance=instance)
+        if cache_writes:
+            self.__cache_instances(cache_writes)
+        self.__cache_missing(missing_cache_keys, local_cache)
 
         return final_results
 
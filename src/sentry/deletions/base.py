@@ -1,12 +1,23 @@
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import md5
 
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Model
+
+from sentry import options
 from sentry.constants import ObjectStatus
 from sentry.utils import metrics
 from sentry.utils.query import bulk_delete_objects
 
 _leaf_re = re.compile(r"^(UserReport|Event|Group)(.+)")
 
+#: Relations which were fully deleted are remembered for retries of the same deletion. Rows of
+#: models which were added in the meantime are still deleted, see ``has_remaining_rows``.
+CHECKPOINT_TTL = 24 * 60 * 60
+
 
 class BaseRelation:
     def __init__(self, params, task):
@@ -127,23 +138,115 @@ class BaseDeletionTask:
 
     def delete_children(self, relations):
         # Ideally this runs through the deletion manager
+        concurrency = options.get("deletions.relation-concurrency")
+        if any(connection.in_atomic_block for connection in connections.all()):
+            # Other threads would neither see nor be able to wait for the ongoing transaction
+            concurrency = 1
+        for group in self.plan_relations(relations, concurrency):
+            if len(group) == 1:
+                self.delete_relation(group[0])
+                continue
+
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = [
+                    executor.submit(self.delete_relation_in_thread, relation) for relation in group
+                ]
+            for future in futures:
+                future.result()
+        return False
+
+    def plan_relations(self, relations, concurrency):
+        """
+        Splits relations into groups which are deleted one after another, while the
+        relations within a group are deleted concurrently.
+
+        Only consecutive relations which are deleted in bulk, and thus have no children of
+        their own, can share a group. Relations with a foreign key between their models
+        keep their order.
+        """
+        groups = []
         for relation in relations:
-            task = self.manager.get(
-                transaction_id=self.transaction_id,
-                actor_id=self.actor_id,
-                task=relation.task,
-                **relation.params,
-            )
+            if concurrency > 1 and self.is_bulk_relation(relation):
+                group = groups[-1] if groups else None
+                if (
+                    group is not None
+                    and len(group) < concurrency
+                    and all(
+                        self.is_bulk_relation(other)
+                        and not _has_foreign_key(relation.params["model"], other.params["model"])
+                        for other in group
+                    )
+                ):
+                    group.append(relation)
+                    continue
+            groups.append([relation])
+        return groups
+
+    def is_bulk_relation(self, relation):
+        if "model" not in relation.params:
+            return False
+        task = relation.task or self.manager.tasks.get(
+            relation.params["model"], self.manager.default_task
+        )
+        return issubclass(task, BulkModelDeletionTask)
 
-            # If we want smaller tasks then this also has to return when has_more is true.
-            # This could significant increase the number of tasks we spawn. Get better estimates
-            # by collecting metrics.
-            has_more = True
-            while has_more:
-                has_more = task.chunk()
-                if has_more:
-                    metrics.incr("deletions.should_spawn", tags={"task": type(task).__name__})
-        return False
+    def delete_relation_in_thread(self, relation):
+        try:
+            self.delete_relation(relation)
+        finally:
+            connections.close_all()
+
+    def delete_relation(self, relation):
+        checkpoint_key = self.get_checkpoint_key(relation)
+        if (
+            checkpoint_key is not None
+            and cache.get(checkpoint_key)
+            and not self.has_remaining_rows(relation)
+        ):
+            metrics.incr("deletions.relation_skipped")
+            return
+
+        task = self.manager.get(
+            transaction_id=self.transaction_id,
+            actor_id=self.actor_id,
+            task=relation.task,
+            **relation.params,
+        )
+
+        # If we want smaller tasks then this also has to return when has_more is true.
+        # This could significant increase the number of tasks we spawn. Get better estimates
+        # by collecting metrics.
+        has_more = True
+        while has_more:
+            has_more = task.chunk()
+            if has_more:
+                metrics.incr("deletions.should_spawn", tags={"task": type(task).__name__})
+
+        if checkpoint_key is not None:
+            cache.set(checkpoint_key, True, CHECKPOINT_TTL)
+
+    def has_remaining_rows(self, relation):
+        """
+        Returns whether rows of a relation which was already deleted were added since. Only
+        relations of models can be checked, other relations are deleted once.
+        """
+        if "model" not in relation.params or "query" not in relation.params:
+            return False
+        return relation.params["model"]._base_manager.filter(**relation.params["query"]).exists()
+
+    def get_checkpoint_key(self, relation):
+        if not self.transaction_id or not options.get("deletions.checkpoint-relations"):
+            return None
+
+        params = []
+        for key, value in sorted(relation.params.items()):
+            if isinstance(value, type):
+                value = value._meta.label
+            elif isinstance(value, dict):
+                value = sorted((k, v.pk if isinstance(v, Model) else v) for k, v in value.items())
+            params.append((key, value))
+        digest = md5(repr(params).encode("utf-8")).hexdigest()
+        return f"deletions:{self.transaction_id}:{digest}"
 
     def mark_deletion_in_progress(self, instance_list):
         pass
@@ -292,3 +395,12 @@ class BulkModelDeletionTask(ModelDeletionTask):
                         **self.query,
                     ),
                 )
+
+
+def _has_foreign_key(model, other_model):
+    """Returns whether either of the given models references the other one."""
+    return any(
+        field.concrete and field.is_relation and field.related_model is referenced
+        for referencing, referenced in ((model, other_model), (other_model, model))
+        for field in referencing._meta.get_fields()
+    )
@@ -126,6 +126,10 @@ class GroupDeletionTask(ModelDeletionTask):
 
         group_ids = [group.id for group in instance_list]
 
+        from sentry.grouping import grouphash_cache
+
+        grouphash_cache.invalidate_groups(group_ids)
+
         # Remove child relations for all groups first.
         child_relations = []
         for model in _GROUP_RELATED_MODELS:
@@ -137,6 +141,10 @@ class GroupDeletionTask(ModelDeletionTask):
                 BaseRelation(params={"groups": instance_list}, task=EventDataDeletionTask)
             )
 
+            from sentry.tagstore import summaries as tagstore_summaries
+
+            tagstore_summaries.reset_projects({group.project_id for group in instance_list})
+
         self.delete_children(child_relations)
 
         # Remove group objects with children removed.
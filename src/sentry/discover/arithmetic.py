@@ -1,6 +1,7 @@
 import re
 from dataclasses import dataclass
-from typing import Any, List, Optional, Set, Tuple, Union
+from functools import lru_cache
+from typing import Any, FrozenSet, List, Optional, Set, Tuple, Union
 
 from parsimonious.exceptions import ParseError
 from parsimonious.grammar import Grammar, NodeVisitor
@@ -288,24 +289,39 @@ def parse_arithmetic(
     custom_measurements: Optional[Set[str]] = None,
 ) -> Tuple[Operation, List[str], List[str]]:
     """Given a string equation try to parse it into a set of Operations"""
+    result, fields, functions = _parse_arithmetic(
+        equation, max_operators, frozenset(custom_measurements or ())
+    )
+    return result, list(fields), list(functions)
+
+
+@lru_cache(maxsize=1000)
+def _parse_arithmetic(
+    equation: str,
+    max_operators: Optional[int],
+    custom_measurements: FrozenSet[str],
+) -> Tuple[Operation, Tuple[str, ...], Tuple[str, ...]]:
+    """The same equations are parsed over and over again, eg. by dashboard widgets, so parsed
+    equations are memoized. The returned Operations are shared and must not be modified.
+    """
     try:
         tree = arithmetic_grammar.parse(equation)
     except ParseError:
         raise ArithmeticParseError(
             "Unable to parse your equation, make sure it is well formed arithmetic"
         )
-    visitor = ArithmeticVisitor(max_operators, custom_measurements)
+    visitor = ArithmeticVisitor(max_operators, set(custom_measurements))
     result = visitor.visit(tree)
     # total count is the exception to the no mixing rule
     if visitor.fields == {TOTAL_COUNT_ALIAS} and len(visitor.functions) > 0:
-        return result, list(visitor.fields), list(visitor.functions)
+        return result, tuple(visitor.fields), tuple(visitor.functions)
     if len(visitor.fields) > 0 and len(visitor.functions) > 0:
         raise ArithmeticValidationError("Cannot mix functions and fields in arithmetic")
     if visitor.terms <= 1:
         raise ArithmeticValidationError("Arithmetic expression must contain at least 2 terms")
     if visitor.operators == 0:
         raise ArithmeticValidationError("Arithmetic expression must contain at least 1 operator")
-    return result, list(visitor.fields), list(visitor.functions)
+    return result, tuple(visitor.fields), tuple(visitor.functions)
 
 
 def resolve_equation_list(
@@ -1,4 +1,4 @@
-from typing import Mapping, Tuple, cast
+from typing import Mapping, Optional, Tuple, cast
 
 import sentry_sdk
 
@@ -13,6 +13,18 @@ def _get_cache_key(org_id: int, proj_id: int) -> str:
 def get_transactions_resampling_rates(
     org_id: int, proj_id: int, default_rate: float
 ) -> Tuple[Mapping[str, float], float]:
+    rates = get_stored_transactions_resampling_rates(org_id=org_id, proj_id=proj_id)
+    if rates is None:
+        return {}, default_rate
+    return rates
+
+
+def get_stored_transactions_resampling_rates(
+    org_id: int, proj_id: int
+) -> Optional[Tuple[Mapping[str, float], float]]:
+    """
+    Returns the rebalanced rates stored for a project, or ``None`` if there are none.
+    """
     redis_client = get_redis_client_for_ds()
     cache_key = _get_cache_key(org_id=org_id, proj_id=proj_id)
     try:
@@ -24,7 +36,7 @@ def get_transactions_resampling_rates(
     except (TypeError, ValueError) as e:
         sentry_sdk.capture_exception(e)
 
-    return {}, default_rate
+    return None
 
 
 def set_transactions_resampling_rates(
@@ -36,3 +48,11 @@ def set_transactions_resampling_rates(
     val_str = json.dumps(val)
     redis_client.set(cache_key, val_str)
     redis_client.pexpire(cache_key, ttl_ms)
+
+
+def refresh_transactions_resampling_rates(org_id: int, proj_id: int, ttl_ms: int) -> None:
+    """
+    Extends the expiry of the rebalanced rates stored for a project without changing them.
+    """
+    redis_client = get_redis_client_for_ds()
+    redis_client.pexpire(_get_cache_key(org_id=org_id, proj_id=proj_id), ttl_ms)
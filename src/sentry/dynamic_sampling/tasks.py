@@ -1,5 +1,5 @@
 import logging
-from typing import Optional, Sequence, Tuple
+from typing import Any, Mapping, Optional, Sequence, Tuple
 
 from sentry import features, options, quotas
 from sentry.dynamic_sampling.models.adjustment_models import AdjustedModel
@@ -15,6 +15,8 @@ from sentry.dynamic_sampling.prioritise_transactions import (
 )
 from sentry.dynamic_sampling.rules.helpers.prioritise_project import _generate_cache_key
 from sentry.dynamic_sampling.rules.helpers.prioritize_transactions import (
+    get_stored_transactions_resampling_rates,
+    refresh_transactions_resampling_rates,
     set_transactions_resampling_rates,
 )
 from sentry.dynamic_sampling.rules.utils import (
@@ -113,24 +115,71 @@ def adjust_sample_rates(
 
     model = AdjustedModel(projects=projects)
     ds_projects = model.adjust_sample_rates(sample_rate=sample_rate)
+    if not ds_projects:
+        return
 
     redis_client = get_redis_client_for_ds()
+    cache_key = _generate_cache_key(org_id=org_id)
+    current_sample_rates = {}
+    if _skip_unchanged_rates():
+        for ds_project, current_sample_rate in zip(
+            ds_projects, redis_client.hmget(cache_key, [p.id for p in ds_projects])
+        ):
+            if current_sample_rate is not None:
+                current_sample_rates[ds_project.id] = float(current_sample_rate)
+
     with redis_client.pipeline(transaction=False) as pipeline:
         for ds_project in ds_projects:
+            if not _rates_changed(
+                {ds_project.id: current_sample_rates.get(ds_project.id)},
+                {ds_project.id: ds_project.new_sample_rate},
+            ):
+                metrics.incr("sentry.dynamic_sampling.adjust_sample_rates.unchanged")
+                continue
+
             # hash, key, value
-            cache_key = _generate_cache_key(org_id=org_id)
             pipeline.hset(
                 cache_key,
                 ds_project.id,
                 ds_project.new_sample_rate,  # redis stores is as string
             )
-            pipeline.pexpire(cache_key, CACHE_KEY_TTL)
             schedule_invalidate_project_config(
                 project_id=ds_project.id, trigger="dynamic_sampling_prioritise_project_bias"
             )
+        pipeline.pexpire(cache_key, CACHE_KEY_TTL)
         pipeline.execute()
 
 
+def _skip_unchanged_rates() -> bool:
+    return bool(options.get("dynamic-sampling.rebalancing.skip-unchanged-rates"))
+
+
+def _rates_changed(
+    current_rates: Mapping[Any, Optional[float]], new_rates: Mapping[Any, float]
+) -> bool:
+    """
+    Returns whether rebalanced sample rates differ from the current ones, in which case they have
+    to be stored and project configs have to be invalidated.
+
+    Unless "dynamic-sampling.rebalancing.skip-unchanged-rates" is set rates are always considered
+    changed. Otherwise differences up to "dynamic-sampling.rebalancing.rate-tolerance" are ignored.
+    Unchanged rates are not stored, so that small differences cannot add up over multiple runs.
+    """
+    if not _skip_unchanged_rates():
+        return True
+
+    if current_rates.keys() != new_rates.keys():
+        return True
+
+    tolerance = options.get("dynamic-sampling.rebalancing.rate-tolerance")
+    for key, new_rate in new_rates.items():
+        current_rate = current_rates[key]
+        if current_rate is None or abs(current_rate - new_rate) > tolerance:
+            return True
+
+    return False
+
+
 @instrumented_task(
     name="sentry.dynamic_sampling.tasks.prioritise_transactions",
     queue="dynamicsampling",
@@ -216,6 +265,20 @@ def process_transaction_biases(project_transactions: ProjectTransactions) -> Non
         total=total_num_transactions,
     )
 
+    if _skip_unchanged_rates():
+        current_rates = get_stored_transactions_resampling_rates(org_id=org_id, proj_id=project_id)
+        if current_rates is not None:
+            current_named_rates, current_implicit_rate = current_rates
+            if not _rates_changed(
+                {**current_named_rates, None: current_implicit_rate},
+                {**named_rates, None: implicit_rate},
+            ):
+                metrics.incr("sentry.dynamic_sampling.process_transaction_biases.unchanged")
+                refresh_transactions_resampling_rates(
+                    org_id=org_id, proj_id=project_id, ttl_ms=CACHE_KEY_TTL
+                )
+                return
+
     set_transactions_resampling_rates(
         org_id=org_id,
         proj_id=project_id,
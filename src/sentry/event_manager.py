@@ -64,6 +64,7 @@ from sentry.eventtypes import (
     HpkpEvent,
     TransactionEvent,
 )
+from sentry.grouping import grouphash_cache
 from sentry.grouping.api import (
     BackgroundGroupingConfigLoader,
     GroupingConfig,
@@ -1458,6 +1459,25 @@ def _save_aggregate(
 ) -> Optional[GroupInfo]:
     project = event.project
 
+    # Hierarchical grouping may need to split or associate hashes, which always
+    # requires the transactional path below.
+    use_grouphash_cache = not hashes.hierarchical_hashes and not migrate_off_hierarchical
+
+    if use_grouphash_cache:
+        group = _get_group_from_grouphash_cache(project, hashes.hashes)
+        if group is not None:
+            kwargs["data"] = materialize_metadata(
+                event.data,
+                get_event_type(event.data),
+                metadata,
+            )
+            kwargs["data"]["last_received"] = received_timestamp
+
+            is_regression = _process_existing_aggregate(
+                group=group, event=event, data=kwargs, release=release
+            )
+            return GroupInfo(group, False, is_regression)
+
     flat_grouphashes = [
         GroupHash.objects.get_or_create(project=project, hash=hash)[0] for hash in hashes.hashes
     ]
@@ -1624,6 +1644,11 @@ def _save_aggregate(
             state=GroupHash.State.LOCKED_IN_MIGRATION
         ).update(group=group)
 
+    if use_grouphash_cache:
+        # Hashes which were just associated with the group are cached once they
+        # are read back by the next event.
+        grouphash_cache.cache_grouphashes(flat_grouphashes)
+
     is_regression = _process_existing_aggregate(
         group=group, event=event, data=kwargs, release=release
     )
@@ -1631,6 +1656,37 @@ def _save_aggregate(
     return GroupInfo(group, is_new, is_regression)
 
 
+def _get_group_from_grouphash_cache(project: Project, hashes: Sequence[str]) -> Optional[Group]:
+    group_id = grouphash_cache.get_cached_group_id(project.id, hashes)
+    if group_id is None:
+        return None
+
+    try:
+        group = Group.objects.get(id=group_id)
+    except Group.DoesNotExist:
+        group = None
+
+    # The group may have been merged, deleted or reprocessed without the cache
+    # being invalidated yet, in which case the hashes were moved elsewhere.
+    if (
+        group is None
+        or group.project_id != project.id
+        or group.issue_category != GroupCategory.ERROR
+        or group.status
+        in (
+            GroupStatus.PENDING_DELETION,
+            GroupStatus.DELETION_IN_PROGRESS,
+            GroupStatus.PENDING_MERGE,
+            GroupStatus.REPROCESSING,
+        )
+    ):
+        metrics.incr("grouphash_cache.stale", skip_internal=True)
+        grouphash_cache.invalidate_hashes(project.id, hashes)
+        return None
+
+    return group
+
+
 def _find_existing_grouphash(
     project: Project,
     flat_grouphashes: Sequence[GroupHash],
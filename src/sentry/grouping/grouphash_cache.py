@@ -0,0 +1,93 @@
+"""
+Write-through cache of the group each grouphash is assigned to.
+
+The vast majority of events belong to an existing group, which ``_save_aggregate`` finds by loading (or creating) the
+``GroupHash`` row of every hash of the event. Since the group of a hash only changes on merge, unmerge, reprocessing
+and deletion, the ``(project_id, hash) -> (grouphash_id, group_id, state)`` mapping is cached and consulted before
+touching Postgres.
+
+Only hashes which are assigned to a group and not locked for a migration are cached. Every code path which moves
+hashes between groups invalidates them explicitly. As a safety net, readers additionally verify that the cached group
+still accepts events and fall back to the transactional path otherwise.
+"""
+
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from django.core.cache import cache
+
+from sentry import options
+from sentry.models.grouphash import GroupHash
+from sentry.utils import metrics
+
+__all__ = [
+    "get_cached_group_id",
+    "cache_grouphashes",
+    "invalidate_hashes",
+    "invalidate_groups",
+]
+
+
+def _get_cache_key(project_id: int, hash: str) -> str:
+    return f"grouphash-group:{project_id}:{hash}"
+
+
+def _get_ttl() -> int:
+    return options.get("store.grouphash-cache-ttl")  # type: ignore
+
+
+def get_cached_group_id(project_id: int, hashes: Sequence[str]) -> Optional[int]:
+    """
+    Returns the group the event with the given flat hashes belongs to, or ``None`` if any of the hashes is not cached.
+
+    Requiring all hashes to be cached guarantees that none of them needs to be associated with the group, and that
+    the first hash is the one which would be picked by ``_find_existing_grouphash``.
+    """
+    if not hashes or not _get_ttl():
+        return None
+
+    keys = [_get_cache_key(project_id, hash) for hash in hashes]
+    values = cache.get_many(keys)
+    hit = len(values) == len(keys)
+    metrics.incr("grouphash_cache.get", tags={"hit": hit}, skip_internal=True)
+    if not hit:
+        return None
+
+    _, group_id, _ = values[keys[0]]
+    return group_id  # type: ignore
+
+
+def cache_grouphashes(grouphashes: Iterable[GroupHash]) -> None:
+    ttl = _get_ttl()
+    if not ttl:
+        return
+
+    values: Dict[str, Tuple[int, int, Optional[int]]] = {
+        _get_cache_key(gh.project_id, gh.hash): (gh.id, gh.group_id, gh.state)
+        for gh in grouphashes
+        if gh.group_id is not None
+        and gh.group_tombstone_id is None
+        and gh.state == GroupHash.State.UNLOCKED
+    }
+    if values:
+        cache.set_many(values, ttl)
+
+
+def invalidate_hashes(project_id: int, hashes: Iterable[str]) -> None:
+    keys = [_get_cache_key(project_id, hash) for hash in hashes]
+    if keys:
+        cache.delete_many(keys)
+
+
+def invalidate_groups(group_ids: Sequence[int]) -> None:
+    """Invalidates all hashes currently assigned to the given groups."""
+    if not group_ids:
+        return
+
+    cache.delete_many(
+        [
+            _get_cache_key(project_id, hash)
+            for project_id, hash in GroupHash.objects.filter(group_id__in=group_ids).values_list(
+                "project_id", "hash"
+            )
+        ]
+    )
@@ -91,6 +91,52 @@ class IncidentManager(BaseManager):
 
         return incident
 
+    def get_active_incidents(self, alert_rule_projects):
+        """
+        Fetches the active incidents of several `(alert_rule_id, project_id)` pairs at once.
+        Like `get_active_incident`, results are cached, including the absence of an incident.
+        :return: A dict mapping each pair to the active incident or `None`
+        """
+        cache_keys = {
+            (alert_rule_id, project_id): self._build_active_incident_cache_key(
+                alert_rule_id, project_id
+            )
+            for alert_rule_id, project_id in alert_rule_projects
+        }
+        cached = cache.get_many(list(cache_keys.values()))
+
+        incidents = {}
+        missing = set()
+        for key, cache_key in cache_keys.items():
+            incident = cached.get(cache_key)
+            if incident is None:
+                missing.add(key)
+            else:
+                incidents[key] = incident or None
+
+        if missing:
+            found = {}
+            incident_projects = (
+                IncidentProject.objects.filter(
+                    incident__type=IncidentType.ALERT_TRIGGERED.value,
+                    incident__alert_rule_id__in={alert_rule_id for alert_rule_id, _ in missing},
+                    project_id__in={project_id for _, project_id in missing},
+                )
+                .exclude(incident__status=IncidentStatus.CLOSED.value)
+                .select_related("incident")
+                .order_by("-incident__date_added")
+            )
+            for incident_project in incident_projects:
+                key = (incident_project.incident.alert_rule_id, incident_project.project_id)
+                if key in missing:
+                    found.setdefault(key, incident_project.incident)
+
+            cache.set_many({cache_keys[key]: found.get(key, False) for key in missing})
+            for key in missing:
+                incidents[key] = found.get(key)
+
+        return incidents
+
     @classmethod
     def clear_active_incident_cache(cls, instance, **kwargs):
         for project in instance.projects.all():
@@ -328,6 +374,47 @@ class AlertRuleManager(BaseManager):
 
         return alert_rule
 
+    def get_for_subscriptions(self, subscriptions):
+        """
+        Fetches the AlertRules associated with several Subscriptions at once. Attempts to fetch
+        from cache then hits the database for the remaining ones.
+        :return: A dict mapping subscription ids to their AlertRule. Subscriptions without an
+        AlertRule are omitted.
+        """
+        cache_keys = {
+            subscription.id: self.__build_subscription_cache_key(subscription.id)
+            for subscription in subscriptions
+        }
+        cached = cache.get_many(list(cache_keys.values()))
+        alert_rules = {
+            subscription_id: cached[cache_key]
+            for subscription_id, cache_key in cache_keys.items()
+            if cached.get(cache_key) is not None
+        }
+
+        missing = [
+            subscription for subscription in subscriptions if subscription.id not in alert_rules
+        ]
+        if missing:
+            by_snuba_query = {
+                alert_rule.snuba_query_id: alert_rule
+                for alert_rule in self.filter(
+                    snuba_query_id__in={subscription.snuba_query_id for subscription in missing}
+                )
+            }
+            fetched = {
+                subscription.id: by_snuba_query[subscription.snuba_query_id]
+                for subscription in missing
+                if subscription.snuba_query_id in by_snuba_query
+            }
+            cache.set_many(
+                {cache_keys[subscription_id]: rule for subscription_id, rule in fetched.items()},
+                3600,
+            )
+            alert_rules.update(fetched)
+
+        return alert_rules
+
     @classmethod
     def clear_subscription_cache(cls, instance, **kwargs):
         cache.delete(cls.__build_subscription_cache_key(instance.id))
@@ -479,6 +566,39 @@ class AlertRuleTriggerManager(BaseManager):
             cache.set(cache_key, triggers, 3600)
         return triggers
 
+    def get_for_alert_rules(self, alert_rules):
+        """
+        Fetches the AlertRuleTriggers associated with several AlertRules at once. Attempts to
+        fetch from cache then hits the database for the remaining ones.
+        :return: A dict mapping alert rule ids to their list of AlertRuleTriggers
+        """
+        cache_keys = {
+            alert_rule.id: self._build_trigger_cache_key(alert_rule.id)
+            for alert_rule in alert_rules
+        }
+        cached = cache.get_many(list(cache_keys.values()))
+        triggers = {
+            alert_rule_id: cached[cache_key]
+            for alert_rule_id, cache_key in cache_keys.items()
+            if cached.get(cache_key) is not None
+        }
+
+        missing = [alert_rule_id for alert_rule_id in cache_keys if alert_rule_id not in triggers]
+        if missing:
+            fetched = {alert_rule_id: [] for alert_rule_id in missing}
+            for trigger in AlertRuleTrigger.objects.filter(alert_rule_id__in=missing):
+                fetched[trigger.alert_rule_id].append(trigger)
+            cache.set_many(
+                {
+                    cache_keys[alert_rule_id]: rule_triggers
+                    for alert_rule_id, rule_triggers in fetched.items()
+                },
+                3600,
+            )
+            triggers.update(fetched)
+
+        return triggers
+
     @classmethod
     def clear_trigger_cache(cls, instance, **kwargs):
         cache.delete(cls._build_trigger_cache_key(instance.alert_rule_id))
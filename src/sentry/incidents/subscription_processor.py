@@ -4,7 +4,7 @@ import logging
 import operator
 from copy import deepcopy
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Sequence, Tuple, TypedDict, TypeVar, cast
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, TypedDict, TypeVar, cast
 
 from django.conf import settings
 from django.db import transaction
@@ -39,7 +39,7 @@ from sentry.snuba.entity_subscription import (
     get_entity_key_from_query_builder,
     get_entity_subscription_from_snuba_query,
 )
-from sentry.snuba.models import QuerySubscription
+from sentry.snuba.models import QuerySubscription, SnubaQuery
 from sentry.snuba.tasks import build_query_builder
 from sentry.utils import metrics, redis
 from sentry.utils.dates import to_datetime, to_timestamp
@@ -62,6 +62,9 @@ CRASH_RATE_ALERT_MINIMUM_THRESHOLD: Optional[int] = None
 T = TypeVar("T")
 
 
+AlertRuleStats = Tuple[datetime, Dict[str, int], Dict[str, int]]
+
+
 class SubscriptionUpdate(TypedDict):
     subscription_id: int
     values: Dict[str, List[Any]]
@@ -71,6 +74,16 @@ class SubscriptionUpdate(TypedDict):
     offset: int
 
 
+class PrefetchedState(NamedTuple):
+    """State of an alert rule that was fetched ahead of processing, for a batch of updates."""
+
+    alert_rule: AlertRule
+    triggers: List[AlertRuleTrigger]
+    stats: AlertRuleStats
+    active_incident: Optional[Incident]
+    incident_triggers: Dict[int, IncidentTrigger]
+
+
 class SubscriptionProcessor:
     """
     Class for processing subscription updates for an alert rule. Accepts a subscription
@@ -85,24 +98,91 @@ class SubscriptionProcessor:
         AlertRuleThresholdType.BELOW: (operator.lt, operator.gt),
     }
 
-    def __init__(self, subscription: QuerySubscription) -> None:
+    def __init__(
+        self, subscription: QuerySubscription, state: Optional[PrefetchedState] = None
+    ) -> None:
         self.subscription = subscription
-        try:
-            self.alert_rule = AlertRule.objects.get_for_subscription(subscription)
-        except AlertRule.DoesNotExist:
-            return
+        # Stats are written immediately unless they are collected for a batch of updates.
+        self.stats_pipeline: Optional[Any] = None
+
+        if state is None:
+            try:
+                alert_rule = AlertRule.objects.get_for_subscription(subscription)
+            except AlertRule.DoesNotExist:
+                return
+            triggers = AlertRuleTrigger.objects.get_for_alert_rule(alert_rule)
+            stats = get_alert_rule_stats(alert_rule, subscription, triggers)
+        else:
+            alert_rule, triggers, stats = state.alert_rule, state.triggers, state.stats
+            self._active_incident = state.active_incident
+            self._incident_triggers = state.incident_triggers
 
-        self.triggers = AlertRuleTrigger.objects.get_for_alert_rule(self.alert_rule)
-        self.triggers.sort(key=lambda trigger: trigger.alert_threshold)
+        self.alert_rule = alert_rule
+        self.triggers = sorted(triggers, key=lambda trigger: trigger.alert_threshold)
 
         (
             self.last_update,
             self.trigger_alert_counts,
             self.trigger_resolve_counts,
-        ) = get_alert_rule_stats(self.alert_rule, self.subscription, self.triggers)
+        ) = stats
         self.orig_trigger_alert_counts = deepcopy(self.trigger_alert_counts)
         self.orig_trigger_resolve_counts = deepcopy(self.trigger_resolve_counts)
 
+    @classmethod
+    def for_subscriptions(
+        cls, subscriptions: Sequence[QuerySubscription]
+    ) -> Dict[int, SubscriptionProcessor]:
+        """
+        Creates processors for several subscriptions at once. Alert rules, triggers, active
+        incidents and their triggers are fetched for all subscriptions together, and the alert
+        rule stats are read from Redis in a single pipeline.
+        :return: A dict mapping subscription ids to their processor
+        """
+        alert_rules = AlertRule.objects.get_for_subscriptions(subscriptions)
+        triggers = AlertRuleTrigger.objects.get_for_alert_rules(alert_rules.values())
+        with_rules = [
+            (subscription, alert_rules[subscription.id])
+            for subscription in subscriptions
+            if subscription.id in alert_rules
+        ]
+
+        stats = get_many_alert_rule_stats(
+            [
+                (alert_rule, subscription, triggers[alert_rule.id])
+                for subscription, alert_rule in with_rules
+            ]
+        )
+        active_incidents = Incident.objects.get_active_incidents(
+            [(alert_rule.id, subscription.project_id) for subscription, alert_rule in with_rules]
+        )
+        incident_triggers: Dict[int, Dict[int, IncidentTrigger]] = {
+            incident.id: {} for incident in active_incidents.values() if incident
+        }
+        if incident_triggers:
+            for incident_trigger in IncidentTrigger.objects.filter(
+                incident_id__in=incident_triggers
+            ).select_related("alert_rule_trigger"):
+                incident_triggers[incident_trigger.incident_id][
+                    incident_trigger.alert_rule_trigger_id
+                ] = incident_trigger
+
+        processors = {}
+        for (subscription, alert_rule), rule_stats in zip(with_rules, stats):
+            active_incident = active_incidents[(alert_rule.id, subscription.project_id)]
+            state = PrefetchedState(
+                alert_rule=alert_rule,
+                triggers=triggers[alert_rule.id],
+                stats=rule_stats,
+                active_incident=active_incident,
+                incident_triggers=incident_triggers[active_incident.id] if active_incident else {},
+            )
+            processors[subscription.id] = cls(subscription, state)
+
+        for subscription in subscriptions:
+            if subscription.id not in processors:
+                processors[subscription.id] = cls(subscription)
+        return processors
+
     @property
     def active_incident(self) -> Incident:
         if not hasattr(self, "_active_incident"):
@@ -700,7 +780,62 @@ class SubscriptionProcessor:
             self.last_update,
             updated_trigger_alert_counts,
             updated_trigger_resolve_counts,
+            pipeline=self.stats_pipeline,
         )
+        # Further updates processed by this instance, such as the next update of a batch, only
+        # have to write the counts that change relative to the ones written now.
+        self.orig_trigger_alert_counts = deepcopy(self.trigger_alert_counts)
+        self.orig_trigger_resolve_counts = deepcopy(self.trigger_resolve_counts)
+
+
+def process_updates(updates: Sequence[Tuple[SubscriptionUpdate, QuerySubscription]]) -> None:
+    """
+    Processes a batch of subscription updates, in order.
+
+    State is fetched once for all subscriptions of the batch, see
+    `SubscriptionProcessor.for_subscriptions`, and kept in memory for subsequent updates of the
+    same subscription. Stats are written in a single pipeline once all updates were processed. A
+    failing update is logged and skipped, like in the consumer.
+    """
+    subscriptions = list({subscription.id: subscription for _, subscription in updates}.values())
+
+    # Resolve the relations every update accesses with a query each, rather than per update.
+    projects = {
+        project.id: project
+        for project in Project.objects.get_many_from_cache(
+            list({subscription.project_id for subscription in subscriptions})
+        )
+    }
+    snuba_queries = SnubaQuery.objects.in_bulk(
+        {subscription.snuba_query_id for subscription in subscriptions}
+    )
+    for subscription in subscriptions:
+        if subscription.project_id in projects:
+            subscription.project = projects[subscription.project_id]
+        if subscription.snuba_query_id in snuba_queries:
+            subscription.snuba_query = snuba_queries[subscription.snuba_query_id]
+
+    processors = SubscriptionProcessor.for_subscriptions(subscriptions)
+    pipeline = get_redis_client().pipeline()
+    for processor in processors.values():
+        processor.stats_pipeline = pipeline
+
+    for subscription_update, subscription in updates:
+        try:
+            processors[subscription.id].process_update(subscription_update)
+        except Exception:
+            logger.exception(
+                "Failed to process subscription update",
+                extra={"subscription_id": subscription.id},
+            )
+            # The in-memory state may not match the rolled back transaction anymore, so further
+            # updates of this subscription start over from the stored state.
+            pipeline.execute()
+            processor = SubscriptionProcessor(subscription)
+            processor.stats_pipeline = pipeline
+            processors[subscription.id] = processor
+
+    pipeline.execute()
 
 
 def build_alert_rule_stat_keys(alert_rule: AlertRule, subscription: QuerySubscription) -> List[str]:
@@ -748,7 +883,7 @@ def partition(iterable: Sequence[T], n: int) -> Sequence[Sequence[T]]:
 
 def get_alert_rule_stats(
     alert_rule: AlertRule, subscription: QuerySubscription, triggers: List[AlertRuleTrigger]
-) -> Tuple[datetime, Dict[str, int], Dict[str, int]]:
+) -> AlertRuleStats:
     """
     Fetches stats about the alert rule, specific to the current subscription
     :return: A tuple containing the stats about the alert rule and subscription.
@@ -763,6 +898,34 @@ def get_alert_rule_stats(
     alert_rule_keys = build_alert_rule_stat_keys(alert_rule, subscription)
     trigger_keys = build_trigger_stat_keys(alert_rule, subscription, triggers)
     results = get_redis_client().mget(alert_rule_keys + trigger_keys)
+    return _parse_alert_rule_stats(triggers, results)
+
+
+def get_many_alert_rule_stats(
+    rules: Sequence[Tuple[AlertRule, QuerySubscription, List[AlertRuleTrigger]]]
+) -> List[AlertRuleStats]:
+    """
+    Fetches stats about several alert rules in a single pipeline, see `get_alert_rule_stats`.
+    :return: A list containing the stats of each alert rule, in the order of `rules`.
+    """
+    if not rules:
+        return []
+
+    pipeline = get_redis_client().pipeline()
+    for alert_rule, subscription, triggers in rules:
+        pipeline.mget(
+            build_alert_rule_stat_keys(alert_rule, subscription)
+            + build_trigger_stat_keys(alert_rule, subscription, triggers)
+        )
+    return [
+        _parse_alert_rule_stats(triggers, results)
+        for (_, _, triggers), results in zip(rules, pipeline.execute())
+    ]
+
+
+def _parse_alert_rule_stats(
+    triggers: List[AlertRuleTrigger], results: Sequence[Optional[bytes]]
+) -> AlertRuleStats:
     results = tuple(0 if result is None else int(result) for result in results)
     last_update = to_datetime(results[0])
     trigger_results = results[1:]
@@ -784,11 +947,15 @@ def update_alert_rule_stats(
     last_update: datetime,
     alert_counts: Dict[str, int],
     resolve_counts: Dict[str, int],
+    pipeline: Optional[Any] = None,
 ) -> None:
     """
-    Updates stats about the alert rule, subscription and triggers if they've changed.
+    Updates stats about the alert rule, subscription and triggers if they've changed. If a
+    pipeline is passed, the writes are added to it and executing it is left to the caller.
     """
-    pipeline = get_redis_client().pipeline()
+    execute = pipeline is None
+    if pipeline is None:
+        pipeline = get_redis_client().pipeline()
 
     counts_with_stat_keys = zip(ALERT_RULE_TRIGGER_STAT_KEYS, (alert_counts, resolve_counts))
     for stat_key, trigger_counts in counts_with_stat_keys:
@@ -803,7 +970,8 @@ def update_alert_rule_stats(
 
     last_update_key = build_alert_rule_stat_keys(alert_rule, subscription)[0]
     pipeline.set(last_update_key, int(to_timestamp(last_update)), ex=REDIS_TTL)
-    pipeline.execute()
+    if execute:
+        pipeline.execute()
 
 
 def get_redis_client() -> RetryingRedisCluster:
@@ -3,7 +3,7 @@ from __future__ import annotations
 import logging
 from datetime import datetime
 from hashlib import md5
-from typing import Any, Mapping, Optional, Tuple, TypedDict, cast
+from typing import Any, Collection, Mapping, MutableMapping, Optional, Tuple, TypedDict, cast
 
 import sentry_sdk
 from django.conf import settings
@@ -23,7 +23,7 @@ from sentry.event_manager import (
 from sentry.eventstore.models import Event
 from sentry.issues.grouptype import should_create_group
 from sentry.issues.issue_occurrence import IssueOccurrence, IssueOccurrenceData
-from sentry.models import GroupHash, Release
+from sentry.models import Group, GroupHash, Project, Release
 from sentry.ratelimits.sliding_windows import Quota, RedisSlidingWindowRateLimiter, RequestedQuota
 from sentry.utils import metrics, redis
 
@@ -38,8 +38,13 @@ ISSUE_QUOTA = Quota(3600, 60, 5)
 logger = logging.getLogger(__name__)
 
 
+#: Groups of a batch of occurrences, by project id and primary hash. ``None`` marks hashes that
+#: are known to have no group yet.
+GroupsByHash = MutableMapping[Tuple[int, str], Optional[Group]]
+
+
 def save_issue_occurrence(
-    occurrence_data: IssueOccurrenceData, event: Event
+    occurrence_data: IssueOccurrenceData, event: Event, groups: Optional[GroupsByHash] = None
 ) -> Tuple[IssueOccurrence, Optional[GroupInfo]]:
     # Do not hash fingerprints for performance issues because they're already
     # hashed in save_aggregate_performance
@@ -60,7 +65,7 @@ def save_issue_occurrence(
         # The release should always exist here since event has been ingested at this point, but just
         # in case it has been deleted
         release = None
-    group_info = save_issue_from_occurrence(occurrence, event, release)
+    group_info = save_issue_from_occurrence(occurrence, event, release, groups)
     if group_info:
         send_issue_occurrence_to_eventstream(event, occurrence, group_info)
 
@@ -83,6 +88,38 @@ def process_occurrence_data(occurrence_data: IssueOccurrenceData) -> None:
     ]
 
 
+def get_primary_hash(occurrence_data: IssueOccurrenceData, project: Project) -> str:
+    """
+    Returns the hash that `save_issue_occurrence` looks the group of an occurrence up by, without
+    modifying the occurrence.
+    """
+    fingerprint = occurrence_data["fingerprint"][0]
+    if can_create_group(occurrence_data, project):
+        return md5(fingerprint.encode("utf-8")).hexdigest()
+    return fingerprint
+
+
+def prefetch_groups(keys: Collection[Tuple[int, str]]) -> GroupsByHash:
+    """
+    Looks up the groups of several occurrences at once, given their project ids and primary
+    hashes. The result can be passed to `save_issue_occurrence` for each of the occurrences.
+    """
+    groups: GroupsByHash = {key: None for key in keys}
+    if not groups:
+        return groups
+
+    grouphashes = GroupHash.objects.filter(
+        project_id__in={project_id for project_id, _ in keys},
+        hash__in={hash for _, hash in keys},
+    ).select_related("group")
+    for grouphash in grouphashes:
+        key = (grouphash.project_id, grouphash.hash)
+        # Keep the first match, like the lookup in `save_issue_from_occurrence`.
+        if key in groups and groups[key] is None:
+            groups[key] = grouphash.group
+    return groups
+
+
 class IssueArgs(TypedDict):
     platform: Optional[str]
     message: str
@@ -149,7 +186,10 @@ def materialize_metadata(occurrence: IssueOccurrence, event: Event) -> Occurrenc
 
 @metrics.wraps("issues.ingest.save_issue_from_occurrence")
 def save_issue_from_occurrence(
-    occurrence: IssueOccurrence, event: Event, release: Optional[Release]
+    occurrence: IssueOccurrence,
+    event: Event,
+    release: Optional[Release],
+    groups: Optional[GroupsByHash] = None,
 ) -> Optional[GroupInfo]:
     project = event.project
     issue_kwargs = _create_issue_kwargs(occurrence, event, release)
@@ -158,17 +198,22 @@ def save_issue_from_occurrence(
     # Note that additional fingerprints won't be used to generated additional issues, they'll be
     # used to map the occurrence to a specific issue.
     new_grouphash = occurrence.fingerprint[0]
-    existing_grouphash = (
-        GroupHash.objects.filter(project=project, hash=new_grouphash)
-        .select_related("group")
-        .first()
-    )
+    group_key = (project.id, new_grouphash)
+    if groups is not None and group_key in groups:
+        existing_group = groups[group_key]
+    else:
+        existing_grouphash = (
+            GroupHash.objects.filter(project=project, hash=new_grouphash)
+            .select_related("group")
+            .first()
+        )
+        existing_group = existing_grouphash.group if existing_grouphash else None
 
     # This forces an early return to skip extra processing steps
     # for performance issues because they are already created/updated in save_transaction
     return_group_info_early = not can_create_group(occurrence, project)
 
-    if not existing_grouphash:
+    if not existing_group:
         if return_group_info_early:
             return None
 
@@ -206,8 +251,10 @@ def save_issue_from_occurrence(
                 tags={"platform": event.platform or "unknown", "type": occurrence.type.type_id},
             )
             group_info = GroupInfo(group=group, is_new=is_new, is_regression=is_regression)
+        if groups is not None:
+            groups[group_key] = group
     else:
-        group = existing_grouphash.group
+        group = existing_group
         if group.issue_category.value != occurrence.type.category:
             logger.error(
                 "save_issue_from_occurrence.category_mismatch",
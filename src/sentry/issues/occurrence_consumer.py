@@ -1,5 +1,5 @@
 import logging
-from typing import Any, Dict, Mapping, Optional, Tuple
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
 from uuid import UUID
 
 import jsonschema
@@ -16,6 +16,7 @@ from arroyo.processing.strategies import (
     ProcessingStrategyFactory,
     RunTask,
 )
+from arroyo.processing.strategies.batching import BatchStep, ValuesBatch
 from arroyo.types import Commit, Message, Partition
 from django.conf import settings
 from django.utils import timezone
@@ -24,7 +25,12 @@ from sentry import nodestore
 from sentry.event_manager import GroupInfo
 from sentry.eventstore.models import Event
 from sentry.issues.grouptype import get_group_type_by_type_id
-from sentry.issues.ingest import save_issue_occurrence
+from sentry.issues.ingest import (
+    GroupsByHash,
+    get_primary_hash,
+    prefetch_groups,
+    save_issue_occurrence,
+)
 from sentry.issues.issue_occurrence import DEFAULT_LEVEL, IssueOccurrence, IssueOccurrenceData
 from sentry.issues.json_schemas import EVENT_PAYLOAD_SCHEMA
 from sentry.models import Organization, Project
@@ -48,9 +54,16 @@ def get_occurrences_ingest_consumer(
     auto_offset_reset: str,
     group_id: str,
     strict_offset_reset: bool,
+    max_batch_size: Optional[int] = None,
+    max_batch_time: Optional[int] = None,
 ) -> StreamProcessor[KafkaPayload]:
     return create_ingest_occurences_consumer(
-        consumer_type, auto_offset_reset, group_id, strict_offset_reset
+        consumer_type,
+        auto_offset_reset,
+        group_id,
+        strict_offset_reset,
+        max_batch_size=max_batch_size,
+        max_batch_time=max_batch_time,
     )
 
 
@@ -59,6 +72,8 @@ def create_ingest_occurences_consumer(
     auto_offset_reset: str,
     group_id: str,
     strict_offset_reset: bool,
+    max_batch_size: Optional[int] = None,
+    max_batch_time: Optional[int] = None,
 ) -> StreamProcessor[KafkaPayload]:
     kafka_cluster = settings.KAFKA_TOPICS[topic_name]["cluster"]
     create_topics(kafka_cluster, [topic_name])
@@ -72,7 +87,9 @@ def create_ingest_occurences_consumer(
         )
     )
 
-    strategy_factory = OccurrenceStrategyFactory()
+    strategy_factory = OccurrenceStrategyFactory(
+        max_batch_size=max_batch_size, max_batch_time=max_batch_time
+    )
 
     return StreamProcessor(
         consumer,
@@ -109,8 +126,33 @@ def lookup_event(project_id: int, event_id: str) -> Event:
     return event
 
 
+def lookup_events(keys: Sequence[Tuple[int, str]]) -> Dict[Tuple[int, str], Event]:
+    """
+    Looks up several events at once, given their project ids and event ids. Events that could not
+    be found are omitted.
+    """
+    if not keys:
+        return {}
+
+    node_ids = {
+        Event.generate_node_id(project_id, event_id): (project_id, event_id)
+        for project_id, event_id in keys
+    }
+    events = {}
+    for node_id, data in nodestore.get_multi(list(node_ids)).items():
+        if data is None:
+            continue
+        project_id, event_id = node_ids[node_id]
+        event = Event(event_id=event_id, project_id=project_id)
+        event.data = data
+        events[(project_id, event_id)] = event
+    return events
+
+
 def process_event_and_issue_occurrence(
-    occurrence_data: IssueOccurrenceData, event_data: Dict[str, Any]
+    occurrence_data: IssueOccurrenceData,
+    event_data: Dict[str, Any],
+    groups: Optional[GroupsByHash] = None,
 ) -> Tuple[IssueOccurrence, Optional[GroupInfo]]:
     if occurrence_data["event_id"] != event_data["event_id"]:
         raise ValueError(
@@ -118,20 +160,31 @@ def process_event_and_issue_occurrence(
         )
 
     event = save_event_from_occurrence(event_data)
-    return save_issue_occurrence(occurrence_data, event)
+    return save_issue_occurrence(occurrence_data, event, groups)
 
 
 def lookup_event_and_process_issue_occurrence(
     occurrence_data: IssueOccurrenceData,
+    events: Optional[Mapping[Tuple[int, str], Event]] = None,
+    groups: Optional[GroupsByHash] = None,
 ) -> Tuple[IssueOccurrence, Optional[GroupInfo]]:
     project_id = occurrence_data["project_id"]
     event_id = occurrence_data["event_id"]
-    try:
-        event = lookup_event(project_id, event_id)
-    except Exception:
-        raise EventLookupError(f"Failed to lookup event({event_id}) for project_id({project_id})")
+    if events is not None:
+        event = events.get((project_id, event_id))
+        if event is None:
+            raise EventLookupError(
+                f"Failed to lookup event({event_id}) for project_id({project_id})"
+            )
+    else:
+        try:
+            event = lookup_event(project_id, event_id)
+        except Exception:
+            raise EventLookupError(
+                f"Failed to lookup event({event_id}) for project_id({project_id})"
+            )
 
-    return save_issue_occurrence(occurrence_data, event)
+    return save_issue_occurrence(occurrence_data, event, groups)
 
 
 def _get_kwargs(payload: Mapping[str, Any]) -> Mapping[str, Any]:
@@ -265,30 +318,140 @@ def _process_message(
             txn.set_tag("project_id", project.id)
             txn.set_tag("project_slug", project.slug)
 
-            group_type = get_group_type_by_type_id(occurrence_data["type"])
-            if not group_type.allow_ingest(organization):
-                metrics.incr(
-                    "occurrence_ingest.dropped_feature_disabled",
-                    sample_rate=1.0,
-                    tags={"occurrence_type": occurrence_data["type"]},
-                )
+            if not _allow_ingest(occurrence_data, organization):
                 txn.set_tag("result", "dropped_feature_disabled")
                 return None
 
+            txn.set_tag("result", "success")
             if "event_data" in kwargs:
-                txn.set_tag("result", "success")
                 return process_event_and_issue_occurrence(
                     kwargs["occurrence_data"], kwargs["event_data"]
                 )
             else:
-                txn.set_tag("result", "success")
                 return lookup_event_and_process_issue_occurrence(kwargs["occurrence_data"])
         except (ValueError, KeyError) as e:
             txn.set_tag("result", "error")
             raise InvalidEventPayloadError(e)
 
 
+def _allow_ingest(occurrence_data: IssueOccurrenceData, organization: Organization) -> bool:
+    group_type = get_group_type_by_type_id(occurrence_data["type"])
+    if not group_type.allow_ingest(organization):
+        metrics.incr(
+            "occurrence_ingest.dropped_feature_disabled",
+            sample_rate=1.0,
+            tags={"occurrence_type": occurrence_data["type"]},
+        )
+        return False
+    return True
+
+
+def _process_batch(messages: Sequence[Mapping[str, Any]]) -> None:
+    """
+    Processes a batch of occurrences.
+
+    Projects, organizations, events that are looked up from nodestore and the groups of all
+    occurrences are fetched once for the whole batch. Occurrences with the same project and
+    fingerprint, which producers tend to send in bursts, share the group lookup, so only the first
+    one of them creates a group. Occurrences are then saved in order, and a failure only skips the
+    affected occurrence.
+    """
+    with sentry_sdk.start_transaction(
+        op="_process_batch",
+        name="issues.occurrence_consumer",
+        sampled=True,
+    ) as txn:
+        txn.set_data("batch_size", len(messages))
+
+        parsed = []
+        for message in messages:
+            try:
+                kwargs = _get_kwargs(message)
+            except Exception:
+                logger.exception("failed to process message payload")
+                continue
+            occurrence_data = kwargs["occurrence_data"]
+            metrics.incr(
+                "occurrence_ingest.messages",
+                sample_rate=1.0,
+                tags={"occurrence_type": occurrence_data["type"]},
+            )
+            parsed.append(kwargs)
+
+        projects = {
+            project.id: project
+            for project in Project.objects.get_many_from_cache(
+                list({kwargs["occurrence_data"]["project_id"] for kwargs in parsed})
+            )
+        }
+        organizations = {
+            organization.id: organization
+            for organization in Organization.objects.get_many_from_cache(
+                list({project.organization_id for project in projects.values()})
+            )
+        }
+
+        accepted = []
+        for kwargs in parsed:
+            occurrence_data = kwargs["occurrence_data"]
+            project = projects.get(occurrence_data["project_id"])
+            organization = organizations.get(project.organization_id) if project else None
+            if project is None or organization is None:
+                logger.error(
+                    "failed to process message payload",
+                    extra={"project_id": occurrence_data["project_id"]},
+                )
+                continue
+            try:
+                if _allow_ingest(occurrence_data, organization):
+                    accepted.append(
+                        (kwargs, (project.id, get_primary_hash(occurrence_data, project)))
+                    )
+            except Exception:
+                logger.exception("failed to process message payload")
+
+        with metrics.timer("occurrence_consumer.process_batch.lookup_events"):
+            events = lookup_events(
+                [
+                    (kwargs["occurrence_data"]["project_id"], kwargs["occurrence_data"]["event_id"])
+                    for kwargs, _ in accepted
+                    if "event_data" not in kwargs
+                ]
+            )
+
+        with metrics.timer("occurrence_consumer.process_batch.prefetch_groups"):
+            groups = prefetch_groups({group_key for _, group_key in accepted})
+        metrics.timing("occurrence_consumer.process_batch.distinct_groups", len(groups))
+
+        for kwargs, _ in accepted:
+            try:
+                if "event_data" in kwargs:
+                    process_event_and_issue_occurrence(
+                        kwargs["occurrence_data"], kwargs["event_data"], groups
+                    )
+                else:
+                    lookup_event_and_process_issue_occurrence(
+                        kwargs["occurrence_data"], events, groups
+                    )
+            except Exception:
+                logger.exception("failed to process message payload")
+
+
 class OccurrenceStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
+    """
+    Ingests issue occurrences.
+
+    If "max_batch_size" is set, messages are batched and processed together, see
+    "_process_batch". Otherwise every message is processed on its own.
+    """
+
+    def __init__(
+        self, max_batch_size: Optional[int] = None, max_batch_time: Optional[int] = None
+    ) -> None:
+        self.max_batch_size = max_batch_size
+        # The batch time is configured in milliseconds.
+        self.max_batch_time = (max_batch_time or 1000) / 1000
+
     def create_with_partitions(
         self,
         commit: Commit,
@@ -306,4 +469,23 @@ class OccurrenceStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
             ):
                 logger.exception("failed to process message payload")
 
-        return RunTask(process_message, CommitOffsets(commit))
+        def process_batch(message: Message[ValuesBatch[KafkaPayload]]) -> None:
+            payloads = []
+            for value in message.payload:
+                try:
+                    payloads.append(json.loads(value.payload.value, use_rapid_json=True))
+                except rapidjson.JSONDecodeError:
+                    logger.exception("failed to process message payload")
+            try:
+                _process_batch(payloads)
+            except Exception:
+                logger.exception("failed to process batch of message payloads")
+
+        if not self.max_batch_size:
+            return RunTask(process_message, CommitOffsets(commit))
+
+        return BatchStep(
+            max_batch_size=self.max_batch_size,
+            max_batch_time=self.max_batch_time,
+            next_step=RunTask(process_batch, CommitOffsets(commit)),
+        )
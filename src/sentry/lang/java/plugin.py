@@ -29,24 +29,28 @@ class JavaStacktraceProcessor(StacktraceProcessor):
             return False
 
         with sentry_sdk.start_span(op="proguard.fetch_debug_files"):
-            dif_paths = ProjectDebugFile.difcache.fetch_difs(
+            difs = ProjectDebugFile.objects.find_by_debug_ids(
                 self.project, self.images, features=["mapping"]
             )
             self.mapping_views = []
+            self.mapping_debug_file_ids = []
 
         for debug_id in self.images:
             error_type = None
 
-            dif_path = dif_paths.get(debug_id)
-            if dif_path is None:
+            dif = difs.get(debug_id)
+            if dif is None:
                 error_type = EventError.PROGUARD_MISSING_MAPPING
             else:
+                with sentry_sdk.start_span(op="proguard.fetch_debug_files"):
+                    dif_path = ProjectDebugFile.difcache.fetch_dif(self.project, dif)
                 with sentry_sdk.start_span(op="proguard.open"):
                     view = ProguardMapper.open(dif_path)
                     if not view.has_line_info:
                         error_type = EventError.PROGUARD_MISSING_LINENO
                     else:
                         self.mapping_views.append(view)
+                        self.mapping_debug_file_ids.append(dif.id)
 
             if error_type is None:
                 continue
@@ -85,6 +89,13 @@ class JavaStacktraceProcessor(StacktraceProcessor):
 
         return False
 
+    def get_frame_memoization_key(self, processable_frame):
+        # Remapping only depends on the frame itself and the mapping files
+        # that were loaded, in order.  Mapping files are identified by their
+        # upload rather than their debug id, since the same debug id can be
+        # uploaded to several projects or uploaded again.
+        return [self.project.id, self.mapping_debug_file_ids, processable_frame.frame]
+
     def process_frame(self, processable_frame, processing_task):
         frame = processable_frame.frame
         raw_frame = dict(frame)
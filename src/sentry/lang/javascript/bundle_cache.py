@@ -0,0 +1,294 @@
+"""
+On-disk cache of extracted artifact bundles.
+
+Artifact bundles are immutable once uploaded, which means that the files contained in them can be extracted once per
+worker host and shared across events and processes. Every bundle is stored in its own directory containing:
+
+- ``data``: all the files of the bundle concatenated one after another.
+- ``index.json``: a prebuilt index mapping urls and (debug_id, source_file_type) pairs to the offset and size of the
+  respective file inside ``data``, together with the headers declared in the manifest.
+
+Readers memory-map ``data`` so that the bytes of large sourcemaps are served from the page cache instead of being
+re-downloaded and re-inflated for each event. The total size of the cache is bounded by an LRU disk budget, where the
+recency of a bundle is tracked through the modification time of its index.
+"""
+
+import io
+import logging
+import mmap
+import os
+import shutil
+import uuid
+from typing import IO, Dict, List, Optional, Tuple
+
+from sentry import options
+from sentry.models.artifactbundle import ArtifactBundleArchive, SourceFileType
+from sentry.utils import json, metrics
+
+__all__ = ["ArtifactBundleDiskCache", "MappedArtifactBundle", "artifact_bundle_disk_cache"]
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.json"
+DATA_FILENAME = "data"
+TEMP_PREFIX = ".tmp-"
+
+
+def _debug_id_key(debug_id: str, source_file_type: SourceFileType) -> str:
+    return f"{debug_id}/{source_file_type.value}"
+
+
+class MappedFile(io.RawIOBase):
+    """Read-only file object over a slice of a memory-mapped file."""
+
+    def __init__(self, mapped: Optional[mmap.mmap], offset: int, size: int):
+        self._mapped = mapped
+        self._start = offset
+        self._end = offset + size
+        self._pos = offset
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos - self._start
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = self._start + offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self._end + offset
+        else:
+            raise ValueError(f"invalid whence ({whence})")
+        self._pos = min(max(pos, self._start), self._end)
+        return self.tell()
+
+    def read(self, size: int = -1) -> bytes:
+        if self._mapped is None:
+            return b""
+        end = self._end if size is None or size < 0 else min(self._pos + size, self._end)
+        rv = self._mapped[self._pos : end]
+        self._pos = end
+        return rv
+
+    def readall(self) -> bytes:
+        return self.read()
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+class MappedArtifactBundle:
+    """
+    Read-only view of an extracted artifact bundle stored in the disk cache.
+
+    It exposes the same lookup methods as ``ArtifactBundleArchive`` that are used by the ``Fetcher``, so it can be
+    stored among the open archives and used interchangeably.
+    """
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, INDEX_FILENAME), "rb") as f:
+            index = json.loads(f.read())
+
+        self._files: Dict[str, dict] = index["files"]
+        self._urls: Dict[str, str] = index["urls"]
+        self._debug_ids: Dict[str, str] = index["debug_ids"]
+
+        self._mapped = None
+        with open(os.path.join(path, DATA_FILENAME), "rb") as f:
+            # Empty files can't be memory mapped, which happens for bundles that only contain empty files.
+            if os.fstat(f.fileno()).st_size > 0:
+                self._mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        if self._mapped is not None:
+            self._mapped.close()
+            self._mapped = None
+
+    def _open(self, file_path: str) -> Tuple[IO, dict]:
+        entry = self._files[file_path]
+        return MappedFile(self._mapped, entry["offset"], entry["size"]), entry["headers"]
+
+    def get_file_by_url(self, url: str) -> Tuple[IO, dict]:
+        return self._open(self._urls[url])
+
+    def get_file_by_debug_id(
+        self, debug_id: str, source_file_type: SourceFileType
+    ) -> Tuple[IO, dict]:
+        return self._open(self._debug_ids[_debug_id_key(debug_id, source_file_type)])
+
+    def get_file_url_by_debug_id(
+        self, debug_id: str, source_file_type: SourceFileType
+    ) -> Optional[str]:
+        file_path = self._debug_ids.get(_debug_id_key(debug_id, source_file_type))
+        if file_path is not None:
+            return self._files[file_path]["url"]
+
+        return None
+
+
+class ArtifactBundleDiskCache:
+    @property
+    def cache_path(self) -> str:
+        return options.get("sourcemaps.artifact-bundle-cache.path")  # type: ignore
+
+    @property
+    def max_size(self) -> int:
+        return options.get("sourcemaps.artifact-bundle-cache.max-size")  # type: ignore
+
+    @property
+    def enabled(self) -> bool:
+        return bool(options.get("sourcemaps.artifact-bundle-cache.enabled"))
+
+    def get_bundle_path(self, artifact_bundle_id: int) -> str:
+        return os.path.join(self.cache_path, str(artifact_bundle_id))
+
+    def get(self, artifact_bundle_id: int) -> Optional[MappedArtifactBundle]:
+        """
+        Returns the extracted bundle with the given id or ``None`` if it is not in the cache.
+        """
+        bundle_path = self.get_bundle_path(artifact_bundle_id)
+        try:
+            bundle = MappedArtifactBundle(bundle_path)
+        except FileNotFoundError:
+            metrics.incr("sourcemaps.artifact_bundle_cache.get", tags={"hit": False})
+            return None
+        except Exception:
+            # A corrupted entry is removed, so that it will be extracted again.
+            logger.exception("sourcemaps.artifact_bundle_cache.corrupted_entry")
+            shutil.rmtree(bundle_path, ignore_errors=True)
+            metrics.incr("sourcemaps.artifact_bundle_cache.get", tags={"hit": False})
+            return None
+
+        # Bump the recency of the bundle for the LRU eviction.
+        try:
+            os.utime(os.path.join(bundle_path, INDEX_FILENAME))
+        except OSError:
+            pass
+
+        metrics.incr("sourcemaps.artifact_bundle_cache.get", tags={"hit": True})
+        return bundle
+
+    def store(
+        self, artifact_bundle_id: int, archive: ArtifactBundleArchive
+    ) -> MappedArtifactBundle:
+        """
+        Extracts all the files of an opened archive into the cache, building the lookup index along the way, and
+        returns the extracted bundle.
+
+        The bundle is written into a temporary directory which is atomically moved into place, so that concurrent
+        readers and writers on the same host never observe a partially written entry.
+        """
+        bundle_path = self.get_bundle_path(artifact_bundle_id)
+        if os.path.isdir(bundle_path):
+            return MappedArtifactBundle(bundle_path)
+
+        os.makedirs(self.cache_path, exist_ok=True)
+        temp_path = os.path.join(self.cache_path, f"{TEMP_PREFIX}{uuid.uuid4().hex}")
+        os.mkdir(temp_path)
+
+        try:
+            with metrics.timer("sourcemaps.artifact_bundle_cache.extract"):
+                index = self._extract(archive, temp_path)
+                with open(os.path.join(temp_path, INDEX_FILENAME), "wb") as f:
+                    f.write(json.dumps(index).encode("utf-8"))
+
+            try:
+                os.rename(temp_path, bundle_path)
+            except OSError:
+                # Another process extracted the same bundle in the meantime.
+                shutil.rmtree(temp_path, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(temp_path, ignore_errors=True)
+            raise
+
+        # The bundle is opened before enforcing the size limit, since an open mapping survives the eviction.
+        bundle = MappedArtifactBundle(bundle_path)
+        self.enforce_size_limit()
+        return bundle
+
+    def _extract(self, archive: ArtifactBundleArchive, path: str) -> dict:
+        files = {}
+        urls = {}
+        debug_ids = {}
+
+        offset = 0
+        with open(os.path.join(path, DATA_FILENAME), "wb") as data:
+            for file_path, info in archive.manifest.get("files", {}).items():
+                fp, headers = archive.get_file(file_path)
+                with fp:
+                    shutil.copyfileobj(fp, data)
+                size = data.tell() - offset
+
+                url = info.get("url")
+                files[file_path] = {"offset": offset, "size": size, "url": url, "headers": headers}
+                offset += size
+
+                if url is not None:
+                    urls[url] = file_path
+
+                normalized_headers = ArtifactBundleArchive.normalize_headers(headers)
+                debug_id = ArtifactBundleArchive.normalize_debug_id(
+                    normalized_headers.get("debug-id")
+                )
+                source_file_type = SourceFileType.from_lowercase_key(info.get("type"))
+                if debug_id is not None and source_file_type is not None:
+                    debug_ids[_debug_id_key(debug_id, source_file_type)] = file_path
+
+        metrics.timing("sourcemaps.artifact_bundle_cache.extracted_size", offset)
+        return {"files": files, "urls": urls, "debug_ids": debug_ids}
+
+    def _list_entries(self) -> List[Tuple[float, int, str]]:
+        entries = []
+        try:
+            names = os.listdir(self.cache_path)
+        except OSError:
+            return entries
+
+        for name in names:
+            if name.startswith(TEMP_PREFIX):
+                continue
+            bundle_path = os.path.join(self.cache_path, name)
+            try:
+                mtime = os.path.getmtime(os.path.join(bundle_path, INDEX_FILENAME))
+                size = sum(
+                    os.path.getsize(os.path.join(bundle_path, filename))
+                    for filename in (INDEX_FILENAME, DATA_FILENAME)
+                )
+            except OSError:
+                continue
+            entries.append((mtime, size, bundle_path))
+
+        return entries
+
+    def enforce_size_limit(self) -> None:
+        """
+        Evicts the least recently used bundles until the cache fits into the configured disk budget.
+
+        Readers which already memory-mapped an evicted bundle keep working, since the mapping stays valid until it
+        is closed.
+        """
+        entries = self._list_entries()
+        total_size = sum(size for _, size, _ in entries)
+
+        evicted = 0
+        for _, size, bundle_path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            shutil.rmtree(bundle_path, ignore_errors=True)
+            total_size -= size
+            evicted += 1
+
+        if evicted:
+            metrics.incr("sourcemaps.artifact_bundle_cache.evicted", amount=evicted)
+        metrics.gauge("sourcemaps.artifact_bundle_cache.size", total_size)
+
+
+artifact_bundle_disk_cache = ArtifactBundleDiskCache()
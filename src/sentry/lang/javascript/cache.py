@@ -1,8 +1,11 @@
 from symbolic import SourceView
 
+from sentry import options
+from sentry.utils import metrics
+from sentry.utils.datastructures import LRUCache
 from sentry.utils.strings import codec_lookup
 
-__all__ = ["SourceCache", "SourceMapCache"]
+__all__ = ["SourceCache", "SourceMapCache", "SharedProcessingCache", "shared_processing_cache"]
 
 
 def is_utf8(codec):
@@ -90,3 +93,65 @@ class SourceMapCache:
             sourcemap = self.get(sourcemap_url)
             return (sourcemap_url, sourcemap)
         return (None, None)
+
+
+class SharedProcessingCache:
+    """
+    Process-wide, size bounded LRU cache of parsed ``SourceView`` and ``SmCache`` objects.
+
+    As opposed to the caches above, which live for the processing of a single event, entries of this cache are
+    shared across all the events processed by a worker. Keys are expected to contain a checksum of the files the
+    value was parsed from, so that a changed release file naturally results in a different key, while the stale
+    entry ages out of the cache.
+
+    The size of an entry is an approximation of its memory footprint provided by the caller. The maximum size is
+    controlled by the ``processing.javascript.shared-cache-max-size`` option, where ``0`` disables the cache.
+    """
+
+    def __init__(self):
+        self._cache = LRUCache(
+            max_size=lambda: options.get("processing.javascript.shared-cache-max-size")
+        )
+
+    @property
+    def enabled(self):
+        return bool(self._cache.max_size)
+
+    @property
+    def size(self):
+        return self._cache.size
+
+    def __len__(self):
+        return len(self._cache)
+
+    def get(self, key, kind):
+        value = self._cache.get(key)
+        metrics.incr(
+            "sourcemaps.shared_cache.lookup", tags={"kind": kind, "hit": value is not None}
+        )
+        return value
+
+    def set(self, key, value, size):
+        evicted = self._cache.set(key, value, size)
+
+        if evicted:
+            metrics.incr("sourcemaps.shared_cache.evicted", amount=evicted)
+        metrics.gauge("sourcemaps.shared_cache.size", self._cache.size)
+        metrics.gauge("sourcemaps.shared_cache.items", len(self._cache))
+
+    def get_or_create(self, key, kind, create_fn, size):
+        """
+        Returns the cached value for ``key``, calling ``create_fn`` and caching its result on a miss.
+        """
+        value = self.get(key, kind)
+        if value is None:
+            value = create_fn()
+            self.set(key, value, size)
+
+        return value
+
+    def clear(self):
+        self._cache.clear()
+
+
+shared_processing_cache = SharedProcessingCache()
@@ -1,6 +1,7 @@
 import base64
 import binascii
 import errno
+import hashlib
 import logging
 import re
 import sys
@@ -24,6 +25,8 @@ from symbolic import SourceView
 
 from sentry import features, http, options
 from sentry.event_manager import set_tag
+from sentry.lang.javascript.bundle_cache import artifact_bundle_disk_cache
+from sentry.lang.javascript.cache import shared_processing_cache
 from sentry.models import (
     NULL_STRING,
     ArtifactBundle,
@@ -779,6 +782,48 @@ class Fetcher:
         artifact_bundle_file.seek(0)
         return artifact_bundle_file
 
+    @staticmethod
+    def _get_extracted_artifact_bundle(artifact_bundle_id):
+        """
+        Returns the extracted artifact bundle from the on-disk cache, if the cache is enabled and contains it.
+        """
+        if not artifact_bundle_disk_cache.enabled:
+            return None
+
+        try:
+            return artifact_bundle_disk_cache.get(artifact_bundle_id)
+        except Exception as exc:
+            logger.debug(
+                "Failed to load artifact bundle %s from disk cache",
+                artifact_bundle_id,
+                exc_info=exc,
+            )
+            return None
+
+    @staticmethod
+    def _open_artifact_bundle_file(artifact_bundle_id, artifact_bundle_file):
+        """
+        Opens an artifact bundle file as an archive.
+
+        In case the on-disk cache is enabled, the archive is extracted into it and a memory-mapped view of the
+        extracted files is returned instead, so that subsequent events and processes can skip fetching and
+        inflating the bundle.
+        """
+        archive = ArtifactBundleArchive(artifact_bundle_file)
+        if not artifact_bundle_disk_cache.enabled:
+            return archive
+
+        try:
+            extracted_archive = artifact_bundle_disk_cache.store(artifact_bundle_id, archive)
+        except Exception as exc:
+            logger.debug(
+                "Failed to store artifact bundle %s in disk cache", artifact_bundle_id, exc_info=exc
+            )
+            return archive
+
+        archive.close()
+        return extracted_archive
+
     def _open_artifact_bundle_archive(self, debug_id, source_file_type):
         """
         Opens an ArtifactBundle as a .zip file and returns an ArtifactBundleArchive object that allows the caller
@@ -790,6 +835,8 @@ class Fetcher:
         2. self._fetch_artifact_bundle_file uses inside the default cache which is hosted on memcached and stores the
         actual File object bound to a specific ArtifactBundle. memcached is persisted across processor runs as opposed
         to the local cache.
+
+        In case the on-disk cache of extracted bundles is enabled, it is consulted before memcached.
         """
         artifact_bundle_id = None
 
@@ -821,8 +868,14 @@ class Fetcher:
 
                 return cached_open_archive
 
-            # In case the local cache doesn't have the archive, we will try to load it from memcached and then directly
-            # from the source.
+            # In case the local cache doesn't have the archive, we will try to load it from the disk cache of
+            # extracted bundles.
+            extracted_archive = self._get_extracted_artifact_bundle(artifact_bundle_id)
+            if extracted_archive is not None:
+                self.open_archives[artifact_bundle_id] = extracted_archive
+                return extracted_archive
+
+            # As a last resort we will try to load it from memcached and then directly from the source.
             artifact_bundle_file = self._fetch_artifact_bundle_file(artifact_bundle)
         except Exception as exc:
             logger.debug(
@@ -841,7 +894,7 @@ class Fetcher:
             try:
                 # We load the entire bundle into an archive and cache it locally. It is very important that this opened
                 # archive is closed before the processing ends.
-                archive = ArtifactBundleArchive(artifact_bundle_file)
+                archive = self._open_artifact_bundle_file(artifact_bundle_id, artifact_bundle_file)
                 self.open_archives[artifact_bundle_id] = archive
             except Exception as exc:
                 artifact_bundle_file.seek(0)
@@ -976,6 +1029,11 @@ class Fetcher:
                 if cached_open_archive is not None:
                     return cached_open_archive
 
+                extracted_archive = self._get_extracted_artifact_bundle(artifact_bundle.id)
+                if extracted_archive is not None:
+                    self.open_archives[artifact_bundle.id] = extracted_archive
+                    continue
+
                 try:
                     # In case we didn't find the archive in the cache, we want to fetch the artifact bundle to put later
                     # in the cache.
@@ -1010,7 +1068,9 @@ class Fetcher:
         else:
             for artifact_bundle_id, artifact_bundle_file in artifact_bundle_files:
                 try:
-                    archive = ArtifactBundleArchive(artifact_bundle_file)
+                    archive = self._open_artifact_bundle_file(
+                        artifact_bundle_id, artifact_bundle_file
+                    )
                     self.open_archives[artifact_bundle_id] = archive
                 except Exception as exc:
                     artifact_bundle_file.seek(0)
@@ -1793,7 +1853,9 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
                 span.set_data("debug_id", debug_id)
                 result = self.fetcher.fetch_by_debug_id(debug_id, source_file_type)
                 if result is not None:
-                    sourceview = SourceView.from_bytes(result.body)
+                    sourceview = self._parse_sourceview(
+                        ("debug_id", debug_id, source_file_type.value), result.body
+                    )
                     self.fetch_by_debug_id_sourceviews[debug_id, source_file_type] = sourceview
                     return sourceview, FetcherSource.DEBUG_ID
 
@@ -1804,7 +1866,7 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
             span.set_data("url", url)
             result = self.fetcher.fetch_by_url_new(url)
             if result is not None:
-                sourceview = SourceView.from_bytes(result.body)
+                sourceview = self._parse_sourceview(("url", url), result.body)
                 self.fetch_by_url_new_sourceviews[url] = sourceview
 
                 sourcemap_url = discover_sourcemap(result)
@@ -1827,7 +1889,7 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
             # a valid file to cache
             return None, FetcherSource.NONE
         else:
-            sourceview = SourceView.from_bytes(result.body)
+            sourceview = self._parse_sourceview(("url", url), result.body)
             self.fetch_by_url_sourceviews[url] = sourceview
 
             sourcemap_url = discover_sourcemap(result)
@@ -1912,8 +1974,10 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
                     # We want to keep track of the sourcemap url of the sourcemap resolved with this specific debug id.
                     self.sourcemap_debug_id_to_sourcemap_url[debug_id] = result.url
                     # This is an expensive operation that should be executed as few times as possible.
-                    return SmCache.from_bytes(
-                        minified_sourceview.get_source().encode("utf-8"), result.body
+                    return self._parse_sourcemap_cache(
+                        ("debug_id", debug_id),
+                        minified_sourceview.get_source().encode("utf-8"),
+                        result.body,
                     )
             except Exception as exc:
                 # This is in debug because the product shows an error already.
@@ -2003,12 +2067,55 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
                 op="JavaScriptStacktraceProcessor.fetch_sourcemap_view_by_url.SmCache.from_bytes"
             ):
                 # This is an expensive operation that should be executed as few times as possible.
-                return SmCache.from_bytes(source, body)
+                return self._parse_sourcemap_cache(("url", url), source, body)
         except Exception as exc:
             # This is in debug because the product shows an error already.
             logger.debug(str(exc), exc_info=True)
             raise UnparseableSourcemap({"url": http.expose_url(url)})
 
+    def _get_shared_cache_key(self, kind, ident, *contents):
+        """
+        Builds the key of an entry in the process-wide cache of parsed files.
+
+        The checksum of the contents is part of the key, thus a change to the underlying release file results in a
+        cache miss.
+        """
+        checksum = hashlib.sha1()
+        for content in contents:
+            checksum.update(content)
+
+        release = self.fetcher.release
+        dist = self.fetcher.dist
+        return (
+            kind,
+            release.id if release else None,
+            dist.name if dist else None,
+            ident,
+            checksum.hexdigest(),
+        )
+
+    def _parse_sourceview(self, ident, body):
+        if not shared_processing_cache.enabled:
+            return SourceView.from_bytes(body)
+
+        return shared_processing_cache.get_or_create(
+            self._get_shared_cache_key("sourceview", ident, body),
+            "sourceview",
+            lambda: SourceView.from_bytes(body),
+            len(body),
+        )
+
+    def _parse_sourcemap_cache(self, ident, source, sourcemap):
+        if not shared_processing_cache.enabled:
+            return SmCache.from_bytes(source, sourcemap)
+
+        return shared_processing_cache.get_or_create(
+            self._get_shared_cache_key("smcache", ident, source, sourcemap),
+            "smcache",
+            lambda: SmCache.from_bytes(source, sourcemap),
+            len(source) + len(sourcemap),
+        )
+
     def populate_source_cache(self, frames):
         """
         Fetch all sources that we know are required (being referenced directly
@@ -1,4 +1,5 @@
 import logging
+import threading
 import time
 import uuid
 from urllib.parse import urljoin
@@ -169,6 +170,10 @@ class SymbolicatorSession:
     # to keep it static for celery worker process keep it as class attribute
     _worker_id = None
 
+    # HTTP sessions shared by all the symbolicator sessions of a worker thread, so that connections to
+    # symbolicator are kept alive across events.
+    _pooled_sessions = threading.local()
+
     def __init__(
         self, url=None, sources=None, project_id=None, event_id=None, timeout=None, options=None
     ):
@@ -179,6 +184,7 @@ class SymbolicatorSession:
         self.options = options or None
         self.timeout = timeout
         self.session = None
+        self._pooled = False
 
     def __enter__(self):
         self.open()
@@ -189,12 +195,27 @@ class SymbolicatorSession:
 
     def open(self):
         if self.session is None:
-            self.session = Session()
+            if options.get("symbolicator.pooled-sessions"):
+                self.session = self.get_pooled_session()
+                self._pooled = True
+            else:
+                self.session = Session()
 
     def close(self):
         if self.session is not None:
-            self.session.close()
+            # Pooled sessions stay open for the next event processed by this worker.
+            if not self._pooled:
+                self.session.close()
             self.session = None
+            self._pooled = False
+
+    @classmethod
+    def get_pooled_session(cls):
+        session = getattr(cls._pooled_sessions, "session", None)
+        if session is None:
+            session = cls._pooled_sessions.session = Session()
+            metrics.incr("events.symbolicator.session.pooled_created")
+        return session
 
     def _ensure_open(self):
         if not self.session:
@@ -619,18 +619,18 @@ class DIFCache:
         debug_ids = [str(debug_id).lower() for debug_id in debug_ids]
         difs = ProjectDebugFile.objects.find_by_debug_ids(project, debug_ids, features)
 
-        rv = {}
-        for debug_id, dif in difs.items():
-            dif_path = os.path.join(self.get_project_path(project), debug_id)
-            try:
-                os.stat(dif_path)
-            except OSError as e:
-                if e.errno != errno.ENOENT:
-                    raise
-                dif.file.save_to(dif_path)
-            rv[debug_id] = dif_path
+        return {debug_id: self.fetch_dif(project, dif) for debug_id, dif in difs.items()}
 
-        return rv
+    def fetch_dif(self, project: "Project", dif: ProjectDebugFile) -> str:
+        """Returns the path where the given debug symbol file is on the FS."""
+        dif_path = os.path.join(self.get_project_path(project), dif.debug_id)
+        try:
+            os.stat(dif_path)
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+            dif.file.save_to(dif_path)
+        return dif_path
 
     def clear_old_entries(self) -> None:
         clear_cached_files(self.cache_path)
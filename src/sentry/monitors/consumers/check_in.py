@@ -1,16 +1,22 @@
+import copy
+import dataclasses
 import datetime
 import logging
-from typing import Dict, Mapping, Optional
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union, cast
 
 import msgpack
 from arroyo.backends.kafka.consumer import KafkaPayload
 from arroyo.processing.strategies.abstract import ProcessingStrategy, ProcessingStrategyFactory
+from arroyo.processing.strategies.batching import BatchStep, ValuesBatch
 from arroyo.processing.strategies.commit import CommitOffsets
 from arroyo.processing.strategies.run_task import RunTask
 from arroyo.types import Commit, Message, Partition
 from django.db import transaction
 
 from sentry.models import Project
+from sentry.monitors import schedule
 from sentry.monitors.models import (
     CheckInStatus,
     Monitor,
@@ -74,80 +80,214 @@ def _ensure_monitor_with_config(
     return monitor
 
 
-def _process_message(wrapper: Dict) -> None:
+@dataclasses.dataclass
+class CheckInMessage:
+    guid: uuid.UUID
+    status: int
+    duration: Optional[int]
+    environment: Optional[str]
+    monitor_config: Optional[Dict]
+    start_time: datetime.datetime
+
+
+def _parse_message(wrapper: Dict) -> Tuple[int, str, CheckInMessage]:
     # TODO: validate payload schema
     params = json.loads(wrapper["payload"])
-    start_time = to_datetime(float(wrapper["start_time"]))
-    project_id = int(wrapper["project_id"])
+    check_in = CheckInMessage(
+        guid=uuid.UUID(params["check_in_id"]),
+        status=getattr(CheckInStatus, params["status"].upper()),
+        duration=(
+            # Duration is specified in seconds from the client, it is
+            # stored in the checkin model as milliseconds
+            int(params["duration"] * 1000)
+            if params.get("duration") is not None
+            else None
+        ),
+        environment=params.get("environment"),
+        monitor_config=params.get("monitor_config"),
+        start_time=to_datetime(float(wrapper["start_time"])),
+    )
+    return int(wrapper["project_id"]), params["monitor_slug"], check_in
+
+
+def _process_message(wrapper: Dict) -> None:
+    _process_batch([wrapper])
+
+
+def _process_batch(wrappers: Sequence[Dict]) -> None:
+    """
+    Stores a batch of check-ins.
+
+    Check-ins are grouped by their monitor. The monitor and its environments are resolved once per
+    group, and all check-ins of a group are stored within a single transaction. A failure skips
+    the check-ins of the affected monitor only.
+    """
+    groups: Dict[Tuple[int, str], List[CheckInMessage]] = defaultdict(list)
+    for wrapper in wrappers:
+        try:
+            project_id, monitor_slug, check_in = _parse_message(wrapper)
+        except Exception:
+            logger.exception("Failed to process check-in", exc_info=True)
+            continue
+        groups[(project_id, monitor_slug)].append(check_in)
 
+    for (project_id, monitor_slug), check_ins in groups.items():
+        try:
+            _process_monitor_check_ins(project_id, monitor_slug, check_ins)
+        except Exception:
+            # Skip these check-ins and continue processing in the consumer.
+            logger.exception("Failed to process check-in", exc_info=True)
+
+
+def _process_monitor_check_ins(
+    project_id: int, monitor_slug: str, messages: Sequence[CheckInMessage]
+) -> None:
     project = Project.objects.get_from_cache(id=project_id)
 
-    try:
-        with transaction.atomic():
-            monitor_config = params.get("monitor_config")
-            monitor = _ensure_monitor_with_config(project, params["monitor_slug"], monitor_config)
+    with transaction.atomic():
+        # The most recent configuration of the batch wins.
+        monitor_config = next(
+            (message.monitor_config for message in reversed(messages) if message.monitor_config),
+            None,
+        )
+        monitor = _ensure_monitor_with_config(project, monitor_slug, monitor_config)
 
-            if not monitor:
-                logger.debug("monitor does not exist: %s", params["monitor_slug"])
-                return
+        if not monitor:
+            logger.debug("monitor does not exist: %s", monitor_slug)
+            return
 
-            monitor_environment = MonitorEnvironment.objects.ensure_environment(
-                project, monitor, params.get("environment")
+        # Lock all existing check-ins of the group at once.
+        existing_check_ins = {
+            check_in.guid: check_in
+            for check_in in MonitorCheckIn.objects.select_for_update().filter(
+                guid__in={message.guid for message in messages},
+                project_id=project_id,
+                monitor=monitor,
             )
+        }
 
-            status = getattr(CheckInStatus, params["status"].upper())
-            duration = (
-                # Duration is specified in seconds from the client, it is
-                # stored in the checkin model as milliseconds
-                int(params["duration"] * 1000)
-                if params.get("duration") is not None
-                else None
-            )
+        monitor_environments: Dict[Optional[str], MonitorEnvironment] = {}
+        created_check_ins: Dict[uuid.UUID, MonitorCheckIn] = {}
+        updated_check_ins: Dict[uuid.UUID, MonitorCheckIn] = {}
+        marks: List[Tuple[MonitorEnvironment, MonitorCheckIn, datetime.datetime]] = []
 
-            try:
-                check_in = MonitorCheckIn.objects.select_for_update().get(
-                    guid=params["check_in_id"],
-                    project_id=project_id,
-                    monitor=monitor,
+        for message in messages:
+            monitor_environment = monitor_environments.get(message.environment)
+            if monitor_environment is None:
+                monitor_environment = MonitorEnvironment.objects.ensure_environment(
+                    project, monitor, message.environment
                 )
+                monitor_environments[message.environment] = monitor_environment
 
+            duration = message.duration
+            check_in = existing_check_ins.get(message.guid) or created_check_ins.get(message.guid)
+            if check_in is not None:
                 if duration is None:
-                    duration = int((start_time - check_in.date_added).total_seconds() * 1000)
-
-                check_in.update(status=status, duration=duration)
+                    duration = int(
+                        (message.start_time - check_in.date_added).total_seconds() * 1000
+                    )
 
-            except MonitorCheckIn.DoesNotExist:
+                check_in.status = message.status
+                check_in.duration = duration
+                if message.guid in existing_check_ins:
+                    updated_check_ins[message.guid] = check_in
+            else:
                 # Infer the original start time of the check-in from the duration.
                 # Note that the clock of this worker may be off from what Relay is reporting.
-                date_added = start_time
+                date_added = message.start_time
                 if duration is not None:
                     date_added -= datetime.timedelta(milliseconds=duration)
 
-                check_in = MonitorCheckIn.objects.create(
+                check_in = MonitorCheckIn(
                     project_id=project_id,
                     monitor=monitor,
                     monitor_environment=monitor_environment,
-                    guid=params["check_in_id"],
+                    guid=message.guid,
                     duration=duration,
-                    status=status,
+                    status=message.status,
                     date_added=date_added,
-                    date_updated=start_time,
+                    date_updated=message.start_time,
                 )
+                created_check_ins[message.guid] = check_in
 
-                signal_first_checkin(project, monitor)
+            # Later messages may update the same check-in, remember its current state.
+            marks.append((monitor_environment, copy.copy(check_in), message.start_time))
 
-            if check_in.status == CheckInStatus.ERROR and monitor.status != MonitorStatus.DISABLED:
-                monitor.mark_failed(start_time)
-                monitor_environment.mark_failed(start_time)
-            else:
-                monitor.mark_ok(check_in, start_time)
-                monitor_environment.mark_ok(check_in, start_time)
-    except Exception:
-        # Skip this message and continue processing in the consumer.
-        logger.exception("Failed to process check-in", exc_info=True)
+        if created_check_ins:
+            MonitorCheckIn.objects.bulk_create(created_check_ins.values())
+            signal_first_checkin(project, monitor)
+            # `bulk_create` bypasses `MonitorCheckIn.save`, which schedules the timeout.
+            for check_in in created_check_ins.values():
+                if check_in.status == CheckInStatus.IN_PROGRESS:
+                    schedule.schedule_timeout(check_in.id, check_in.get_timeout_at())
+        if updated_check_ins:
+            MonitorCheckIn.objects.bulk_update(updated_check_ins.values(), ["status", "duration"])
+
+        _mark_monitor(monitor, [(check_in, ts) for _, check_in, ts in marks])
+        for monitor_environment in monitor_environments.values():
+            _mark_monitor(
+                monitor_environment,
+                [(check_in, ts) for env, check_in, ts in marks if env is monitor_environment],
+                monitor=monitor,
+            )
+
+
+def _mark_monitor(
+    target: Union[Monitor, MonitorEnvironment],
+    marks: Sequence[Tuple[MonitorCheckIn, datetime.datetime]],
+    monitor: Optional[Monitor] = None,
+) -> None:
+    """
+    Applies the check-ins of a group to the status of a monitor or monitor environment.
+
+    Consecutive check-ins that do not fail the monitor are collapsed into at most two updates,
+    which results in the same state as applying them one by one: ``mark_ok`` skips check-ins
+    older than the last one, so only check-ins which are at least as new as every check-in before
+    them can have an effect. Of these, the last ok check-in sets the status and the last one sets
+    the time of the last check-in.
+    """
+    monitor = monitor or cast(Monitor, target)
+    pending: List[Tuple[MonitorCheckIn, datetime.datetime]] = []
+
+    def flush() -> None:
+        if not pending:
+            return
+
+        latest: List[Tuple[MonitorCheckIn, datetime.datetime]] = []
+        for check_in, ts in pending:
+            if not latest or ts >= latest[-1][1]:
+                latest.append((check_in, ts))
+        pending.clear()
+
+        ok_marks = [mark for mark in latest if mark[0].status == CheckInStatus.OK]
+        if ok_marks and ok_marks[-1] is not latest[-1]:
+            target.mark_ok(*ok_marks[-1])
+        target.mark_ok(*latest[-1])
+
+    for check_in, ts in marks:
+        if check_in.status == CheckInStatus.ERROR and monitor.status != MonitorStatus.DISABLED:
+            flush()
+            target.mark_failed(ts)
+        else:
+            pending.append((check_in, ts))
+    flush()
 
 
 class StoreMonitorCheckInStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
+    """
+    Stores monitor check-ins.
+
+    If "max_batch_size" is set, messages are batched and check-ins of the same monitor are stored
+    together, see "_process_batch". Otherwise every message is processed on its own.
+    """
+
+    def __init__(
+        self, max_batch_size: Optional[int] = None, max_batch_time: Optional[int] = None
+    ) -> None:
+        self.max_batch_size = max_batch_size
+        # The batch time is configured in milliseconds.
+        self.max_batch_time = (max_batch_time or 1000) / 1000
+
     def create_with_partitions(
         self,
         commit: Commit,
@@ -160,7 +300,26 @@ class StoreMonitorCheckInStrategyFactory(ProcessingStrategyFactory[KafkaPayload]
             except Exception:
                 logger.exception("Failed to process message payload")
 
-        return RunTask(
-            function=process_message,
-            next_step=CommitOffsets(commit),
+        def process_batch(message: Message[ValuesBatch[KafkaPayload]]) -> None:
+            wrappers = []
+            for value in message.payload:
+                try:
+                    wrappers.append(msgpack.unpackb(value.payload.value))
+                except Exception:
+                    logger.exception("Failed to process message payload")
+            _process_batch(wrappers)
+
+        if not self.max_batch_size:
+            return RunTask(
+                function=process_message,
+                next_step=CommitOffsets(commit),
+            )
+
+        return BatchStep(
+            max_batch_size=self.max_batch_size,
+            max_batch_time=self.max_batch_time,
+            next_step=RunTask(
+                function=process_batch,
+                next_step=CommitOffsets(commit),
+            ),
         )
@@ -7,6 +7,7 @@ from croniter import croniter
 from dateutil import rrule
 from django.db import models
 from django.db.models import Q
+from django.db.models.signals import post_save
 from django.utils import timezone
 
 from sentry.constants import ObjectStatus
@@ -24,6 +25,7 @@ from sentry.db.models import (
 from sentry.db.models.utils import slugify_instance
 from sentry.locks import locks
 from sentry.models import Environment, Project
+from sentry.monitors import schedule
 from sentry.utils.retries import TimedRetryPolicy
 
 SCHEDULE_INTERVAL_MAP = {
@@ -36,6 +38,10 @@ SCHEDULE_INTERVAL_MAP = {
 }
 
 
+# default maximum runtime for a monitor, in minutes
+TIMEOUT = 12 * 60
+
+
 def get_next_schedule(last_checkin, schedule_type, schedule):
     if schedule_type == ScheduleType.CRONTAB:
         itr = croniter(schedule, last_checkin)
@@ -230,13 +236,14 @@ class Monitor(Model):
         if reason == MonitorFailure.MISSED_CHECKIN:
             new_status = MonitorStatus.MISSED_CHECKIN
 
+        next_checkin = self.get_next_scheduled_checkin(next_checkin_base)
         affected = (
             type(self)
             .objects.filter(
                 Q(last_checkin__lte=last_checkin) | Q(last_checkin__isnull=True), id=self.id
             )
             .update(
-                next_checkin=self.get_next_scheduled_checkin(next_checkin_base),
+                next_checkin=next_checkin,
                 status=new_status,
                 last_checkin=last_checkin,
             )
@@ -244,6 +251,8 @@ class Monitor(Model):
         if not affected:
             return False
 
+        schedule.schedule_next_checkin(self.id, next_checkin)
+
         event_manager = EventManager(
             {
                 "logentry": {"message": f"Monitor failure: {self.name} ({reason})"},
@@ -267,7 +276,24 @@ class Monitor(Model):
         if checkin.status == CheckInStatus.OK and self.status != MonitorStatus.DISABLED:
             params["status"] = MonitorStatus.OK
 
-        Monitor.objects.filter(id=self.id).exclude(last_checkin__gt=ts).update(**params)
+        affected = Monitor.objects.filter(id=self.id).exclude(last_checkin__gt=ts).update(**params)
+        if affected:
+            schedule.schedule_next_checkin(self.id, params["next_checkin"])
+
+
+def _schedule_monitor(instance: Monitor, **kwargs):
+    # Monitors which are not checked for missed check-ins are dropped from the schedule.
+    if instance.type == MonitorType.CRON_JOB and instance.status not in (
+        MonitorStatus.DISABLED,
+        MonitorStatus.PENDING_DELETION,
+        MonitorStatus.DELETION_IN_PROGRESS,
+    ):
+        schedule.schedule_next_checkin(instance.id, instance.next_checkin)
+    else:
+        schedule.schedule_next_checkin(instance.id, None)
+
+
+post_save.connect(_schedule_monitor, sender=Monitor, weak=False)
 
 
 @region_silo_only_model
@@ -304,7 +330,15 @@ class MonitorCheckIn(Model):
             self.date_added = timezone.now()
         if not self.date_updated:
             self.date_updated = self.date_added
-        return super().save(*args, **kwargs)
+        rv = super().save(*args, **kwargs)
+        if self.status == CheckInStatus.IN_PROGRESS:
+            schedule.schedule_timeout(self.id, self.get_timeout_at())
+        return rv
+
+    def get_timeout_at(self) -> datetime:
+        """Returns the time at which this check-in times out if it is still in progress."""
+        max_runtime = (self.monitor.config or {}).get("max_runtime") or TIMEOUT
+        return self.date_updated + timedelta(minutes=max_runtime)
 
     # XXX(dcramer): BaseModel is trying to automatically set date_updated which is not
     # what we want to happen, so kill it here
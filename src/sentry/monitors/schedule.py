@@ -0,0 +1,182 @@
+"""
+Index of upcoming monitor deadlines.
+
+``check_monitors`` has to find monitors which missed their next check-in and in-progress check-ins
+which exceeded their maximum runtime. Instead of scanning all monitors and check-ins every minute,
+their deadlines are additionally kept in two Redis sorted sets scored by timestamp:
+
+- ``NEXT_CHECKIN_KEY`` holds the ``next_checkin`` of every monitor. It is updated whenever a
+  monitor is saved or marked as ok or failed.
+- ``TIMEOUT_KEY`` holds the time at which every in-progress check-in times out.
+
+The task reads expired deadlines only, so its cost depends on the number of due monitors rather
+than the total number of monitors. Deadlines are verified against the database, an outdated
+deadline is rescheduled. Deadlines are removed once they were processed, so a failed run leaves
+them for the next one, see ``remove_processed``.
+
+The index is rebuilt from the database once it is enabled (again), and periodically afterwards.
+Rebuilding happens in a separate task, see ``is_initialized`` and ``rebuild``.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+from sentry import options
+from sentry.utils import metrics, redis
+from sentry.utils.dates import to_timestamp
+
+__all__ = [
+    "is_enabled",
+    "schedule_next_checkin",
+    "schedule_timeout",
+    "is_initialized",
+    "acquire_rebuild",
+    "rebuild",
+    "get_due_monitors",
+    "get_due_check_ins",
+    "remove_processed",
+]
+
+NEXT_CHECKIN_KEY = "monitors:schedule:next-checkin"
+TIMEOUT_KEY = "monitors:schedule:timeout"
+INITIALIZED_KEY = "monitors:schedule:initialized"
+REBUILDING_KEY = "monitors:schedule:rebuilding"
+
+#: Interval in which the index is rebuilt, which bounds the impact of deadlines that were missed
+#: while toggling the index or due to failed writes.
+REBUILD_INTERVAL = 60 * 60
+
+#: Maximum duration of a rebuild, after which another one can be started.
+REBUILD_TIMEOUT = 10 * 60
+
+#: Number of deadlines written to Redis at once while rebuilding.
+REBUILD_CHUNK_SIZE = 1000
+
+#: A deadline read from the index, consisting of the id of a monitor or check-in and its score.
+Deadline = Tuple[int, float]
+
+remove_processed_script = redis.load_script("monitors/remove_processed.lua")
+
+
+def get_redis_client():
+    return redis.redis_clusters.get(settings.SENTRY_MONITORS_SCHEDULE_REDIS_CLUSTER)
+
+
+def is_enabled() -> bool:
+    return options.get("monitors.schedule.deadline-index")
+
+
+def schedule_next_checkin(monitor_id: int, next_checkin: Optional[datetime]) -> None:
+    """Records the next expected check-in of a monitor. Monitors without one are removed."""
+    if not is_enabled():
+        return
+
+    client = get_redis_client()
+    if next_checkin is None:
+        client.zrem(NEXT_CHECKIN_KEY, monitor_id)
+    else:
+        client.zadd(NEXT_CHECKIN_KEY, {monitor_id: to_timestamp(next_checkin)})
+
+
+def schedule_timeout(check_in_id: int, timeout_at: datetime) -> None:
+    """Records the time at which an in-progress check-in times out."""
+    if not is_enabled():
+        return
+
+    get_redis_client().zadd(TIMEOUT_KEY, {check_in_id: to_timestamp(timeout_at)})
+
+
+def is_initialized() -> bool:
+    """
+    Returns whether the index covers every monitor and in-progress check-in and can be used.
+
+    While the index is disabled it is not updated, so it has to be rebuilt the next time it is
+    enabled, and every ``REBUILD_INTERVAL`` afterwards.
+    """
+    client = get_redis_client()
+    if not is_enabled():
+        client.delete(INITIALIZED_KEY)
+        return False
+
+    return bool(client.exists(INITIALIZED_KEY))
+
+
+def acquire_rebuild() -> bool:
+    """
+    Returns whether the caller should start rebuilding the index, which is the case for one caller
+    every ``REBUILD_TIMEOUT`` until ``rebuild`` finished.
+    """
+    if not is_enabled():
+        return False
+
+    return bool(get_redis_client().set(REBUILDING_KEY, 1, ex=REBUILD_TIMEOUT, nx=True))
+
+
+def rebuild() -> None:
+    """Adds the deadlines of every monitor and in-progress check-in to the index."""
+    from sentry.monitors.models import CheckInStatus, Monitor, MonitorCheckIn, MonitorType
+
+    client = get_redis_client()
+    with metrics.timer("sentry.monitors.schedule.rebuild"):
+        monitors = (
+            Monitor.objects.filter(type=MonitorType.CRON_JOB, next_checkin__isnull=False)
+            .values_list("id", "next_checkin")
+            .iterator()
+        )
+        _add_all(client, NEXT_CHECKIN_KEY, monitors)
+
+        check_ins = (
+            MonitorCheckIn.objects.filter(status=CheckInStatus.IN_PROGRESS)
+            .values_list("id", "date_updated")
+            .iterator()
+        )
+        # The timeout depends on the configuration of the monitor. Using the time of the last
+        # update makes sure these are verified on the next run.
+        _add_all(client, TIMEOUT_KEY, check_ins)
+
+    client.set(INITIALIZED_KEY, 1, ex=REBUILD_INTERVAL)
+    client.delete(REBUILDING_KEY)
+
+
+def _add_all(client, key: str, deadlines: Iterable[Tuple[int, datetime]]) -> None:
+    chunk = {}
+    for member, deadline in deadlines:
+        chunk[member] = to_timestamp(deadline)
+        if len(chunk) >= REBUILD_CHUNK_SIZE:
+            client.zadd(key, chunk)
+            chunk = {}
+    if chunk:
+        client.zadd(key, chunk)
+
+
+def _get_expired(key: str, current_datetime: datetime, limit: int) -> List[Deadline]:
+    deadlines: Sequence[Tuple[bytes, float]] = get_redis_client().zrangebyscore(
+        key, "-inf", f"({to_timestamp(current_datetime)}", start=0, num=limit, withscores=True
+    )
+    return [(int(member), score) for member, score in deadlines]
+
+
+def get_due_monitors(current_datetime: datetime, limit: int) -> List[Deadline]:
+    """Returns the monitors whose next check-in is before ``current_datetime``."""
+    return _get_expired(NEXT_CHECKIN_KEY, current_datetime, limit)
+
+
+def get_due_check_ins(current_datetime: datetime, limit: int) -> List[Deadline]:
+    """Returns the check-ins which time out before ``current_datetime``."""
+    return _get_expired(TIMEOUT_KEY, current_datetime, limit)
+
+
+def remove_processed(key: str, deadlines: Sequence[Deadline]) -> None:
+    """
+    Removes processed deadlines from the index. Deadlines that were rescheduled in the meantime
+    are kept, since their score changed.
+    """
+    if not deadlines:
+        return
+
+    args = [value for deadline in deadlines for value in deadline]
+    remove_processed_script(get_redis_client(), [key], args)
@@ -1,11 +1,11 @@
 import logging
-from datetime import timedelta
 
 from django.utils import timezone
 
 from sentry.tasks.base import instrumented_task
 from sentry.utils import metrics
 
+from . import schedule
 from .models import (
     CheckInStatus,
     Monitor,
@@ -17,9 +17,6 @@ from .models import (
 
 logger = logging.getLogger("sentry")
 
-# default maximum runtime for a monitor, in minutes
-TIMEOUT = 12 * 60
-
 # This is the MAXIMUM number of MONITOR this job will check.
 #
 # NOTE: We should keep an eye on this as we have more and more usage of
@@ -32,33 +29,34 @@ MONITOR_LIMIT = 10_000
 # monitors the larger the number of checkins to check will exist.
 CHECKINS_LIMIT = 10_000
 
+# Monitors with these statuses are never marked as missed.
+EXCLUDED_STATUSES = [
+    MonitorStatus.DISABLED,
+    MonitorStatus.PENDING_DELETION,
+    MonitorStatus.DELETION_IN_PROGRESS,
+]
+
 
 @instrumented_task(name="sentry.monitors.tasks.check_monitors", time_limit=15, soft_time_limit=10)
 def check_monitors(current_datetime=None):
     if current_datetime is None:
         current_datetime = timezone.now()
 
+    if schedule.is_initialized():
+        _check_scheduled(current_datetime)
+        return
+
+    # Rebuilding the schedule takes longer than this task may run. Monitors are checked by
+    # scanning the database until it is done.
+    if schedule.acquire_rebuild():
+        rebuild_schedule.delay()
+
     qs = Monitor.objects.filter(
         type__in=[MonitorType.CRON_JOB], next_checkin__lt=current_datetime
-    ).exclude(
-        status__in=[
-            MonitorStatus.DISABLED,
-            MonitorStatus.PENDING_DELETION,
-            MonitorStatus.DELETION_IN_PROGRESS,
-        ]
-    )[
-        :MONITOR_LIMIT
-    ]
+    ).exclude(status__in=EXCLUDED_STATUSES)[:MONITOR_LIMIT]
     metrics.gauge("sentry.monitors.tasks.check_monitors.missing_count", qs.count())
     for monitor in qs:
-        logger.info("monitor.missed-checkin", extra={"monitor_id": monitor.id})
-        # add missed checkin
-        checkin = MonitorCheckIn.objects.create(
-            project_id=monitor.project_id,
-            monitor=monitor,
-            status=CheckInStatus.MISSED,
-        )
-        monitor.mark_failed(reason=MonitorFailure.MISSED_CHECKIN)
+        _mark_missed(monitor)
 
     qs = MonitorCheckIn.objects.filter(status=CheckInStatus.IN_PROGRESS).select_related("monitor")[
         :CHECKINS_LIMIT
@@ -66,26 +64,97 @@ def check_monitors(current_datetime=None):
     metrics.gauge("sentry.monitors.tasks.check_monitors.timeout_count", qs.count())
     # check for any monitors which are still running and have exceeded their maximum runtime
     for checkin in qs:
-        timeout = timedelta(minutes=(checkin.monitor.config or {}).get("max_runtime") or TIMEOUT)
-        if checkin.date_updated > current_datetime - timeout:
+        if checkin.get_timeout_at() > current_datetime:
             continue
 
-        monitor = checkin.monitor
-        logger.info(
-            "monitor.checkin-timeout", extra={"monitor_id": monitor.id, "checkin_id": checkin.id}
-        )
-        affected = MonitorCheckIn.objects.filter(
-            id=checkin.id, status=CheckInStatus.IN_PROGRESS
-        ).update(status=CheckInStatus.ERROR)
-        if not affected:
-            continue
+        _mark_timeout(checkin)
+
+
+@instrumented_task(
+    name="sentry.monitors.tasks.rebuild_schedule",
+    time_limit=schedule.REBUILD_TIMEOUT + 5,
+    soft_time_limit=schedule.REBUILD_TIMEOUT,
+)
+def rebuild_schedule():
+    schedule.rebuild()
+
+
+def _check_scheduled(current_datetime):
+    """
+    Checks only the monitors and check-ins whose deadline expired according to the schedule.
+
+    Deadlines in the schedule may be outdated, so they are verified against the database and
+    rescheduled if they have not expired yet. Deadlines are removed once they were processed, so
+    the ones left over by a failed run are processed by the next one.
+    """
+    deadlines = schedule.get_due_monitors(current_datetime, MONITOR_LIMIT)
+    metrics.gauge("sentry.monitors.tasks.check_monitors.missing_count", len(deadlines))
+    monitors = Monitor.objects.filter(
+        id__in=[monitor_id for monitor_id, _ in deadlines], type__in=[MonitorType.CRON_JOB]
+    ).exclude(status__in=EXCLUDED_STATUSES)
+    monitors = {monitor.id: monitor for monitor in monitors}
+    processed = []
+    try:
+        for monitor_id, score in deadlines:
+            monitor = monitors.get(monitor_id)
+            if monitor is not None and monitor.next_checkin is not None:
+                if monitor.next_checkin >= current_datetime:
+                    schedule.schedule_next_checkin(monitor.id, monitor.next_checkin)
+                else:
+                    _mark_missed(monitor)
+            processed.append((monitor_id, score))
+    finally:
+        schedule.remove_processed(schedule.NEXT_CHECKIN_KEY, processed)
+
+    deadlines = schedule.get_due_check_ins(current_datetime, CHECKINS_LIMIT)
+    metrics.gauge("sentry.monitors.tasks.check_monitors.timeout_count", len(deadlines))
+    checkins = MonitorCheckIn.objects.filter(
+        id__in=[checkin_id for checkin_id, _ in deadlines], status=CheckInStatus.IN_PROGRESS
+    ).select_related("monitor")
+    checkins = {checkin.id: checkin for checkin in checkins}
+    processed = []
+    try:
+        for checkin_id, score in deadlines:
+            checkin = checkins.get(checkin_id)
+            if checkin is not None:
+                timeout_at = checkin.get_timeout_at()
+                if timeout_at > current_datetime:
+                    schedule.schedule_timeout(checkin.id, timeout_at)
+                else:
+                    _mark_timeout(checkin)
+            processed.append((checkin_id, score))
+    finally:
+        schedule.remove_processed(schedule.TIMEOUT_KEY, processed)
+
+
+def _mark_missed(monitor):
+    logger.info("monitor.missed-checkin", extra={"monitor_id": monitor.id})
+    # add missed checkin
+    MonitorCheckIn.objects.create(
+        project_id=monitor.project_id,
+        monitor=monitor,
+        status=CheckInStatus.MISSED,
+    )
+    monitor.mark_failed(reason=MonitorFailure.MISSED_CHECKIN)
+
+
+def _mark_timeout(checkin):
+    monitor = checkin.monitor
+    logger.info(
+        "monitor.checkin-timeout", extra={"monitor_id": monitor.id, "checkin_id": checkin.id}
+    )
+    affected = MonitorCheckIn.objects.filter(
+        id=checkin.id, status=CheckInStatus.IN_PROGRESS
+    ).update(status=CheckInStatus.ERROR)
+    if not affected:
+        return
 
-        # we only mark the monitor as failed if a newer checkin wasn't responsible for the state
-        # change
-        has_newer_result = MonitorCheckIn.objects.filter(
-            monitor=monitor.id,
-            date_added__gt=checkin.date_added,
-            status__in=[CheckInStatus.OK, CheckInStatus.ERROR],
-        ).exists()
-        if not has_newer_result:
-            monitor.mark_failed(reason=MonitorFailure.DURATION)
+    # we only mark the monitor as failed if a newer checkin wasn't responsible for the state
+    # change
+    has_newer_result = MonitorCheckIn.objects.filter(
+        monitor=monitor.id,
+        date_added__gt=checkin.date_added,
+        status__in=[CheckInStatus.OK, CheckInStatus.ERROR],
+    ).exists()
+    if not has_newer_result:
+        monitor.mark_failed(reason=MonitorFailure.DURATION)
@@ -96,6 +96,46 @@ register(
     default=1024 * 1024 * 1024,
     flags=FLAG_PRIORITIZE_DISK,
 )
+register(
+    "sourcemaps.artifact-bundle-cache.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_PRIORITIZE_DISK,
+)
+register(
+    "sourcemaps.artifact-bundle-cache.path",
+    type=String,
+    default="/tmp/sentry-artifact-bundle-cache",
+    flags=FLAG_PRIORITIZE_DISK,
+)
+register(
+    "sourcemaps.artifact-bundle-cache.max-size",
+    type=Int,
+    default=2 * 1024 * 1024 * 1024,
+    flags=FLAG_PRIORITIZE_DISK,
+)
+# Maximum number of memoized stacktrace processor results per process, 0 disables it
+register(
+    "processing.frame-memoization-cache-size",
+    type=Int,
+    default=0,
+    flags=FLAG_PRIORITIZE_DISK,
+)
+# Maximum size in bytes of the per-process cache of parsed sources and sourcemaps, 0 disables it
+register(
+    "processing.javascript.shared-cache-max-size",
+    type=Int,
+    default=0,
+    flags=FLAG_PRIORITIZE_DISK,
+)
+# Maximum size in bytes of the per-process cache of opened ProGuard mappers used to deobfuscate
+# profiles, 0 disables it
+register(
+    "profiling.proguard.mapper-cache-max-size",
+    type=Int,
+    default=0,
+    flags=FLAG_PRIORITIZE_DISK,
+)
 
 
 # Mail
@@ -193,6 +233,11 @@ register(
 # it break everywhere.
 register("symbolicator.ignored_sources", type=Sequence, default=(), flags=FLAG_ALLOW_EMPTY)
 
+# Reuse one HTTP session to symbolicator per worker thread instead of opening a new one per event.
+register(
+    "symbolicator.pooled-sessions", default=False, flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK
+)
+
 # Backend chart rendering via chartcuterie
 register("chart-rendering.enabled", default=False, flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK)
 register(
@@ -237,6 +282,28 @@ register(
     default=0,
     flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK,
 )
+# The number of recording segments downloaded concurrently ahead of the segment being streamed
+# to the client.
+register(
+    "replay.reader.prefetch-segments",
+    type=Int,
+    default=4,
+    flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK,
+)
+# Extract dom-click-search actions while streaming the decompressed segment instead of
+# decompressing and parsing the whole segment up front.
+register(
+    "replay.ingest.dom-index.streaming",
+    type=Bool,
+    default=False,
+    flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK,
+)
+
+# Cron Monitors
+#
+# Find missed check-ins and timed out check-ins from an index of deadlines in Redis instead of
+# scanning all monitors, see ``sentry.monitors.schedule``.
+register("monitors.schedule.deadline-index", type=Bool, default=False, flags=FLAG_PRIORITIZE_DISK)
 
 # Analytics
 register("analytics.backend", default="noop", flags=FLAG_NOSTORE)
@@ -317,10 +384,36 @@ register("snuba.search.chunk-growth-rate", default=1.5)
 register("snuba.search.max-chunk-size", default=2000)
 register("snuba.search.max-total-chunk-time-seconds", default=30.0)
 register("snuba.search.hits-sample-size", default=100)
+# Pipeline Snuba fetches and Postgres post-filtering of issue search results
+register("snuba.search.streaming-post-filter", type=Bool, default=False)
+# TTL of cached hits estimates of issue searches, disabled if 0
+register("snuba.search.hits-estimate-cache-ttl", default=0)
 register("snuba.track-outcomes-sample-rate", default=0.0)
+# Run independent timeseries queries concurrently and return partial results when some time out
+register("snuba.partial-results.enabled", type=Bool, default=False, flags=FLAG_PRIORITIZE_DISK)
+register("snuba.partial-results.timeout", default=20.0, flags=FLAG_PRIORITIZE_DISK)
+register("snuba.partial-results.max-concurrency", default=4, flags=FLAG_PRIORITIZE_DISK)
+# Decode Snuba responses with rapidjson instead of simplejson
+register("snuba.results.use-rapidjson", type=Bool, default=False, flags=FLAG_PRIORITIZE_DISK)
 
 # The percentage of tagkeys that we want to cache. Set to 1.0 in order to cache everything, <=0.0 to stop caching
 register("snuba.tagstore.cache-tagkeys-rate", default=0.0, flags=FLAG_PRIORITIZE_DISK)
+# Record the tags of error events in materialized summaries during post-processing
+register("tagstore.summaries.write-enabled", type=Bool, default=False, flags=FLAG_PRIORITIZE_DISK)
+# Answer tagstore queries from materialized summaries where possible instead of Snuba
+register("tagstore.summaries.read-enabled", type=Bool, default=False, flags=FLAG_PRIORITIZE_DISK)
+# Number of most frequent values per tag key retained in each summary bucket
+register("tagstore.summaries.top-values", default=100, flags=FLAG_PRIORITIZE_DISK)
+
+# Deletions
+# Number of child relations without children of their own which are deleted concurrently
+register("deletions.relation-concurrency", default=1, flags=FLAG_PRIORITIZE_DISK)
+# Skip child relations which were fully deleted when a deletion is retried
+register("deletions.checkpoint-relations", type=Bool, default=False, flags=FLAG_PRIORITIZE_DISK)
+
+# Data Export
+# Number of pages of discover exports which are fetched from Snuba at once
+register("dataexport.discover.fragment-concurrency", default=1, flags=FLAG_PRIORITIZE_DISK)
 
 # Kafka Publisher
 register("kafka-publisher.raw-event-sample-rate", default=0.0)
@@ -446,6 +539,16 @@ register("store.symbolicate-event-lpq-never", type=Sequence, default=[])
 register("store.symbolicate-event-lpq-always", type=Sequence, default=[])
 register("post_process.get-autoassign-owners", type=Sequence, default=[])
 register("api.organization.disable-last-deploys", type=Sequence, default=[])
+# Sample rate of API requests for which the number of database queries is recorded per endpoint
+register("api.endpoint-query-count.sample-rate", default=0.0, flags=FLAG_PRIORITIZE_DISK)
+
+# TTL for remembering that a model cache lookup (`get_from_cache` and
+# `get_many_from_cache`) did not match any row. Disabled if 0.
+register("modelcache.negative-cache-ttl", default=0, flags=FLAG_PRIORITIZE_DISK)
+
+# TTL of the cache of grouphashes and their groups used to find the group of an event
+# without querying Postgres. Disabled if 0.
+register("store.grouphash-cache-ttl", default=0, flags=FLAG_PRIORITIZE_DISK)
 
 # Switch for more performant project counter incr
 register("store.projectcounter-modern-upsert-sample-rate", default=0.0)
@@ -687,4 +790,8 @@ register("dynamic-sampling.prioritise_transactions.load_rate", default=0.0)
 register("dynamic-sampling.prioritise_transactions.num_explicit_large_transactions", 30)
 # the number of large transactions to retrieve from Snuba for transaction re-balancing
 register("dynamic-sampling.prioritise_transactions.num_explicit_small_transactions", 0)
+# Skips invalidating project configs when rebalancing did not change the sample rates of a project
+register("dynamic-sampling.rebalancing.skip-unchanged-rates", default=False)
+# Maximum absolute difference between the new and the current sample rates which is considered unchanged
+register("dynamic-sampling.rebalancing.rate-tolerance", default=0.0)
 register("hybrid_cloud.outbox_rate", default=0.0)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from copy import deepcopy
 from datetime import datetime
 from time import sleep, time
@@ -10,7 +11,7 @@ from django.conf import settings
 from pytz import UTC
 from symbolic import ProguardMapper  # type: ignore
 
-from sentry import quotas
+from sentry import options, quotas
 from sentry.constants import DataCategory
 from sentry.lang.native.symbolicator import Symbolicator
 from sentry.models import Organization, Project, ProjectDebugFile
@@ -20,11 +21,19 @@ from sentry.signals import first_profile_received
 from sentry.tasks.base import instrumented_task
 from sentry.tasks.symbolication import RetrySymbolication
 from sentry.utils import metrics
+from sentry.utils.datastructures import LRUCache
 from sentry.utils.outcomes import Outcome, track_outcome
 
 Profile = MutableMapping[str, Any]
 CallTrees = Mapping[str, List[Any]]
 
+# Process-wide cache of opened ProGuard mappers, keyed by the project and the debug file id of the
+# mapping file. Profiles of the same app build share a mapping file, which is expensive to open.
+# The size of an entry is the size of the mapping file in bytes.
+proguard_mapper_cache = LRUCache(
+    max_size=lambda: options.get("profiling.proguard.mapper-cache-max-size")
+)
+
 
 class VroomTimeout(Exception):
     pass
@@ -325,60 +334,67 @@ def _process_symbolicator_results(
 
 
 def _process_symbolicator_results_for_sample(profile: Profile, stacktraces: List[Any]) -> None:
-    profile["profile"]["frames"] = stacktraces[0]["frames"]
-    if profile["platform"] in SHOULD_SYMBOLICATE:
-        for frame in profile["profile"]["frames"]:
-            frame.pop("pre_context", None)
-            frame.pop("context_line", None)
-            frame.pop("post_context", None)
+    frames = stacktraces[0]["frames"]
+    profile["profile"]["frames"] = frames
+    if profile["platform"] not in SHOULD_SYMBOLICATE:
+        return
 
-    if profile["platform"] == "rust":
+    for frame in frames:
+        frame.pop("pre_context", None)
+        frame.pop("context_line", None)
+        frame.pop("post_context", None)
 
-        def truncate_stack_needed(frames: List[dict[str, Any]], stack: List[Any]) -> List[Any]:
+    # Profiles can contain a large number of stacks, so everything that depends on frames only is
+    # computed once upfront, and stacks are remapped and truncated with index lookups.
+    if profile["platform"] == "rust":
+        profiler_frames = {
+            i
+            for i, frame in enumerate(frames)
+            if frame.get("function", "") == "perf_signal_handler"
+        }
+        unsymbolicated_frames = {
+            i for i, frame in enumerate(frames) if frame.get("function", "") == ""
+        }
+
+        def truncate_stack_needed(stack: List[int]) -> List[int]:
             # remove top frames related to the profiler (top of the stack)
-            if frames[stack[0]].get("function", "") == "perf_signal_handler":
+            if stack[0] in profiler_frames:
                 stack = stack[2:]
             # remove unsymbolicated frames before the runtime calls (bottom of the stack)
-            if frames[stack[len(stack) - 2]].get("function", "") == "":
+            if stack[len(stack) - 2] in unsymbolicated_frames:
                 stack = stack[:-2]
             return stack
 
     elif profile["platform"] == "cocoa":
+        # remove bottom frames we can't symbolicate
+        truncate_bottom = bool(frames) and frames[-1].get("instruction_addr", "") == "0xffffffffc"
 
-        def truncate_stack_needed(
-            frames: List[dict[str, Any]],
-            stack: List[Any],
-        ) -> List[Any]:
-            # remove bottom frames we can't symbolicate
-            if frames[-1].get("instruction_addr", "") == "0xffffffffc":
-                return stack[:-2]
-            return stack
+        def truncate_stack_needed(stack: List[int]) -> List[int]:
+            return stack[:-2] if truncate_bottom else stack
 
     else:
 
-        def truncate_stack_needed(
-            frames: List[dict[str, Any]],
-            stack: List[Any],
-        ) -> List[Any]:
+        def truncate_stack_needed(stack: List[int]) -> List[int]:
             return stack
 
-    if profile["platform"] in SHOULD_SYMBOLICATE:
-        idx_map = get_frame_index_map(profile["profile"]["frames"])
+    # the new stack extends the older by replacing a specific frame index
+    # with the indices of the frames originated from the original frame
+    # should inlines be present
+    idx_map = get_frame_index_map(frames)
+    if all(len(indices) == 1 for indices in idx_map.values()):
+        # Without inlines every frame index is replaced by exactly one index.
+        single_idx_map = {index: indices[0] for index, indices in idx_map.items()}
 
         def get_stack(stack: List[int]) -> List[int]:
-            new_stack: List[int] = []
-            for index in stack:
-                # the new stack extends the older by replacing
-                # a specific frame index with the indices of
-                # the frames originated from the original frame
-                # should inlines be present
-                new_stack.extend(idx_map[index])
-            return new_stack
+            return list(map(single_idx_map.__getitem__, stack))
 
     else:
 
         def get_stack(stack: List[int]) -> List[int]:
-            return stack
+            new_stack: List[int] = []
+            for index in stack:
+                new_stack.extend(idx_map[index])
+            return new_stack
 
     stacks = []
 
@@ -387,7 +403,7 @@ def _process_symbolicator_results_for_sample(profile: Profile, stacktraces: List
 
         if len(stack) >= 2:
             # truncate some unneeded frames in the stack (related to the profiler itself or impossible to symbolicate)
-            stack = truncate_stack_needed(profile["profile"]["frames"], stack)
+            stack = truncate_stack_needed(stack)
 
         stacks.append(stack)
 
@@ -456,10 +472,7 @@ The sorting order is callee to caller (child to parent)
 def get_frame_index_map(frames: List[dict[str, Any]]) -> dict[int, List[int]]:
     index_map: dict[int, List[int]] = {}
     for i, frame in enumerate(frames):
-        original_idx = frame["original_index"]
-        idx_list = index_map.get(original_idx, [])
-        idx_list.append(i)
-        index_map[original_idx] = idx_list
+        index_map.setdefault(frame["original_index"], []).append(i)
     return index_map
 
 
@@ -477,10 +490,9 @@ def _deobfuscate(profile: Profile, project: Project) -> None:
         if debug_file_path is None:
             return
 
-    with sentry_sdk.start_span(op="proguard.open"):
-        mapper = ProguardMapper.open(debug_file_path)
-        if not mapper.has_line_info:
-            return
+    mapper = _open_proguard_mapper(project, debug_file_id, debug_file_path)
+    if not mapper.has_line_info:
+        return
 
     with sentry_sdk.start_span(op="proguard.remap"):
         for method in profile["profile"]["methods"]:
@@ -516,6 +528,37 @@ def _deobfuscate(profile: Profile, project: Project) -> None:
                     method["class_name"] = mapped
 
 
+def _open_proguard_mapper(
+    project: Project, debug_file_id: str, debug_file_path: str
+) -> ProguardMapper:
+    """
+    Returns the mapper for a mapping file, which is reused across profiles while it is cached.
+
+    Debug file ids of mapping files can be chosen when uploading them, so the same id may refer to
+    different files in different projects. Cached mappers are therefore only shared within a project.
+    """
+    cache_key = (project.id, debug_file_id)
+    cache_enabled = bool(proguard_mapper_cache.max_size)
+    if cache_enabled:
+        mapper = proguard_mapper_cache.get(cache_key)
+        metrics.incr("process_profile.proguard.mapper_cache", tags={"hit": mapper is not None})
+        if mapper is not None:
+            return mapper
+
+    with sentry_sdk.start_span(op="proguard.open"):
+        mapper = ProguardMapper.open(debug_file_path)
+
+    if cache_enabled:
+        evicted = proguard_mapper_cache.set(
+            cache_key, mapper, size=os.path.getsize(debug_file_path)
+        )
+        if evicted:
+            metrics.incr("process_profile.proguard.mapper_cache.evicted", amount=evicted)
+        metrics.gauge("process_profile.proguard.mapper_cache.size", proguard_mapper_cache.size)
+
+    return mapper
+
+
 @metrics.wraps("process_profile.track_outcome")
 def _track_outcome(
     profile: Profile,
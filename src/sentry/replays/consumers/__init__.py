@@ -20,6 +20,8 @@ def get_replays_recordings_consumer(
     auto_offset_reset: str,
     force_topic: str | None,
     force_cluster: str | None,
+    concurrency: int,
+    max_pending_futures: int,
 ) -> StreamProcessor[KafkaPayload]:
     topic = force_topic or topic
     configure_metrics(MetricsWrapper(metrics.backend, name="ingest_replays"))
@@ -28,7 +30,10 @@ def get_replays_recordings_consumer(
     return StreamProcessor(
         consumer=consumer,
         topic=Topic(topic),
-        processor_factory=ProcessReplayRecordingStrategyFactory(),
+        processor_factory=ProcessReplayRecordingStrategyFactory(
+            concurrency=concurrency,
+            max_pending_futures=max_pending_futures,
+        ),
         commit_policy=ONCE_PER_SECOND,
     )
 
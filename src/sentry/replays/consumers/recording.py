@@ -1,26 +1,36 @@
 import dataclasses
 import logging
 import random
-from typing import Any, Dict, Mapping, cast
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Mapping, Optional, Tuple, Union, cast
 
 import msgpack
 import sentry_sdk
 from arroyo.backends.kafka.consumer import KafkaPayload
-from arroyo.processing.strategies import RunTaskInThreads, TransformStep
+from arroyo.processing.strategies import (
+    MessageRejected,
+    ProcessingStrategy,
+    RunTaskInThreads,
+    TransformStep,
+)
 from arroyo.processing.strategies.abstract import ProcessingStrategyFactory
 from arroyo.processing.strategies.commit import CommitOffsets
 from arroyo.processing.strategies.filter import FilterStep
-from arroyo.types import Commit, Message, Partition
+from arroyo.types import Commit, FilteredPayload, Message, Partition
 from django.conf import settings
 from sentry_sdk.tracing import Span
 
 from sentry.replays.usecases.ingest import (
     RecordingMessage,
+    RecordingPostProcessMessage,
     RecordingSegmentChunkMessage,
     RecordingSegmentMessage,
     ingest_chunk,
     ingest_recording_chunked,
     ingest_recording_not_chunked,
+    post_process_recording,
 )
 
 logger = logging.getLogger(__name__)
@@ -38,24 +48,137 @@ class MessageContext:
         return f"MessageContext(message_dict=..., transaction={repr(self.transaction)})"
 
 
+class RunTaskPerReplay(ProcessingStrategy[Union[FilteredPayload, MessageContext]]):
+    """
+    Runs a task for each message in threads while keeping the messages of a replay in order.
+
+    Every replay is assigned to one of "concurrency" single-threaded executors.  Segments of the
+    same replay are therefore processed one after another while different replays are processed
+    in parallel.  Results are submitted to the next step in the order the messages were received
+    so that offsets are committed in order.
+
+    If there are too many pending futures, MessageRejected is raised to slow down the stream
+    processor.
+    """
+
+    def __init__(
+        self,
+        processing_function: Callable[[Message[MessageContext]], Any],
+        concurrency: int,
+        max_pending_futures: int,
+        next_step: ProcessingStrategy[Any],
+    ) -> None:
+        self.__executors = [ThreadPoolExecutor(max_workers=1) for _ in range(concurrency)]
+        self.__function = processing_function
+        self.__queue: Deque[Tuple[Message[Any], Optional[Future[Any]]]] = deque()
+        self.__max_pending_futures = max_pending_futures
+        self.__next_step = next_step
+        self.__closed = False
+
+    def submit(self, message: Message[Union[FilteredPayload, MessageContext]]) -> None:
+        assert not self.__closed
+        if len(self.__queue) >= self.__max_pending_futures:
+            raise MessageRejected
+
+        future: Optional[Future[Any]]
+        if isinstance(message.payload, FilteredPayload):
+            future = None
+        else:
+            replay_id = message.payload.message["replay_id"]
+            executor = self.__executors[hash(replay_id) % len(self.__executors)]
+            future = executor.submit(self.__function, cast(Message[MessageContext], message))
+
+        self.__queue.append((message, future))
+
+    def __forward(self, timeout: Optional[float]) -> bool:
+        message, future = self.__queue[0]
+        if future is None:
+            next_message = message
+        elif timeout == 0 and not future.done():
+            return False
+        else:
+            # Will raise if the future errored.
+            next_message = message.replace(future.result(timeout))
+
+        self.__next_step.poll()
+        try:
+            self.__next_step.submit(next_message)
+        except MessageRejected:
+            # The message stays at the head of the queue and is submitted again later.
+            return False
+
+        self.__queue.popleft()
+        return True
+
+    def poll(self) -> None:
+        while self.__queue and self.__forward(timeout=0):
+            pass
+
+        self.__next_step.poll()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        deadline = time.time() + timeout if timeout is not None else None
+
+        while self.__queue:
+            remaining = deadline - time.time() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                logger.warning("Timed out with %s futures in queue", len(self.__queue))
+                break
+
+            if not self.__forward(timeout=remaining):
+                time.sleep(0.01)
+
+        for executor in self.__executors:
+            executor.shutdown()
+
+        remaining = max(deadline - time.time(), 0) if deadline is not None else None
+        self.__next_step.join(remaining)
+
+    def close(self) -> None:
+        self.__closed = True
+        self.__next_step.close()
+
+    def terminate(self) -> None:
+        self.__closed = True
+        for executor in self.__executors:
+            executor.shutdown(wait=False)
+        self.__next_step.terminate()
+
+
 class ProcessReplayRecordingStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
     """
     This consumer processes replay recordings, which are compressed payloads split up into
     chunks.
+
+    Chunks are written to the cache as they are received.  Capstone messages move the collated
+    segment to permanent storage in threads, ordered per replay.  The post-processing of stored
+    segments (e.g. emitting DOM actions) runs in a separate pool of threads so it does not hold up
+    the uploads.
     """
 
+    def __init__(self, concurrency: int = 4, max_pending_futures: int = 50) -> None:
+        self.concurrency = concurrency
+        self.max_pending_futures = max_pending_futures
+
     def create_with_partitions(
         self,
         commit: Commit,
         partitions: Mapping[Partition, int],
     ) -> Any:
-        step = RunTaskInThreads(
-            processing_function=move_replay_to_permanent_storage,
-            concurrency=4,
-            max_pending_futures=50,
+        post_process_step = RunTaskInThreads(
+            processing_function=post_process_replay,
+            concurrency=self.concurrency,
+            max_pending_futures=self.max_pending_futures,
             next_step=CommitOffsets(commit),
         )
 
+        step = RunTaskPerReplay(
+            processing_function=move_replay_to_permanent_storage,
+            concurrency=self.concurrency,
+            max_pending_futures=self.max_pending_futures,
+            next_step=post_process_step,
+        )
+
         step2: FilterStep[MessageContext] = FilterStep(
             function=is_capstone_message,
             next_step=step,
@@ -91,19 +214,33 @@ def is_capstone_message(message: Message[MessageContext]) -> Any:
     return message_type == "replay_recording_not_chunked" or message_type == "replay_recording"
 
 
-def move_replay_to_permanent_storage(message: Message[MessageContext]) -> Any:
+def move_replay_to_permanent_storage(
+    message: Message[MessageContext],
+) -> Optional[RecordingPostProcessMessage]:
     """Move the replay payload to permanent storage."""
     context: MessageContext = message.payload
     message_dict = context.message
     message_type = message_dict["type"]
 
     if message_type == "replay_recording_not_chunked":
-        ingest_recording_not_chunked(
-            cast(RecordingMessage, message_dict), context.transaction, context.current_hub
+        return ingest_recording_not_chunked(
+            cast(RecordingMessage, message_dict),
+            context.transaction,
+            context.current_hub,
+            post_process=False,
         )
     elif message_type == "replay_recording":
-        ingest_recording_chunked(
-            cast(RecordingSegmentMessage, message_dict), context.transaction, context.current_hub
+        return ingest_recording_chunked(
+            cast(RecordingSegmentMessage, message_dict),
+            context.transaction,
+            context.current_hub,
+            post_process=False,
         )
     else:
         raise ValueError(f"Invalid replays recording message type specified: {message_type}")
+
+
+def post_process_replay(message: Message[Optional[RecordingPostProcessMessage]]) -> None:
+    """Post-process a replay segment which was moved to permanent storage."""
+    if message.payload is not None:
+        post_process_recording(message.payload)
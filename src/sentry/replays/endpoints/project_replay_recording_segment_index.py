@@ -1,6 +1,7 @@
 import functools
 
 from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ParseError
 from rest_framework.request import Request
 from rest_framework.response import Response
 
@@ -8,6 +9,7 @@ from sentry import features
 from sentry.api.base import region_silo_endpoint
 from sentry.api.bases.project import ProjectEndpoint
 from sentry.api.paginator import GenericOffsetPaginator
+from sentry.api.utils import InvalidParams, get_date_range_from_params
 from sentry.replays.usecases.reader import download_segments, fetch_segments_metadata
 
 
@@ -19,11 +21,19 @@ class ProjectReplayRecordingSegmentIndexEndpoint(ProjectEndpoint):
         ):
             return self.respond(status=404)
 
+        # Playback of long replays can start from the segments received within a time range.
+        try:
+            start, end = get_date_range_from_params(request.GET.dict(), optional=True)
+        except InvalidParams as e:
+            raise ParseError(detail=str(e))
+
         return self.paginate(
             request=request,
             response_cls=StreamingHttpResponse,
             response_kwargs={"content_type": "application/json"},
             paginator_cls=GenericOffsetPaginator,
-            data_fn=functools.partial(fetch_segments_metadata, project.id, replay_id),
+            data_fn=functools.partial(
+                fetch_segments_metadata, project.id, replay_id, start=start, end=end
+            ),
             on_results=download_segments,
         )
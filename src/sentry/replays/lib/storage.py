@@ -6,10 +6,11 @@ proper steps are taken to migrate your data.
 """
 import dataclasses
 import logging
+import threading
 from abc import ABC, abstractmethod
 from datetime import datetime
 from io import BytesIO
-from typing import List, Optional, Union
+from typing import Any, List, Optional, Union
 
 from django.conf import settings
 from django.db.utils import IntegrityError
@@ -112,16 +113,25 @@ class StorageBlob(Blob):
 
     This driver does not have managed TTLs.  To enable TTLs you will need to enable it on your
     bucket.  Keys are prefixed by their TTL.  Those TTLs are 30, 60, 90.  Measured in days.
+
+    The storage client is shared between calls (and threads) and only recreated when the storage
+    options change.  Creating a client authenticates against the provider which is expensive
+    relative to uploading a single segment.
     """
 
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._storage = None
+        self._storage_options: Optional[dict] = None
+
     def delete(self, segment: RecordingSegmentStorageMeta) -> None:
-        storage = get_storage(self._make_storage_options())
+        storage = self._get_storage()
         storage.delete(self.make_key(segment))
 
     @metrics.wraps("replays.lib.storage.StorageBlob.get")
     def get(self, segment: RecordingSegmentStorageMeta) -> Optional[bytes]:
         try:
-            storage = get_storage(self._make_storage_options())
+            storage = self._get_storage()
             blob = storage.open(self.make_key(segment))
             result = blob.read()
             blob.close()
@@ -133,7 +143,7 @@ class StorageBlob(Blob):
 
     @metrics.wraps("replays.lib.storage.StorageBlob.set")
     def set(self, segment: RecordingSegmentStorageMeta, value: bytes) -> None:
-        storage = get_storage(self._make_storage_options())
+        storage = self._get_storage()
         try:
             storage.save(self.make_key(segment), BytesIO(value))
         except TooManyRequests:
@@ -144,6 +154,18 @@ class StorageBlob(Blob):
     def make_key(self, segment: RecordingSegmentStorageMeta) -> str:
         return make_filename(segment)
 
+    def _get_storage(self) -> Any:
+        # Without replay specific options, ``get_storage`` falls back to the filestore options.
+        storage_options = self._make_storage_options() or {
+            "backend": options.get("filestore.backend"),
+            "options": options.get("filestore.options"),
+        }
+        with self._lock:
+            if self._storage is None or storage_options != self._storage_options:
+                self._storage = get_storage(storage_options)
+                self._storage_options = storage_options
+            return self._storage
+
     def _make_storage_options(self) -> Optional[dict]:
         backend = options.get("replay.storage.backend")
         if backend:
@@ -4,7 +4,7 @@ import dataclasses
 import logging
 import zlib
 from datetime import datetime, timezone
-from typing import TypedDict, Union
+from typing import Iterator, Optional, TypedDict, Union
 
 from django.conf import settings
 from sentry_sdk import Hub
@@ -16,7 +16,10 @@ from sentry.models.project import Project
 from sentry.replays.cache import RecordingSegmentCache, RecordingSegmentParts
 from sentry.replays.feature import has_feature_access
 from sentry.replays.lib.storage import RecordingSegmentStorageMeta, make_storage_driver
-from sentry.replays.usecases.ingest.dom_index import parse_and_emit_replay_actions
+from sentry.replays.usecases.ingest.dom_index import (
+    iter_segment_events,
+    parse_and_emit_replay_actions,
+)
 from sentry.signals import first_replay_received
 from sentry.utils import json, metrics
 from sentry.utils.outcomes import Outcome, track_outcome
@@ -25,6 +28,7 @@ logger = logging.getLogger("sentry.replays")
 
 CACHE_TIMEOUT = 3600
 COMMIT_FREQUENCY_SEC = 1
+DECOMPRESS_CHUNK_SIZE = 64 * 1024
 
 
 class ReplayRecordingSegment(TypedDict):
@@ -79,10 +83,23 @@ class RecordingIngestMessage:
     payload_with_headers: bytes
 
 
+@dataclasses.dataclass
+class RecordingPostProcessMessage:
+    """A stored recording segment whose post-processing was deferred to the caller."""
+
+    message: RecordingIngestMessage
+    headers: RecordingSegmentHeaders
+    segment_bytes: bytes
+    transaction: Span
+
+
 @metrics.wraps("replays.usecases.ingest.ingest_recording_chunked")
 def ingest_recording_chunked(
-    message_dict: RecordingSegmentMessage, transaction: Span, current_hub: Hub
-) -> None:
+    message_dict: RecordingSegmentMessage,
+    transaction: Span,
+    current_hub: Hub,
+    post_process: bool = True,
+) -> Optional[RecordingPostProcessMessage]:
     """Ingest chunked recording messages."""
     with current_hub:
         with transaction.start_child(
@@ -123,17 +140,22 @@ def ingest_recording_chunked(
                 retention_days=message_dict["retention_days"],
                 payload_with_headers=recording_segment_with_headers,
             )
-            ingest_recording(message, transaction)
+            result = ingest_recording(message, transaction, post_process)
 
             # Segment chunks are always deleted if ingest behavior runs without error.
             with metrics.timer("replays.process_recording.store_recording.drop_segments"):
                 parts.drop()
 
+            return result
+
 
 @metrics.wraps("replays.usecases.ingest.ingest_recording_not_chunked")
 def ingest_recording_not_chunked(
-    message_dict: RecordingMessage, transaction: Span, current_hub: Hub
-) -> None:
+    message_dict: RecordingMessage,
+    transaction: Span,
+    current_hub: Hub,
+    post_process: bool = True,
+) -> Optional[RecordingPostProcessMessage]:
     """Ingest non-chunked recording messages."""
     with current_hub:
         with transaction.start_child(
@@ -149,11 +171,17 @@ def ingest_recording_not_chunked(
                 retention_days=message_dict["retention_days"],
                 payload_with_headers=message_dict["payload"],
             )
-            ingest_recording(message, transaction)
+            return ingest_recording(message, transaction, post_process)
+
 
+def ingest_recording(
+    message: RecordingIngestMessage, transaction: Span, post_process: bool = True
+) -> Optional[RecordingPostProcessMessage]:
+    """Ingest recording messages.
 
-def ingest_recording(message: RecordingIngestMessage, transaction: Span) -> None:
-    """Ingest recording messages."""
+    If "post_process" is false the segment is only stored and billed.  Post-processing is left to
+    the caller which receives everything it needs to call "post_process_recording" later.
+    """
     try:
         headers, recording_segment = process_headers(message.payload_with_headers)
     except MissingRecordingSegmentHeaders:
@@ -173,7 +201,14 @@ def ingest_recording(message: RecordingIngestMessage, transaction: Span) -> None
     driver = make_storage_driver(message.org_id)
     driver.set(segment_data, recording_segment)
 
-    replay_click_post_processor(message, headers, recording_segment, transaction)
+    post_process_message = RecordingPostProcessMessage(
+        message=message,
+        headers=headers,
+        segment_bytes=recording_segment,
+        transaction=transaction,
+    )
+    if post_process:
+        replay_click_post_processor(message, headers, recording_segment, transaction)
 
     # The first segment records an accepted outcome. This is for billing purposes. Subsequent
     # segments are not billed.
@@ -205,7 +240,20 @@ def ingest_recording(message: RecordingIngestMessage, transaction: Span) -> None
             quantity=1,
         )
 
+    if not post_process:
+        return post_process_message
+
     transaction.finish()
+    return None
+
+
+@metrics.wraps("replays.usecases.ingest.post_process_recording")
+def post_process_recording(message: RecordingPostProcessMessage) -> None:
+    """Run the deferred post-processing of a stored recording segment."""
+    replay_click_post_processor(
+        message.message, message.headers, message.segment_bytes, message.transaction
+    )
+    message.transaction.finish()
 
 
 @metrics.wraps("replays.usecases.ingest.ingest_chunk")
@@ -233,7 +281,7 @@ def ingest_chunk(
 @metrics.wraps("replays.usecases.ingest.collate_segment_chunks")
 def collate_segment_chunks(chunks: RecordingSegmentParts) -> bytes:
     """Collect and merge recording segment chunks."""
-    return b"".join(list(chunks))
+    return b"".join(chunks)
 
 
 @metrics.wraps("replays.usecases.ingest.process_headers")
@@ -258,6 +306,28 @@ def decompress(data: bytes) -> bytes:
         return zlib.decompress(data, zlib.MAX_WBITS | 32)
 
 
+def iter_decompressed(data: bytes) -> Iterator[bytes]:
+    """Yield the decompressed bytes in chunks of at most DECOMPRESS_CHUNK_SIZE."""
+    if data.startswith(b"["):
+        for i in range(0, len(data), DECOMPRESS_CHUNK_SIZE):
+            yield data[i : i + DECOMPRESS_CHUNK_SIZE]
+        return
+
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)
+    view = memoryview(data)
+    for i in range(0, len(data), DECOMPRESS_CHUNK_SIZE):
+        compressed = view[i : i + DECOMPRESS_CHUNK_SIZE]
+        while compressed:
+            chunk = decompressor.decompress(compressed, DECOMPRESS_CHUNK_SIZE)
+            if chunk:
+                yield chunk
+            compressed = decompressor.unconsumed_tail
+
+    chunk = decompressor.flush()
+    if chunk:
+        yield chunk
+
+
 def _report_size_metrics(size_compressed: int, size_uncompressed: int) -> None:
     metrics.timing("replays.usecases.ingest.size_compressed", size_compressed)
     metrics.timing("replays.usecases.ingest.size_uncompressed", size_uncompressed)
@@ -277,10 +347,16 @@ def replay_click_post_processor(
         return None
 
     try:
-        with metrics.timer("replays.usecases.ingest.decompress_and_parse"):
-            decompressed_segment = decompress(segment_bytes)
-            parsed_segment_data = json.loads(decompressed_segment, use_rapid_json=True)
-            _report_size_metrics(len(segment_bytes), len(decompressed_segment))
+        if options.get("replay.ingest.dom-index.streaming"):
+            # The segment is decompressed and parsed while actions are extracted.  Neither the
+            # decompressed segment nor the parsed events are held in memory as a whole.
+            metrics.timing("replays.usecases.ingest.size_compressed", len(segment_bytes))
+            parsed_segment_data = iter_segment_events(iter_decompressed(segment_bytes))
+        else:
+            with metrics.timer("replays.usecases.ingest.decompress_and_parse"):
+                decompressed_segment = decompress(segment_bytes)
+                parsed_segment_data = json.loads(decompressed_segment, use_rapid_json=True)
+                _report_size_metrics(len(segment_bytes), len(decompressed_segment))
 
         # Emit DOM search metadata to Clickhouse.
         with transaction.start_child(
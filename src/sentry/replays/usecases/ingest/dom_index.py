@@ -1,7 +1,8 @@
+import re
 import time
 import uuid
 from hashlib import md5
-from typing import Any, Dict, List, Literal, Optional, TypedDict
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Sequence, TypedDict
 
 from django.conf import settings
 
@@ -10,6 +11,16 @@ from sentry.utils.pubsub import KafkaPublisher
 
 EVENT_LIMIT = 20
 
+# Events larger than this are not parsed when streaming a segment.  These are DOM snapshots and
+# mutations, never the breadcrumbs and performance spans user actions are extracted from.
+MAX_STREAMED_EVENT_SIZE = 1024 * 1024
+
+# The breadcrumb tags of the events "get_user_actions" is interested in.
+USER_ACTION_EVENT_TAGS = (b'"breadcrumb"', b'"performanceSpan"')
+
+_STRUCTURAL_CHARACTER = re.compile(rb'[\[\]{}"]')
+_STRING_CONTENT = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+
 replay_publisher: Optional[KafkaPublisher] = None
 
 ReplayActionsEventPayloadClick = TypedDict(
@@ -50,7 +61,7 @@ def parse_and_emit_replay_actions(
     project_id: int,
     replay_id: str,
     retention_days: int,
-    segment_data: List[Dict[str, Any]],
+    segment_data: Iterable[Dict[str, Any]],
 ) -> None:
     with metrics.timer("replays.usecases.ingest.dom_index.parse_and_emit_replay_actions"):
         message = parse_replay_actions(project_id, replay_id, retention_days, segment_data)
@@ -63,7 +74,7 @@ def parse_replay_actions(
     project_id: int,
     replay_id: str,
     retention_days: int,
-    segment_data: List[Dict[str, Any]],
+    segment_data: Iterable[Dict[str, Any]],
 ) -> Optional[ReplayActionsEvent]:
     """Parse RRWeb payload to ReplayActionsEvent."""
     actions = get_user_actions(replay_id, segment_data)
@@ -103,7 +114,7 @@ def create_replay_actions_payload(
 
 def get_user_actions(
     replay_id: str,
-    events: List[Dict[str, Any]],
+    events: Iterable[Dict[str, Any]],
 ) -> List[ReplayActionsEventPayloadClick]:
     """Return a list of ReplayActionsEventPayloadClick types.
 
@@ -188,6 +199,69 @@ def get_user_actions(
     return result
 
 
+def iter_segment_events(
+    chunks: Iterable[bytes],
+    needles: Sequence[bytes] = USER_ACTION_EVENT_TAGS,
+) -> Iterator[Dict[str, Any]]:
+    """Yield the events of a JSON encoded RRWeb segment which is received in chunks.
+
+    Only the bytes of the current event are buffered.  Events are parsed if their encoded form
+    contains one of "needles", all other events are skipped without parsing them.  Events larger
+    than MAX_STREAMED_EVENT_SIZE are dropped from the buffer while they are being scanned.
+    """
+    buffer = bytearray()
+    position = 0  # The next byte of the buffer to scan.
+    depth = 0
+    in_string = False
+    event_start: Optional[int] = None
+
+    for chunk in chunks:
+        buffer += chunk
+
+        while True:
+            if in_string:
+                content = _STRING_CONTENT.match(buffer, position)
+                assert content is not None  # The pattern matches the empty string.
+                position = content.end()
+                if buffer[position : position + 1] != b'"':
+                    # The string continues in the next chunk.
+                    break
+                position += 1
+                in_string = False
+                continue
+
+            match = _STRUCTURAL_CHARACTER.search(buffer, position)
+            if match is None:
+                position = len(buffer)
+                break
+
+            character = match.group()
+            position = match.end()
+            if character == b'"':
+                in_string = True
+            elif character in b"[{":
+                depth += 1
+                if depth == 2:
+                    event_start = match.start()
+            else:
+                depth -= 1
+                if depth == 1 and event_start is not None:
+                    event = bytes(buffer[event_start:position])
+                    event_start = None
+                    if any(needle in event for needle in needles):
+                        yield json.loads(event, use_rapid_json=True)
+
+        if event_start is not None and len(buffer) - event_start > MAX_STREAMED_EVENT_SIZE:
+            metrics.incr("replays.usecases.ingest.dom_index.event_too_large")
+            event_start = None
+
+        consumed = position if event_start is None else event_start
+        del buffer[:consumed]
+        position -= consumed
+        if event_start is not None:
+            event_start = 0
+
+
 def _initialize_publisher() -> KafkaPublisher:
     global replay_publisher
 
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import itertools
 import uuid
 import zlib
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Iterator, List, Optional
+from typing import Deque, Iterator, List, Optional
 
 from django.db.models import Prefetch
 from snuba_sdk import (
@@ -21,8 +23,9 @@ from snuba_sdk import (
     Request,
 )
 
+from sentry import options
 from sentry.models.file import File, FileBlobIndex
-from sentry.replays.lib.storage import FilestoreBlob, RecordingSegmentStorageMeta, StorageBlob
+from sentry.replays.lib.storage import RecordingSegmentStorageMeta, filestore, storage
 from sentry.replays.models import ReplayRecordingSegment
 from sentry.utils.snuba import raw_snql_query
 
@@ -34,19 +37,24 @@ def fetch_segments_metadata(
     replay_id: str,
     offset: int,
     limit: int,
+    start: datetime | None = None,
+    end: datetime | None = None,
 ) -> List[RecordingSegmentStorageMeta]:
-    """Return a list of recording segment storage metadata."""
+    """Return a list of recording segment storage metadata.
+
+    If "start" and "end" are provided only segments received within that range are returned.
+    """
     # NOTE: This method can miss segments that were split during the deploy.  E.g. half were on
     # filestore the other half were on direct-storage.
 
     # TODO: Filestore is privileged until the direct storage is released to all projects.  Once
     # direct-storage is the default driver we need to invert this.  90 days after deployment we
     # need to remove filestore querying.
-    segments = fetch_filestore_segments_meta(project_id, replay_id, offset, limit)
+    segments = fetch_filestore_segments_meta(project_id, replay_id, offset, limit, start, end)
     if segments:
         return segments
 
-    return fetch_direct_storage_segments_meta(project_id, replay_id, offset, limit)
+    return fetch_direct_storage_segments_meta(project_id, replay_id, offset, limit, start, end)
 
 
 def fetch_segment_metadata(
@@ -70,13 +78,17 @@ def fetch_filestore_segments_meta(
     replay_id: str,
     offset: int,
     limit: int,
+    start: datetime | None = None,
+    end: datetime | None = None,
 ) -> List[RecordingSegmentStorageMeta]:
     """Return filestore metadata derived from our Postgres table."""
-    segments: List[ReplayRecordingSegment] = (
-        ReplayRecordingSegment.objects.filter(project_id=project_id, replay_id=replay_id)
-        .order_by("segment_id")
-        .all()[offset : limit + offset]
-    )
+    queryset = ReplayRecordingSegment.objects.filter(project_id=project_id, replay_id=replay_id)
+    if start is not None and end is not None:
+        queryset = queryset.filter(date_added__gte=start, date_added__lt=end)
+
+    segments: List[ReplayRecordingSegment] = queryset.order_by("segment_id").all()[
+        offset : limit + offset
+    ]
     if not segments:
         return []
 
@@ -132,10 +144,14 @@ def fetch_direct_storage_segments_meta(
     replay_id: str,
     offset: int,
     limit: int,
+    start: datetime | None = None,
+    end: datetime | None = None,
 ) -> List[RecordingSegmentStorageMeta]:
     """Return direct-storage metadata derived from our Clickhouse table."""
     if not has_archived_segment(project_id, replay_id):
-        return _fetch_segments_from_snuba(project_id, replay_id, offset, limit)
+        return _fetch_segments_from_snuba(
+            project_id, replay_id, offset, limit, start=start, end=end
+        )
     return []
 
 
@@ -191,10 +207,15 @@ def _fetch_segments_from_snuba(
     offset: int,
     limit: int,
     segment_id: int | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
 ) -> List[RecordingSegmentStorageMeta]:
     conditions = []
     if segment_id:
         conditions.append(Condition(Column("segment_id"), Op.EQ, segment_id))
+    if start is not None and end is not None:
+        conditions.append(Condition(Column("timestamp"), Op.GTE, start))
+        conditions.append(Condition(Column("timestamp"), Op.LT, end))
 
     snuba_request = Request(
         dataset="replays",
@@ -209,7 +230,8 @@ def _fetch_segments_from_snuba(
                 # range.
                 Condition(Column("timestamp"), Op.LT, datetime.now()),
                 Condition(Column("timestamp"), Op.GTE, datetime.now() - timedelta(days=90)),
-                # Used to dynamically pass the "segment_id" condition for details requests.
+                # Used to dynamically pass the "segment_id" condition for details requests and
+                # the timestamp range of range requests.
                 *conditions,
             ],
             orderby=[OrderBy(Column("segment_id"), Direction.ASC)],
@@ -237,28 +259,50 @@ def _fetch_segments_from_snuba(
 
 
 def download_segments(segments: List[RecordingSegmentStorageMeta]) -> Iterator[bytes]:
-    """Download segment data from remote storage."""
-    # Map all of the segments to a worker process for download.
-    with ThreadPoolExecutor(max_workers=4) as exe:
-        results = exe.map(download_segment, segments)
+    """Download segment data from remote storage.
+
+    Segments are yielded in order as soon as they are available while the following segments are
+    prefetched concurrently.  The first segment is not held back until every segment has been
+    downloaded.
+    """
+    prefetch = max(options.get("replay.reader.prefetch-segments"), 1)
+    remaining = iter(segments)
+
+    executor = ThreadPoolExecutor(max_workers=prefetch)
+    pending: Deque[Future[Optional[bytes]]] = deque(
+        executor.submit(download_segment, segment)
+        for segment in itertools.islice(remaining, prefetch)
+    )
+
+    try:
+        yield b"["
+
+        while pending:
+            result = pending.popleft().result()
 
-    yield b"["
+            # Keep the window of prefetched segments full.
+            for segment in itertools.islice(remaining, 1):
+                pending.append(executor.submit(download_segment, segment))
 
-    for i, result in enumerate(results):
-        if result is None:
-            yield b"[]"
-        else:
-            yield result
+            if result is None:
+                yield b"[]"
+            else:
+                yield result
 
-        if i < len(segments) - 1:
-            yield b","
+            if pending:
+                yield b","
 
-    yield b"]"
+        yield b"]"
+    finally:
+        # The client may disconnect before every segment was streamed.
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
 
 
 def download_segment(segment: RecordingSegmentStorageMeta) -> Optional[bytes]:
     """Return the segment blob data."""
-    driver = FilestoreBlob() if segment.file_id else StorageBlob()
+    driver = filestore if segment.file_id else storage
     result = driver.get(segment)
     if result is None:
         return None
@@ -95,6 +95,7 @@ from sentry.attachments import CachedAttachment, attachment_cache
 from sentry.deletions.defaults.group import DIRECT_GROUP_RELATED_MODELS
 from sentry.eventstore.models import Event
 from sentry.eventstore.processing import event_processing_store
+from sentry.grouping import grouphash_cache
 from sentry.utils import json, metrics, snuba
 from sentry.utils.cache import cache_key_for_event
 from sentry.utils.dates import to_datetime, to_timestamp
@@ -593,6 +594,8 @@ def start_group_reprocessing(
 ):
     from django.db import transaction
 
+    from sentry.tagstore import summaries as tagstore_summaries
+
     with transaction.atomic():
         group = models.Group.objects.get(id=group_id)
         original_status = group.status
@@ -635,6 +638,10 @@ def start_group_reprocessing(
         for model in GROUP_MODELS_TO_MIGRATE:
             model.objects.filter(group_id=group_id).update(group_id=new_group.id)
 
+    # The hashes of the old group now belong to the new group.
+    grouphash_cache.invalidate_groups([new_group.id])
+    tagstore_summaries.mark_groups_stale([new_group.id])
+
     # Get event counts of issue (for all environments etc). This was copypasted
     # and simplified from groupserializer.
     event_count = sync_count = snuba.aliased_query(
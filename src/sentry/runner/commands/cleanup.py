@@ -115,8 +115,23 @@ def multiprocess_worker(task_queue):
     is_flag=True,
     help="Send the duration of this command to internal metrics.",
 )
+@click.option(
+    "--partitioned",
+    default=False,
+    is_flag=True,
+    help="Bulk delete in batches over ranges of primary keys, using `--concurrency` threads. "
+    "Interrupted runs resume where they stopped.",
+)
+@click.option(
+    "--max-replication-lag",
+    type=float,
+    default=None,
+    help="Pause partitioned bulk deletes while replicas lag behind by more than this many seconds.",
+)
 @log_options()
-def cleanup(days, project, concurrency, silent, model, router, timed):
+def cleanup(
+    days, project, concurrency, silent, model, router, timed, partitioned, max_replication_lag
+):
     """Delete a portion of trailing data based on creation date.
 
     All data that is older than `--days` will be deleted.  The default for
@@ -289,6 +304,25 @@ def cleanup(days, project, concurrency, silent, model, router, timed):
             if is_filtered(model):
                 if not silent:
                     click.echo(">> Skipping %s" % model.__name__)
+            elif partitioned:
+                query_start_time = time.time()
+                deleted = BulkDeleteQuery(
+                    model=model,
+                    dtfield=dtfield,
+                    days=days,
+                    project_id=project_id,
+                ).execute_in_ranges(
+                    chunk_size=chunk_size,
+                    concurrency=concurrency,
+                    max_replication_lag=max_replication_lag,
+                    checkpoint_key=f"cleanup:{model._meta.db_table}:{days}:{project_id or '*'}",
+                )
+                if not silent:
+                    click.echo(
+                        ">> Removed {deleted} rows in {duration:.1f} second(s)".format(
+                            deleted=deleted, duration=time.time() - query_start_time
+                        )
+                    )
             else:
                 BulkDeleteQuery(
                     model=model,
@@ -460,6 +460,19 @@ def post_process_forwarder(**options):
     type=click.Choice(["earliest", "latest"]),
     help="Force subscriptions to start from a particular offset",
 )
+@click.option(
+    "--max-batch-size",
+    default=None,
+    type=int,
+    help="Maximum number of subscription updates to handle together. Updates are handled one by one if not set.",
+)
+@click.option(
+    "--max-batch-time-ms",
+    "max_batch_time",
+    default=1000,
+    type=int,
+    help="Maximum time (in milliseconds) to wait before handling a batch.",
+)
 @strict_offset_reset_option()
 @log_options()
 @configuration
@@ -471,6 +484,8 @@ def query_subscription_consumer(**options):
         group_id=options["group"],
         strict_offset_reset=options["strict_offset_reset"],
         initial_offset_reset=options["initial_offset_reset"],
+        max_batch_size=options["max_batch_size"],
+        max_batch_time=options["max_batch_time"],
     )
     run_processor_with_signals(subscriber)
 
@@ -534,7 +549,7 @@ def ingest_consumer(consumer_types, all_consumer_types, **options):
 
 
 @run.command("occurrences-ingest-consumer")
-@kafka_options("occurrence-consumer", allow_force_cluster=False)
+@kafka_options("occurrence-consumer", allow_force_cluster=False, include_batching_options=True)
 @strict_offset_reset_option()
 @configuration
 def occurrences_ingest_consumer(**options):
@@ -623,6 +638,18 @@ def profiles_consumer(**options):
 @click.option(
     "--topic", default="ingest-replay-recordings", help="Topic to get replay recording data from"
 )
+@click.option(
+    "--concurrency",
+    default=4,
+    type=int,
+    help="Number of threads uploading recordings. Segments of a replay are uploaded in order.",
+)
+@click.option(
+    "--max-pending-futures",
+    default=50,
+    type=int,
+    help="Number of recordings in flight before the consumer stops fetching new messages.",
+)
 def replays_recordings_consumer(**options):
     from sentry.replays.consumers import get_replays_recordings_consumer
 
@@ -633,7 +660,7 @@ def replays_recordings_consumer(**options):
 @run.command("ingest-monitors")
 @log_options()
 @click.option("--topic", default="ingest-monitors", help="Topic to get monitor check-in data from.")
-@kafka_options("ingest-monitors")
+@kafka_options("ingest-monitors", include_batching_options=True)
 @strict_offset_reset_option()
 @configuration
 def monitors_consumer(**options):
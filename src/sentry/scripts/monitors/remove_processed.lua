@@ -0,0 +1,15 @@
+-- Removes members of a sorted set, unless their score changed since they were
+-- read. ARGV holds pairs of a member and the score it was read with.
+-- Returns the number of removed members.
+assert(#KEYS == 1, "provide the key of the sorted set")
+assert(#ARGV % 2 == 0, "provide pairs of members and scores")
+
+local removed = 0
+for i = 1, #ARGV, 2 do
+    local score = redis.call("ZSCORE", KEYS[1], ARGV[i])
+    if score and tonumber(score) == tonumber(ARGV[i + 1]) then
+        removed = removed + redis.call("ZREM", KEYS[1], ARGV[i])
+    end
+end
+
+return removed
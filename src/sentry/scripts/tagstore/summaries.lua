@@ -0,0 +1,68 @@
+--[[
+
+Records the tags of an event in a tag summary bucket.
+
+A bucket summarizes all events of a scope (a project or a group) in one
+environment and one day, and consists of the following data structures:
+
+- A tag key frequency hash, which maintains how many events had each tag key.
+- Per tag key, a HyperLogLog of all values, used to estimate the number of
+    distinct values.
+- Per tag key, a value frequency sorted set. Only the most frequent values
+    are retained: once the set has grown past twice its capacity, the least
+    frequent values are evicted.
+- Per tag key, a hash of the first and last time each retained value was
+    seen, stored as ``<first_seen>:<last_seen>``.
+
+KEYS[1] is the tag key frequency hash, followed by the HyperLogLog, the value
+frequency sorted set and the seen hash of each tag of the event.
+
+ARGV contains the timestamp of the event, the capacity of the value frequency
+sorted sets and the TTL of the bucket, followed by the key and value of each
+tag of the event.
+
+]]--
+
+assert((#KEYS - 1) % 3 == 0, "provide the keys hash and three keys per tag")
+assert(#ARGV - 3 == (#KEYS - 1) / 3 * 2, "provide a key and value per tag")
+
+local timestamp = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local ttl = tonumber(ARGV[3])
+
+local keys_key = KEYS[1]
+
+for i = 1, (#KEYS - 1) / 3 do
+    local hll_key = KEYS[i * 3 - 1]
+    local values_key = KEYS[i * 3]
+    local seen_key = KEYS[i * 3 + 1]
+    local tag_key = ARGV[i * 2 + 2]
+    local tag_value = ARGV[i * 2 + 3]
+
+    redis.call("HINCRBY", keys_key, tag_key, 1)
+    redis.call("PFADD", hll_key, tag_value)
+    redis.call("ZINCRBY", values_key, 1, tag_value)
+
+    local first_seen = timestamp
+    local last_seen = timestamp
+    local seen = redis.call("HGET", seen_key, tag_value)
+    if seen then
+        local separator = string.find(seen, ":", 1, true)
+        first_seen = math.min(first_seen, tonumber(string.sub(seen, 1, separator - 1)))
+        last_seen = math.max(last_seen, tonumber(string.sub(seen, separator + 1)))
+    end
+    redis.call("HSET", seen_key, tag_value, string.format("%d:%d", first_seen, last_seen))
+
+    local overflow = redis.call("ZCARD", values_key) - capacity
+    if overflow > capacity then
+        local evicted = redis.call("ZRANGE", values_key, 0, overflow - 1)
+        redis.call("ZREMRANGEBYRANK", values_key, 0, overflow - 1)
+        redis.call("HDEL", seen_key, unpack(evicted))
+    end
+
+    redis.call("EXPIRE", hll_key, ttl)
+    redis.call("EXPIRE", values_key, ttl)
+    redis.call("EXPIRE", seen_key, ttl)
+end
+
+redis.call("EXPIRE", keys_key, ttl)
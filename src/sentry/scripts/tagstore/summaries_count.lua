@@ -0,0 +1,14 @@
+-- Estimates the number of distinct values of several HyperLogLog unions.
+-- KEYS are split into consecutive groups of ARGV[1] keys, and the
+-- cardinality of the union of each group is returned.
+assert(#ARGV == 1, "provide the size of a group")
+
+local size = tonumber(ARGV[1])
+assert(#KEYS % size == 0, "provide complete groups of keys")
+
+local counts = {}
+for i = 1, #KEYS, size do
+    counts[#counts + 1] = redis.call("PFCOUNT", unpack(KEYS, i, i + size - 1))
+end
+
+return counts
@@ -681,67 +681,81 @@ class MetricsQueryBuilder(QueryBuilder):
         # goal is to get n=limit results from one query, then use those n results to create a condition for the
         # remaining queries. This is so that we can respect function orderbys from the first query, but also so we don't
         # get 50 different results from each entity
-        for query_details in [query_framework.pop(primary), *query_framework.values()]:
-            # Only run the query if there's at least one function, can't query without metrics
-            if len(query_details.functions) > 0:
-                select = [
-                    column
-                    for column in self.columns
-                    if column in query_details.functions or column not in self.aggregates
+        # Only run the query if there's at least one function, can't query without metrics
+        pending = [
+            query_details
+            for query_details in [query_framework.pop(primary), *query_framework.values()]
+            if len(query_details.functions) > 0
+        ]
+        while pending:
+            if groupby_values or not self.groupby:
+                # The remaining queries don't depend on each other's results anymore, run them concurrently
+                batch, pending = pending, []
+            else:
+                batch, pending = pending[:1], pending[1:]
+
+            if groupby_values:
+                # We already got the groupby values we want, add them to the conditions to limit our results so we
+                # can get the aggregates for the same values
+                where = self.where + [
+                    Condition(
+                        # Tuples are allowed to have multiple types in clickhouse
+                        Function(
+                            "tuple",
+                            [
+                                groupby.exp if isinstance(groupby, AliasedExpression) else groupby
+                                for groupby in self.groupby
+                            ],
+                        ),
+                        Op.IN,
+                        Function("tuple", groupby_values),
+                    )
                 ]
-                if groupby_values:
-                    # We already got the groupby values we want, add them to the conditions to limit our results so we
-                    # can get the aggregates for the same values
-                    where = self.where + [
-                        Condition(
-                            # Tuples are allowed to have multiple types in clickhouse
-                            Function(
-                                "tuple",
-                                [
-                                    groupby.exp
-                                    if isinstance(groupby, AliasedExpression)
-                                    else groupby
-                                    for groupby in self.groupby
-                                ],
-                            ),
-                            Op.IN,
-                            Function("tuple", groupby_values),
-                        )
-                    ]
-                    # Because we've added a condition for each groupby value we don't want an offset here
-                    offset = Offset(0)
-                    referrer_suffix = "secondary"
-                else:
-                    # We don't have our groupby values yet, this means this is the query where we're getting them
-                    where = self.where
-                    offset = self.offset
-                    referrer_suffix = "primary"
-
-                query = Query(
-                    match=query_details.entity,
-                    select=select,
-                    array_join=self.array_join,
-                    where=where,
-                    having=query_details.having,
-                    groupby=self.groupby,
-                    orderby=query_details.orderby,
-                    limit=self.limit,
-                    offset=offset,
-                    limitby=self.limitby,
-                    granularity=self.granularity,
-                )
-                request = Request(
+                # Because we've added a condition for each groupby value we don't want an offset here
+                offset = Offset(0)
+                referrer_suffix = "secondary"
+            else:
+                # We don't have our groupby values yet, this means this is the query where we're getting them
+                where = self.where
+                offset = self.offset
+                referrer_suffix = "primary"
+
+            requests = [
+                Request(
                     dataset=self.dataset.value,
                     app_id="default",
-                    query=query,
+                    query=Query(
+                        match=query_details.entity,
+                        select=[
+                            column
+                            for column in self.columns
+                            if column in query_details.functions or column not in self.aggregates
+                        ],
+                        array_join=self.array_join,
+                        where=where,
+                        having=query_details.having,
+                        groupby=self.groupby,
+                        orderby=query_details.orderby,
+                        limit=self.limit,
+                        offset=offset,
+                        limitby=self.limitby,
+                        granularity=self.granularity,
+                    ),
                     flags=Flags(turbo=self.turbo),
                     tenant_ids=self.tenant_ids,
                 )
-                current_result = raw_snql_query(
-                    request,
-                    f"{referrer}.{referrer_suffix}",
-                    use_cache,
+                for query_details in batch
+            ]
+            if len(requests) > 1:
+                batch_results = bulk_snql_query(
+                    requests, f"{referrer}.{referrer_suffix}", use_cache
                 )
+            else:
+                batch_results = [
+                    raw_snql_query(requests[0], f"{referrer}.{referrer_suffix}", use_cache)
+                ]
+
+            for current_result in batch_results:
                 for row in current_result["data"]:
                     # Arrays in clickhouse cannot contain multiple types, and since groupby values
                     # can contain any type, we must use tuples instead
@@ -7,9 +7,10 @@ from abc import ABCMeta, abstractmethod
 from dataclasses import replace
 from datetime import datetime, timedelta
 from hashlib import md5
-from typing import Any, List, Mapping, Optional, Sequence, Set, Tuple, cast
+from typing import Any, Callable, List, Mapping, Optional, Sequence, Set, Tuple, cast
 
 import sentry_sdk
+from django.core.exceptions import EmptyResultSet
 from django.db.models import Q
 from django.utils import timezone
 from snuba_sdk import (
@@ -50,8 +51,14 @@ from sentry.search.events.fields import DateArg
 from sentry.search.events.filter import convert_search_filter_to_snuba_query, format_search_filter
 from sentry.search.utils import validate_cdc_search_filters
 from sentry.utils import json, metrics, snuba
+from sentry.utils.cache import cache
 from sentry.utils.cursors import Cursor, CursorResult
-from sentry.utils.snuba import SnubaQueryParams, aliased_query_params, bulk_raw_query
+from sentry.utils.snuba import (
+    SnubaQueryParams,
+    aliased_query_params,
+    bulk_raw_query,
+    bulk_raw_query_async,
+)
 
 
 def get_search_filter(
@@ -317,6 +324,55 @@ class AbstractQueryExecutor(metaclass=ABCMeta):
             * a sorted list of (group_id, group_score) tuples sorted descending by score,
             * the count of total results (rows) available for this query.
         """
+        query_params_for_categories, referrer = self._prepare_snuba_search(
+            start=start,
+            end=end,
+            project_ids=project_ids,
+            environment_ids=environment_ids,
+            sort_field=sort_field,
+            organization=organization,
+            cursor=cursor,
+            group_ids=group_ids,
+            limit=limit,
+            offset=offset,
+            get_sample=get_sample,
+            search_filters=search_filters,
+            referrer=referrer,
+            actor=actor,
+        )
+        return self._merge_snuba_search_results(
+            bulk_raw_query(query_params_for_categories, referrer=referrer), sort_field, get_sample
+        )
+
+    def snuba_search_async(self, **kwargs: Any) -> Callable[[], Tuple[List[Tuple[int, Any]], int]]:
+        """Like `snuba_search`, but the Snuba queries run in the background.
+
+        Returns a function which waits for the queries and returns the same
+        result as `snuba_search`.
+        """
+        query_params_for_categories, referrer = self._prepare_snuba_search(**kwargs)
+        future = bulk_raw_query_async(query_params_for_categories, referrer=referrer)
+        sort_field = kwargs["sort_field"]
+        get_sample = kwargs.get("get_sample", False)
+        return lambda: self._merge_snuba_search_results(future.result(), sort_field, get_sample)
+
+    def _prepare_snuba_search(
+        self,
+        start: datetime,
+        end: datetime,
+        project_ids: Sequence[int],
+        environment_ids: Optional[Sequence[int]],
+        sort_field: str,
+        organization: Organization,
+        cursor: Optional[Cursor] = None,
+        group_ids: Optional[Sequence[int]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        get_sample: bool = False,
+        search_filters: Optional[Sequence[SearchFilter]] = None,
+        referrer: Optional[str] = None,
+        actor: Optional[Any] = None,
+    ) -> Tuple[List[SnubaQueryParams], str]:
         filters = {"project_id": project_ids}
 
         environments = None
@@ -396,8 +452,11 @@ class AbstractQueryExecutor(metaclass=ABCMeta):
             query_params for query_params in query_params_for_categories if query_params is not None
         ]
 
-        bulk_query_results = bulk_raw_query(query_params_for_categories, referrer=referrer)
+        return query_params_for_categories, referrer
 
+    def _merge_snuba_search_results(
+        self, bulk_query_results: Sequence[Any], sort_field: str, get_sample: bool
+    ) -> Tuple[List[Tuple[int, Any]], int]:
         rows: list[MergeableRow] = []
         total = 0
         row_length = 0
@@ -602,6 +661,27 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             group_ids = []
 
         sort_field = self.sort_strategies[sort_by]
+
+        if too_many_candidates and options.get("snuba.search.streaming-post-filter"):
+            return self._streaming_post_filter_query(
+                projects=projects,
+                retention_window_start=retention_window_start,
+                group_queryset=group_queryset,
+                environments=environments,
+                sort_by=sort_by,
+                sort_field=sort_field,
+                limit=limit,
+                cursor=cursor,
+                count_hits=count_hits,
+                paginator_options=paginator_options,
+                search_filters=search_filters,
+                start=start,
+                end=end,
+                max_hits=max_hits,
+                referrer=referrer,
+                actor=actor,
+            )
+
         chunk_growth = options.get("snuba.search.chunk-growth-rate")
         max_chunk_size = options.get("snuba.search.max-chunk-size")
         chunk_limit = limit
@@ -717,6 +797,142 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             if group_ids or len(paginator_results.results) >= limit or not more_results:
                 break
 
+        metrics.timing("snuba.search.num_chunks", num_chunks)
+
+        return self._finalize_paginator_results(paginator_results, limit, cursor, more_results)
+
+    def _streaming_post_filter_query(
+        self,
+        projects: Sequence[Project],
+        retention_window_start: Optional[datetime],
+        group_queryset: BaseQuerySet,
+        environments: Optional[Sequence[Environment]],
+        sort_by: str,
+        sort_field: str,
+        limit: int,
+        cursor: Cursor | None,
+        count_hits: bool,
+        paginator_options: Mapping[str, Any],
+        search_filters: Optional[Sequence[SearchFilter]],
+        start: datetime,
+        end: datetime,
+        max_hits: Optional[int] = None,
+        referrer: Optional[str] = None,
+        actor: Optional[Any] = None,
+    ) -> CursorResult[Group]:
+        """
+        Post-filters Snuba results in Postgres, like the chunked loop in `query`,
+        but pipelined: the next page of candidates is fetched from Snuba while
+        the current one is filtered in Postgres, and hits are estimated in the
+        background. Fetching stops as soon as `limit + 1` results past the
+        cursor are confirmed, which is enough to know that there is a next page.
+        """
+        resolve_hits = self._calculate_hits(
+            [],
+            True,
+            sort_field,
+            projects,
+            retention_window_start,
+            group_queryset,
+            environments,
+            sort_by,
+            limit,
+            cursor,
+            count_hits,
+            paginator_options,
+            search_filters,
+            start,
+            end,
+            actor,
+            run_async=True,
+        )
+
+        chunk_growth = options.get("snuba.search.chunk-growth-rate")
+        max_chunk_size = options.get("snuba.search.max-chunk-size")
+        max_time = options.get("snuba.search.max-total-chunk-time-seconds")
+        time_start = time.time()
+
+        search_kwargs = dict(
+            start=start,
+            end=end,
+            project_ids=[p.id for p in projects],
+            environment_ids=environments and [environment.id for environment in environments],
+            organization=projects[0].organization,
+            sort_field=sort_field,
+            cursor=cursor,
+            search_filters=search_filters,
+            referrer=referrer,
+            actor=actor,
+        )
+
+        chunk_limit = min(int(limit * chunk_growth), max_chunk_size)
+        offset = 0
+        pending_chunk: Optional[Callable[[], Tuple[List[Tuple[int, Any]], int]]]
+        pending_chunk = self.snuba_search_async(limit=chunk_limit, offset=offset, **search_kwargs)
+        num_chunks = 0
+        more_results = False
+        result_groups: List[Tuple[int, Any]] = []
+        result_group_ids: Set[int] = set()
+        paginator_results = self.empty_result
+
+        while pending_chunk is not None:
+            num_chunks += 1
+            snuba_groups, total = pending_chunk()
+            pending_chunk = None
+
+            metrics.timing("snuba.search.num_snuba_results", len(snuba_groups))
+            more_results = len(snuba_groups) >= limit and (offset + limit) < total
+            offset += len(snuba_groups)
+
+            if not snuba_groups:
+                break
+
+            if more_results and (time.time() - time_start) < max_time:
+                chunk_limit = min(int(chunk_limit * chunk_growth), max_chunk_size)
+                pending_chunk = self.snuba_search_async(
+                    limit=chunk_limit, offset=offset, **search_kwargs
+                )
+
+            filtered_group_ids = group_queryset.filter(
+                id__in=[gid for gid, _ in snuba_groups]
+            ).values_list("id", flat=True)
+
+            group_to_score = dict(snuba_groups)
+            for group_id in filtered_group_ids:
+                # Scores may move between Snuba queries, so protect against duplicates.
+                if group_id not in result_group_ids:
+                    result_group_ids.add(group_id)
+                    result_groups.append((group_id, group_to_score[group_id]))
+
+            paginator_results = SequencePaginator(
+                [(score, id) for (id, score) in result_groups], reverse=True, **paginator_options
+            ).get_result(limit, cursor, max_hits=max_hits)
+
+            if paginator_results.next.has_results:
+                if pending_chunk is not None:
+                    # The prefetched page is not needed, its query finishes in the background.
+                    metrics.incr("snuba.search.streaming.unused_prefetch")
+                break
+
+        metrics.timing("snuba.search.num_chunks", num_chunks, tags={"streaming": True})
+
+        hits = resolve_hits()
+        if count_hits and hits == 0:
+            return self.empty_result
+
+        paginator_results = SequencePaginator(
+            [(score, id) for (id, score) in result_groups], reverse=True, **paginator_options
+        ).get_result(limit, cursor, known_hits=hits, max_hits=max_hits)
+
+        return self._finalize_paginator_results(paginator_results, limit, cursor, more_results)
+
+    def _finalize_paginator_results(
+        self,
+        paginator_results: CursorResult[Group],
+        limit: int,
+        cursor: Cursor | None,
+        more_results: bool,
+    ) -> CursorResult[Group]:
         # HACK: We're using the SequencePaginator to mask the complexities of going
         # back and forth between two databases. This causes a problem with pagination
         # because we're 'lying' to the SequencePaginator (it thinks it has the entire
@@ -736,8 +952,6 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             # more results.
             paginator_results.prev.has_results = True
 
-        metrics.timing("snuba.search.num_chunks", num_chunks)
-
         groups = Group.objects.in_bulk(paginator_results.results)
         paginator_results.results = [groups[k] for k in paginator_results.results if k in groups]
 
@@ -767,8 +981,93 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
         It will return 0 if hits were calculated and there are none.
         It will return None if hits were not calculated.
         """
-        if count_hits is False:
+        return self._calculate_hits(
+            group_ids,
+            too_many_candidates,
+            sort_field,
+            projects,
+            retention_window_start,
+            group_queryset,
+            environments,
+            sort_by,
+            limit,
+            cursor,
+            count_hits,
+            paginator_options,
+            search_filters,
+            start,
+            end,
+            actor,
+        )()
+
+    def _get_hits_cache_key(
+        self,
+        too_many_candidates: bool,
+        sort_field: str,
+        projects: Sequence[Project],
+        group_queryset: Query,
+        environments: Optional[Sequence[Environment]],
+        search_filters: Optional[Sequence[SearchFilter]],
+        start: datetime,
+        end: datetime,
+    ) -> Optional[str]:
+        """
+        Fingerprints the hits estimate of a query. The time range is bucketed
+        by the cache TTL, since it moves with the current time.
+        """
+        ttl = options.get("snuba.search.hits-estimate-cache-ttl")
+        if not ttl:
+            return None
+
+        try:
+            queryset_sql = str(group_queryset.query)
+        except EmptyResultSet:
             return None
+
+        fingerprint = md5(
+            json.dumps(
+                [
+                    type(self).__name__,
+                    too_many_candidates,
+                    sort_field,
+                    sorted(p.id for p in projects),
+                    sorted(e.id for e in environments or ()),
+                    repr(search_filters),
+                    queryset_sql,
+                    int(start.timestamp()) // ttl,
+                    int(end.timestamp()) // ttl,
+                ]
+            ).encode("utf-8")
+        ).hexdigest()
+        return f"search:hits-estimate:{fingerprint}"
+
+    def _calculate_hits(
+        self,
+        group_ids: Sequence[int],
+        too_many_candidates: bool,
+        sort_field: str,
+        projects: Sequence[Project],
+        retention_window_start: Optional[datetime],
+        group_queryset: Query,
+        environments: Optional[Sequence[Environment]],
+        sort_by: str,
+        limit: int,
+        cursor: Cursor | None,
+        count_hits: bool,
+        paginator_options: Mapping[str, Any],
+        search_filters: Optional[Sequence[SearchFilter]],
+        start: datetime,
+        end: datetime,
+        actor: Optional[Any] = None,
+        run_async: bool = False,
+    ) -> Callable[[], Optional[int]]:
+        """
+        Starts calculating hits as described in `calculate_hits` and returns a
+        function returning the result. With `run_async`, the Snuba sample query
+        runs in the background until the result is requested.
+        """
+        if count_hits is False:
+            return lambda: None
         elif too_many_candidates or cursor is not None:
             # If we had too many candidates to reasonably pass down to snuba,
             # or if we have a cursor that bisects the overall result set (such
@@ -819,20 +1118,49 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             if not too_many_candidates:
                 kwargs["group_ids"] = group_ids
 
-            snuba_groups, snuba_total = self.snuba_search(**kwargs)
-            snuba_count = len(snuba_groups)
-            if snuba_count == 0:
-                # Maybe check for 0 hits and return EMPTY_RESULT in ::query? self.empty_result
-                return 0
+            cache_key = self._get_hits_cache_key(
+                too_many_candidates,
+                sort_field,
+                projects,
+                group_queryset,
+                environments,
+                search_filters,
+                start,
+                end,
+            )
+            if cache_key is not None:
+                cached_hits = cache.get(cache_key)
+                metrics.incr(
+                    "snuba.search.hits_estimate_cache", tags={"hit": cached_hits is not None}
+                )
+                if cached_hits is not None:
+                    return lambda: cached_hits  # type: ignore
+
+            if run_async:
+                snuba_sample = self.snuba_search_async(**kwargs)
             else:
-                filtered_count = group_queryset.filter(
-                    id__in=[gid for gid, _ in snuba_groups]
-                ).count()
+                snuba_sample = functools.partial(self.snuba_search, **kwargs)
+
+            def resolve_hits() -> int:
+                snuba_groups, snuba_total = snuba_sample()
+                snuba_count = len(snuba_groups)
+                if snuba_count == 0:
+                    # Maybe check for 0 hits and return EMPTY_RESULT in ::query? self.empty_result
+                    hits = 0
+                else:
+                    filtered_count = group_queryset.filter(
+                        id__in=[gid for gid, _ in snuba_groups]
+                    ).count()
+
+                    hit_ratio = filtered_count / float(snuba_count)
+                    hits = int(hit_ratio * snuba_total)
 
-                hit_ratio = filtered_count / float(snuba_count)
-                hits = int(hit_ratio * snuba_total)
+                if cache_key is not None:
+                    cache.set(cache_key, hits, options.get("snuba.search.hits-estimate-cache-ttl"))
                 return hits
-        return None
+
+            return resolve_hits
+        return lambda: None
 
 
 class InvalidQueryForExecutor(Exception):
@@ -4,6 +4,7 @@ import random
 from collections import namedtuple
 from copy import deepcopy
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Sequence
 
 import sentry_sdk
@@ -33,8 +34,9 @@ from sentry.utils.dates import to_timestamp
 from sentry.utils.math import nice_int
 from sentry.utils.snuba import (
     Dataset,
+    QueryExecutionTimeMaximum,
     SnubaTSResult,
-    bulk_snql_query,
+    bulk_snql_query_partial,
     get_array_column_alias,
     get_array_column_field,
     get_measurement_name,
@@ -95,6 +97,15 @@ def is_real_column(col):
     return True
 
 
+@lru_cache(maxsize=10000)
+def _parse_time(value: str) -> int:
+    # `datetime.fromisoformat` is new in Python3.7 and before Python3.11, it is not a full
+    # ISO 8601 parser. It is only the inverse function of `datetime.isoformat`, which is
+    # the format returned by snuba. This is significantly faster when compared to other
+    # parsers like `dateutil.parser.parse` and `datetime.strptime`.
+    return int(to_timestamp(datetime.fromisoformat(value)))
+
+
 def zerofill(data, start, end, rollup, orderby):
     rv = []
     start = int(to_naive_timestamp(naiveify_datetime(start)) / rollup) * rollup
@@ -102,21 +113,21 @@ def zerofill(data, start, end, rollup, orderby):
     data_by_time = {}
 
     for obj in data:
-        # This is needed for SnQL, and was originally done in utils.snuba.get_snuba_translators
-        if isinstance(obj["time"], str):
-            # `datetime.fromisoformat` is new in Python3.7 and before Python3.11, it is not a full
-            # ISO 8601 parser. It is only the inverse function of `datetime.isoformat`, which is
-            # the format returned by snuba. This is significantly faster when compared to other
-            # parsers like `dateutil.parser.parse` and `datetime.strptime`.
-            obj["time"] = int(to_timestamp(datetime.fromisoformat(obj["time"])))
-        if obj["time"] in data_by_time:
-            data_by_time[obj["time"]].append(obj)
+        # This is needed for SnQL, and was originally done in utils.snuba.get_snuba_translators.
+        # All rows of a bucket share the same time, so each of them is only parsed once.
+        time = obj["time"]
+        if isinstance(time, str):
+            time = obj["time"] = _parse_time(time)
+        rows = data_by_time.get(time)
+        if rows is None:
+            data_by_time[time] = [obj]
         else:
-            data_by_time[obj["time"]] = [obj]
+            rows.append(obj)
 
     for key in range(start, end, rollup):
-        if key in data_by_time and len(data_by_time[key]) > 0:
-            rv.extend(data_by_time[key])
+        rows = data_by_time.get(key)
+        if rows:
+            rv.extend(rows)
         else:
             rv.append({"time": key})
 
@@ -188,6 +199,55 @@ def query(
                                 requested function format.
     sample (float) The sample rate to run the query with
     """
+    builder = get_query_builder(
+        selected_columns,
+        query,
+        params,
+        snuba_params=snuba_params,
+        equations=equations,
+        orderby=orderby,
+        offset=offset,
+        limit=limit,
+        auto_fields=auto_fields,
+        auto_aggregations=auto_aggregations,
+        include_equation_fields=include_equation_fields,
+        use_aggregate_conditions=use_aggregate_conditions,
+        conditions=conditions,
+        functions_acl=functions_acl,
+        transform_alias_to_input_format=transform_alias_to_input_format,
+        sample=sample,
+        has_metrics=has_metrics,
+        skip_tag_resolution=skip_tag_resolution,
+        extra_columns=extra_columns,
+    )
+    return transform_query_results(builder, builder.run_query(referrer))
+
+
+def get_query_builder(
+    selected_columns,
+    query,
+    params,
+    snuba_params=None,
+    equations=None,
+    orderby=None,
+    offset=None,
+    limit=50,
+    auto_fields=False,
+    auto_aggregations=False,
+    include_equation_fields=False,
+    use_aggregate_conditions=False,
+    conditions=None,
+    functions_acl=None,
+    transform_alias_to_input_format=False,
+    sample=None,
+    has_metrics=False,
+    skip_tag_resolution=False,
+    extra_columns=None,
+) -> QueryBuilder:
+    """
+    Builds the query run by `query` without running it, for callers which run several
+    queries at once. See `query` for the parameters.
+    """
     if not selected_columns:
         raise InvalidSearchQuery("No columns selected")
 
@@ -215,8 +275,12 @@ def query(
         builder.add_conditions(conditions)
     if extra_columns is not None:
         builder.columns.extend(extra_columns)
+    return builder
 
-    result = builder.process_results(builder.run_query(referrer))
+
+def transform_query_results(builder: QueryBuilder, results) -> EventsResponse:
+    """Transforms the Snuba results of a query built by `get_query_builder`."""
+    result = builder.process_results(results)
     result["meta"]["tips"] = transform_tips(builder.tips)
     return result
 
@@ -286,7 +350,16 @@ def timeseries_query(
             )
             query_list.append(comparison_builder)
 
-        query_results = bulk_snql_query([query.get_snql_query() for query in query_list], referrer)
+        query_results = bulk_snql_query_partial(
+            [query.get_snql_query() for query in query_list], referrer
+        )
+        if query_results[0] is None:
+            raise QueryExecutionTimeMaximum("The timeseries query timed out")
+        # The comparison period is optional, the base series can be returned without it
+        errors = []
+        if query_results[-1] is None:
+            errors.append(get_timeout_error("comparison"))
+            query_list, query_results = query_list[:1], query_results[:1]
 
     with sentry_sdk.start_span(op="discover.discover", description="timeseries.transform_results"):
         results = []
@@ -315,23 +388,19 @@ def timeseries_query(
             result["comparisonCount"] = cmp_result_val
 
     result = results[0]
-
-    return SnubaTSResult(
-        {
-            "data": result["data"],
-            "meta": {
-                "fields": {
-                    value["name"]: get_json_meta_type(
-                        value["name"], value.get("type"), base_builder
-                    )
-                    for value in result["meta"]
-                }
-            },
+    data = {
+        "data": result["data"],
+        "meta": {
+            "fields": {
+                value["name"]: get_json_meta_type(value["name"], value.get("type"), base_builder)
+                for value in result["meta"]
+            }
         },
-        params["start"],
-        params["end"],
-        rollup,
-    )
+    }
+    if errors:
+        data["errors"] = errors
+
+    return SnubaTSResult(data, params["start"], params["end"], rollup)
 
 
 def create_result_key(result_row, fields, issues) -> str:
@@ -428,6 +497,7 @@ def top_events_timeseries(
         functions_acl=functions_acl,
         skip_tag_resolution=True,
     )
+    errors = []
     if len(top_events["data"]) == limit and include_other:
         other_events_builder = TopEventsQueryBuilder(
             Dataset.Discover,
@@ -440,10 +510,16 @@ def top_events_timeseries(
             timeseries_columns=timeseries_columns,
             equations=equations,
         )
-        result, other_result = bulk_snql_query(
+        result, other_result = bulk_snql_query_partial(
             [top_events_builder.get_snql_query(), other_events_builder.get_snql_query()],
             referrer=referrer,
         )
+        if result is None:
+            raise QueryExecutionTimeMaximum("The top events query timed out")
+        # The top events can be returned without the other series
+        if other_result is None:
+            errors.append(get_timeout_error(OTHER_KEY))
+            other_result = {"data": []}
     else:
         result = top_events_builder.run_query(referrer)
         other_result = {"data": []}
@@ -496,21 +572,24 @@ def top_events_timeseries(
                     extra={"result_key": result_key, "top_event_keys": list(results.keys())},
                 )
         for key, item in results.items():
-            results[key] = SnubaTSResult(
-                {
-                    "data": zerofill(item["data"], params["start"], params["end"], rollup, "time")
-                    if zerofill_results
-                    else item["data"],
-                    "order": item["order"],
-                },
-                params["start"],
-                params["end"],
-                rollup,
-            )
+            data = {
+                "data": zerofill(item["data"], params["start"], params["end"], rollup, "time")
+                if zerofill_results
+                else item["data"],
+                "order": item["order"],
+            }
+            if errors:
+                data["errors"] = errors
+            results[key] = SnubaTSResult(data, params["start"], params["end"], rollup)
 
     return results
 
 
+def get_timeout_error(query_name: str) -> Dict[str, str]:
+    """Annotates a partial result which is missing the results of a query that timed out."""
+    return {"query": query_name, "type": "timeout"}
+
+
 def get_id(result):
     if result:
         return result[1]
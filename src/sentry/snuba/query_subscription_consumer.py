@@ -1,6 +1,7 @@
 import logging
+from collections import defaultdict
 from random import random
-from typing import Callable, Dict, Mapping, cast
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple, cast
 
 import jsonschema
 import pytz
@@ -16,6 +17,7 @@ from arroyo.processing.strategies import (
     ProcessingStrategyFactory,
     RunTask,
 )
+from arroyo.processing.strategies.batching import BatchStep, ValuesBatch
 from arroyo.processing.strategies.decoder.base import ValidationError
 from arroyo.processing.strategies.decoder.json import JsonCodec
 from arroyo.types import BrokerValue, Commit, Message, Partition
@@ -39,8 +41,12 @@ logger = logging.getLogger(__name__)
 
 TQuerySubscriptionCallable = Callable[[PayloadV3, QuerySubscription], None]
 
+TQuerySubscriptionBatchCallable = Callable[[Sequence[Tuple[PayloadV3, QuerySubscription]]], None]
+
 subscriber_registry: Dict[str, TQuerySubscriptionCallable] = {}
 
+batch_subscriber_registry: Dict[str, TQuerySubscriptionBatchCallable] = {}
+
 topic_to_dataset: Dict[str, Dataset] = {
     settings.KAFKA_EVENTS_SUBSCRIPTIONS_RESULTS: Dataset.Events,
     settings.KAFKA_TRANSACTIONS_SUBSCRIPTIONS_RESULTS: Dataset.Transactions,
@@ -70,6 +76,23 @@ def register_subscriber(
     return inner
 
 
+def register_batch_subscriber(
+    subscriber_key: str,
+) -> Callable[[TQuerySubscriptionBatchCallable], TQuerySubscriptionBatchCallable]:
+    """
+    Registers a handler for batches of updates of a subscription type, which is used instead of
+    the handler registered with `register_subscriber` when the consumer runs in batches.
+    """
+
+    def inner(func: TQuerySubscriptionBatchCallable) -> TQuerySubscriptionBatchCallable:
+        if subscriber_key in batch_subscriber_registry:
+            raise Exception("Batch handler already registered for %s" % subscriber_key)
+        batch_subscriber_registry[subscriber_key] = func
+        return func
+
+    return inner
+
+
 def parse_message_value(value: bytes, jsoncodec: JsonCodec) -> PayloadV3:
     """
     Parses the value received via the Kafka consumer and verifies that it
@@ -133,79 +156,29 @@ def handle_message(
     :return:
     """
     with sentry_sdk.push_scope() as scope:
-        try:
-            with metrics.timer(
-                "snuba_query_subscriber.parse_message_value", tags={"dataset": dataset}
-            ):
-                contents = parse_message_value(message_value, jsoncodec)
-        except InvalidMessageError:
-            # If the message is in an invalid format, just log the error
-            # and continue
-            logger.exception(
-                "Subscription update could not be parsed",
-                extra={
-                    "offset": message_offset,
-                    "partition": message_partition,
-                    "value": message_value,
-                },
-            )
+        contents = _parse_message(
+            message_value, message_offset, message_partition, dataset, jsoncodec
+        )
+        if contents is None:
             return
         scope.set_tag("query_subscription_id", contents["subscription_id"])
 
+        subscription: Optional[QuerySubscription]
         try:
             with metrics.timer(
                 "snuba_query_subscriber.fetch_subscription", tags={"dataset": dataset}
             ):
-                subscription: QuerySubscription = QuerySubscription.objects.get_from_cache(
+                subscription = QuerySubscription.objects.get_from_cache(
                     subscription_id=contents["subscription_id"]
                 )
-                if subscription.status != QuerySubscription.Status.ACTIVE.value:
-                    metrics.incr("snuba_query_subscriber.subscription_inactive")
-                    return
         except QuerySubscription.DoesNotExist:
-            metrics.incr(
-                "snuba_query_subscriber.subscription_doesnt_exist", tags={"dataset": dataset}
-            )
-            logger.warning(
-                "Received subscription update, but subscription does not exist",
-                extra={
-                    "offset": message_offset,
-                    "partition": message_partition,
-                    "value": message_value,
-                },
-            )
-            try:
-                if topic in topic_to_dataset:
-                    _delete_from_snuba(
-                        topic_to_dataset[topic],
-                        contents["subscription_id"],
-                        EntityKey(contents["entity"]),
-                    )
-                else:
-                    logger.error(
-                        "Topic not registered with QuerySubscriptionConsumer, can't remove "
-                        "non-existent subscription from Snuba",
-                        extra={"topic": topic, "subscription_id": contents["subscription_id"]},
-                    )
-            except InvalidMessageError as e:
-                logger.exception(e)
-            except Exception:
-                logger.exception("Failed to delete unused subscription from snuba.")
-            return
+            subscription = None
 
-        if subscription.type not in subscriber_registry:
-            metrics.incr(
-                "snuba_query_subscriber.subscription_type_not_registered", tags={"dataset": dataset}
-            )
-            logger.error(
-                "Received subscription update, but no subscription handler registered",
-                extra={
-                    "offset": message_offset,
-                    "partition": message_partition,
-                    "value": message_value,
-                },
-            )
+        if not _check_subscription(
+            subscription, contents, message_value, message_offset, message_partition, topic, dataset
+        ):
             return
+        assert subscription is not None
 
         sentry_sdk.set_tag("project_id", subscription.project_id)
         sentry_sdk.set_tag("query_subscription_id", contents["subscription_id"])
@@ -229,6 +202,159 @@ def handle_message(
             callback(contents, subscription)
 
 
+def handle_messages(
+    messages: Sequence[Tuple[bytes, int, int]],
+    topic: str,
+    dataset: str,
+    jsoncodec: JsonCodec,
+) -> None:
+    """
+    Handles a batch of messages, each given as a tuple of its value, offset and partition.
+
+    Subscriptions of the whole batch are fetched at once. Updates are then passed to the batch
+    callback of their subscription type if one is registered, or to its callback one by one
+    otherwise. Updates keep their order within each subscription type.
+    """
+    parsed = []
+    for message_value, message_offset, message_partition in messages:
+        contents = _parse_message(
+            message_value, message_offset, message_partition, dataset, jsoncodec
+        )
+        if contents is not None:
+            parsed.append((contents, message_value, message_offset, message_partition))
+
+    with metrics.timer("snuba_query_subscriber.fetch_subscriptions", tags={"dataset": dataset}):
+        subscriptions = {
+            subscription.subscription_id: subscription
+            for subscription in QuerySubscription.objects.get_many_from_cache(
+                list({contents["subscription_id"] for contents, *_ in parsed}),
+                key="subscription_id",
+            )
+        }
+
+    updates_by_type: Dict[str, List[Tuple[PayloadV3, QuerySubscription]]] = defaultdict(list)
+    for contents, message_value, message_offset, message_partition in parsed:
+        subscription = subscriptions.get(contents["subscription_id"])
+        if _check_subscription(
+            subscription, contents, message_value, message_offset, message_partition, topic, dataset
+        ):
+            assert subscription is not None
+            updates_by_type[subscription.type].append((contents, subscription))
+
+    for subscription_type, updates in updates_by_type.items():
+        with metrics.timer(
+            "snuba_query_subscriber.callback.duration",
+            instance=subscription_type,
+            tags={"dataset": dataset, "batch": subscription_type in batch_subscriber_registry},
+        ):
+            if subscription_type in batch_subscriber_registry:
+                try:
+                    batch_subscriber_registry[subscription_type](updates)
+                except Exception:
+                    logger.exception(
+                        "Unexpected error while handling subscription updates. Skipping batch.",
+                        extra={"subscription_type": subscription_type, "count": len(updates)},
+                    )
+                continue
+
+            callback = subscriber_registry[subscription_type]
+            for contents, subscription in updates:
+                try:
+                    callback(contents, subscription)
+                except Exception:
+                    logger.exception(
+                        "Unexpected error while handling subscription update. Skipping update.",
+                        extra={"subscription_id": contents["subscription_id"]},
+                    )
+
+
+def _parse_message(
+    message_value: bytes,
+    message_offset: int,
+    message_partition: int,
+    dataset: str,
+    jsoncodec: JsonCodec,
+) -> Optional[PayloadV3]:
+    try:
+        with metrics.timer("snuba_query_subscriber.parse_message_value", tags={"dataset": dataset}):
+            return parse_message_value(message_value, jsoncodec)
+    except InvalidMessageError:
+        # If the message is in an invalid format, just log the error
+        # and continue
+        logger.exception(
+            "Subscription update could not be parsed",
+            extra={
+                "offset": message_offset,
+                "partition": message_partition,
+                "value": message_value,
+            },
+        )
+        return None
+
+
+def _check_subscription(
+    subscription: Optional[QuerySubscription],
+    contents: PayloadV3,
+    message_value: bytes,
+    message_offset: int,
+    message_partition: int,
+    topic: str,
+    dataset: str,
+) -> bool:
+    """
+    Returns whether an update can be passed to the callback of its subscription. Subscriptions
+    that no longer exist are removed from Snuba.
+    """
+    if subscription is None:
+        metrics.incr("snuba_query_subscriber.subscription_doesnt_exist", tags={"dataset": dataset})
+        logger.warning(
+            "Received subscription update, but subscription does not exist",
+            extra={
+                "offset": message_offset,
+                "partition": message_partition,
+                "value": message_value,
+            },
+        )
+        try:
+            if topic in topic_to_dataset:
+                _delete_from_snuba(
+                    topic_to_dataset[topic],
+                    contents["subscription_id"],
+                    EntityKey(contents["entity"]),
+                )
+            else:
+                logger.error(
+                    "Topic not registered with QuerySubscriptionConsumer, can't remove "
+                    "non-existent subscription from Snuba",
+                    extra={"topic": topic, "subscription_id": contents["subscription_id"]},
+                )
+        except InvalidMessageError as e:
+            logger.exception(e)
+        except Exception:
+            logger.exception("Failed to delete unused subscription from snuba.")
+        return False
+
+    if subscription.status != QuerySubscription.Status.ACTIVE.value:
+        metrics.incr("snuba_query_subscriber.subscription_inactive")
+        return False
+
+    if subscription.type not in subscriber_registry:
+        metrics.incr(
+            "snuba_query_subscriber.subscription_type_not_registered", tags={"dataset": dataset}
+        )
+        logger.error(
+            "Received subscription update, but no subscription handler registered",
+            extra={
+                "offset": message_offset,
+                "partition": message_partition,
+                "value": message_value,
+            },
+        )
+        return False
+
+    return True
+
+
 class InvalidMessageError(Exception):
     pass
 
@@ -238,8 +364,23 @@ class InvalidSchemaError(InvalidMessageError):
 
 
 class QuerySubscriptionStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
-    def __init__(self, topic: str):
+    """
+    Handles subscription updates.
+
+    If "max_batch_size" is set, messages are batched and handled together, see
+    "handle_messages". Otherwise every message is handled on its own.
+    """
+
+    def __init__(
+        self,
+        topic: str,
+        max_batch_size: Optional[int] = None,
+        max_batch_time: Optional[int] = None,
+    ):
         self.topic = topic
+        self.max_batch_size = max_batch_size
+        # The batch time is configured in milliseconds.
+        self.max_batch_time = (max_batch_time or 1000) / 1000
         self.dataset = topic_to_dataset[self.topic]
         self.logical_topic = dataset_to_logical_topic[self.dataset]
         self.jsoncodec = JsonCodec(get_schema(self.logical_topic)["schema"])
@@ -284,7 +425,38 @@ class QuerySubscriptionStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
                         },
                     )
 
-        return RunTask(process_message, CommitOffsets(commit))
+        def process_batch(message: Message[ValuesBatch[KafkaPayload]]) -> None:
+            with sentry_sdk.start_transaction(
+                op="handle_messages",
+                name="query_subscription_consumer_process_batch",
+                sampled=random() <= options.get("subscriptions-query.sample-rate"),
+            ), metrics.timer(
+                "snuba_query_subscriber.handle_messages", tags={"dataset": self.dataset.value}
+            ):
+                messages = [
+                    (value.payload.value, value.offset, value.partition.index)
+                    for value in message.payload
+                ]
+                try:
+                    handle_messages(messages, self.topic, self.dataset.value, self.jsoncodec)
+                except Exception:
+                    # Same failsafe as for single messages, see above.
+                    logger.exception(
+                        "Unexpected error while handling messages in QuerySubscriptionStrategy. Skipping batch.",
+                        extra={
+                            "count": len(messages),
+                            "offsets": [offset for _, offset, _ in messages],
+                        },
+                    )
+
+        if not self.max_batch_size:
+            return RunTask(process_message, CommitOffsets(commit))
+
+        return BatchStep(
+            max_batch_size=self.max_batch_size,
+            max_batch_time=self.max_batch_time,
+            next_step=RunTask(process_batch, CommitOffsets(commit)),
+        )
 
 
 def get_query_subscription_consumer(
@@ -292,6 +464,8 @@ def get_query_subscription_consumer(
     group_id: str,
     strict_offset_reset: bool,
     initial_offset_reset: str,
+    max_batch_size: Optional[int] = None,
+    max_batch_time: Optional[int] = None,
 ) -> StreamProcessor[KafkaPayload]:
     cluster_name = settings.KAFKA_TOPICS[topic]["cluster"]
     cluster_options = kafka_config.get_kafka_consumer_cluster_options(cluster_name)
@@ -308,6 +482,8 @@ def get_query_subscription_consumer(
     return StreamProcessor(
         consumer=consumer,
         topic=Topic(topic),
-        processor_factory=QuerySubscriptionStrategyFactory(topic),
+        processor_factory=QuerySubscriptionStrategyFactory(
+            topic, max_batch_size=max_batch_size, max_batch_time=max_batch_time
+        ),
         commit_policy=ONCE_PER_SECOND,
     )
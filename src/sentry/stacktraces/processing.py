@@ -1,13 +1,17 @@
 import logging
 from collections import namedtuple
+from copy import deepcopy
 from datetime import datetime
 
 import sentry_sdk
 from django.utils import timezone
 
+from sentry import options
 from sentry.models import Project, Release
 from sentry.stacktraces.functions import set_in_app, trim_function_name
+from sentry.utils import metrics
 from sentry.utils.cache import cache
+from sentry.utils.datastructures import LRUCache
 from sentry.utils.hashlib import hash_values
 from sentry.utils.safe import get_path, safe_execute
 
@@ -20,6 +24,12 @@ StacktraceInfo.__hash__ = lambda x: id(x)
 StacktraceInfo.__eq__ = lambda a, b: a is b
 StacktraceInfo.__ne__ = lambda a, b: a is not b
 
+# Process-wide cache of the results of `StacktraceProcessor.process_frame`,
+# keyed by the memoization key the processor declared for a frame.
+frame_memoization_cache = LRUCache(
+    max_size=lambda: options.get("processing.frame-memoization-cache-size")
+)
+
 
 class ProcessableFrame:
     def __init__(self, frame, idx, processor, stacktrace_info, processable_frames):
@@ -147,6 +157,19 @@ class StacktraceProcessor:
         """Processes an exception."""
         return False
 
+    def get_frame_memoization_key(self, processable_frame):
+        """Returns a list of values which, together with the processor,
+        fully determine the result of `process_frame` for this frame, or
+        `None` if the result must not be memoized.  This is invoked after
+        the preprocessing step.
+
+        Results of frames with the same key are shared across events by
+        the worker, so the key must cover every input `process_frame` reads
+        and `process_frame` must not have side effects on the processor or
+        the event.
+        """
+        return None
+
     def process_frame(self, processable_frame, processing_task):
         """Processes the processable frame and returns a tuple of three
         lists: ``(frames, raw_frames, errors)`` where frames is the list of
@@ -351,6 +374,50 @@ def get_processable_frames(stacktrace_info, processors):
     return rv
 
 
+def get_frame_memoization_key(processable_frame):
+    processor = processable_frame.processor
+    values = processor.get_frame_memoization_key(processable_frame)
+    if values is None:
+        return None
+
+    try:
+        return hash_values(values, seed=processor.__class__.__name__)
+    except TypeError:
+        # Values that cannot be hashed deterministically, such as floats,
+        # are never memoized.
+        return None
+
+
+def process_frame_memoized(processable_frame, processing_task):
+    """Invokes `process_frame` of the frame's processor, serving the result
+    from the process-wide memoization cache if the processor declared a key
+    for this frame.
+    """
+    processor = processable_frame.processor
+    if not frame_memoization_cache.max_size:
+        return processor.process_frame(processable_frame, processing_task)
+
+    key = get_frame_memoization_key(processable_frame)
+    if key is None:
+        return processor.process_frame(processable_frame, processing_task)
+
+    # Results are copied both in and out of the cache, since later processing
+    # steps modify the returned frames in place.
+    rv = frame_memoization_cache.get(key)
+    metrics.incr(
+        "stacktraces.processing.frame_memoization",
+        tags={"processor": processor.__class__.__name__, "hit": rv is not None},
+    )
+    if rv is not None:
+        return deepcopy(rv)
+
+    rv = processor.process_frame(processable_frame, processing_task)
+    # `None` is a valid result, which is stored as an empty tuple to tell it
+    # apart from a miss.
+    frame_memoization_cache.set(key, deepcopy(rv) if rv is not None else ())
+    return rv
+
+
 def process_single_stacktrace(processing_task, stacktrace_info, processable_frames):
     # TODO: associate errors with the frames and processing issues
     changed_raw = False
@@ -371,7 +438,7 @@ def process_single_stacktrace(processing_task, stacktrace_info, processable_fram
             processable_frame = processable_frames[idx]
             assert processable_frame.frame is bare_frame
             try:
-                rv = processable_frame.processor.process_frame(processable_frame, processing_task)
+                rv = process_frame_memoized(processable_frame, processing_task)
             except Exception:
                 logger.exception("Failed to process frame")
 
@@ -5,12 +5,14 @@ from collections import defaultdict
 from collections.abc import Iterable
 from typing import Any, Dict, Optional, Sequence
 
+import sentry_sdk
 from dateutil.parser import parse as parse_datetime
 from django.core.cache import cache
 from pytz import UTC
 from sentry_relay.consts import SPAN_STATUS_CODE_TO_NAME
 from snuba_sdk import Column, Condition, Direction, Entity, Function, Op, OrderBy, Query, Request
 
+from sentry import options
 from sentry.api.utils import default_start_end_dates
 from sentry.issues.grouptype import GroupCategory
 from sentry.issues.query import apply_performance_conditions
@@ -36,6 +38,7 @@ from sentry.search.events.fields import FIELD_ALIASES
 from sentry.search.events.filter import _flip_field_sort
 from sentry.snuba.dataset import Dataset
 from sentry.tagstore import TagKeyStatus
+from sentry.tagstore import summaries as tagstore_summaries
 from sentry.tagstore.base import TOP_VALUES_DEFAULT_LIMIT, TagStorage
 from sentry.tagstore.exceptions import (
     GroupTagKeyNotFound,
@@ -146,6 +149,27 @@ class SnubaTagStorage(TagStorage):
         tenant_ids=None,
         **kwargs,
     ):
+        if group is None:
+            key_ctor = TagKey
+            value_ctor = TagValue
+        else:
+            key_ctor = functools.partial(GroupTagKey, group_id=group.id)
+            value_ctor = functools.partial(GroupTagValue, group_id=group.id)
+
+        summary = self.__get_tag_key_and_top_values_from_summaries(
+            project_id, group, environment_id, key, limit, **kwargs
+        )
+        if summary is not None:
+            count, values_seen, top_values = summary
+            if raise_on_empty and count == 0:
+                raise TagKeyNotFound if group is None else GroupTagKeyNotFound
+            return key_ctor(
+                key=key,
+                values_seen=values_seen,
+                count=count,
+                top_values=[value_ctor(key=key, **top_value._asdict()) for top_value in top_values],
+            )
+
         tag = f"tags[{key}]"
         filters = {"project_id": get_project_list(project_id)}
         if environment_id:
@@ -182,13 +206,6 @@ class SnubaTagStorage(TagStorage):
         if raise_on_empty and (not result or totals.get("count", 0) == 0):
             raise TagKeyNotFound if group is None else GroupTagKeyNotFound
         else:
-            if group is None:
-                key_ctor = TagKey
-                value_ctor = TagValue
-            else:
-                key_ctor = functools.partial(GroupTagKey, group_id=group.id)
-                value_ctor = functools.partial(GroupTagValue, group_id=group.id)
-
             top_values = [
                 value_ctor(
                     key=key,
@@ -207,6 +224,55 @@ class SnubaTagStorage(TagStorage):
                 top_values=top_values,
             )
 
+    def __get_summary_days(
+        self,
+        project_id,
+        group,
+        start=None,
+        end=None,
+        dataset=Dataset.Events,
+        conditions=None,
+        aggregations=None,
+        **kwargs,
+    ):
+        """
+        Returns the days of the materialized tag summaries answering a query, or ``None`` if Snuba needs to be
+        queried. Only plain queries of a single project or error group can be answered, see
+        ``sentry.tagstore.summaries``.
+        """
+        if kwargs or conditions or aggregations or dataset != Dataset.Events:
+            return None
+        if not isinstance(project_id, int):
+            return None
+
+        try:
+            return tagstore_summaries.get_days(project_id, group, start, end)
+        except Exception:
+            sentry_sdk.capture_exception()
+            return None
+
+    def __get_tag_key_and_top_values_from_summaries(
+        self, project_id, group, environment_id, key, limit, **kwargs
+    ):
+        if limit is None or limit > options.get("tagstore.summaries.top-values"):
+            return None
+
+        days = self.__get_summary_days(project_id, group, **kwargs)
+        if days is None:
+            return None
+
+        group_id = group.id if group is not None else None
+        environment_ids = environment_id and [environment_id]
+        with sentry_sdk.start_span(op="tagstore.summaries", description="get_tag_key"):
+            count, values_seen = tagstore_summaries.get_tag_keys(
+                project_id, group_id, environment_ids, days, keys=[key]
+            ).get(key, (0, 0))
+            top_values = tagstore_summaries.get_top_values(
+                project_id, group_id, environment_ids, days, [key], limit
+            )[key]
+
+        return count, values_seen, top_values
+
     def __get_tag_keys(
         self,
         project_id,
@@ -220,6 +286,28 @@ class SnubaTagStorage(TagStorage):
         tenant_ids=None,
         **kwargs,
     ):
+        if not include_transactions:
+            days = self.__get_summary_days(project_id, group, **kwargs)
+            if days is not None:
+                with sentry_sdk.start_span(op="tagstore.summaries", description="get_tag_keys"):
+                    summary = tagstore_summaries.get_tag_keys(
+                        project_id,
+                        group.id if group is not None else None,
+                        environment_ids,
+                        days,
+                        keys=keys,
+                        include_values_seen=include_values_seen,
+                    )
+                result = {
+                    key: {"count": count, "values_seen": values_seen}
+                    if include_values_seen
+                    else count
+                    for key, (count, values_seen) in sorted(
+                        summary.items(), key=lambda item: -item[1][0]
+                    )[:limit]
+                }
+                return self.__format_tag_keys(result, group, include_values_seen, denylist)
+
         return self.__get_tag_keys_for_projects(
             get_project_list(project_id),
             group,
@@ -332,6 +420,9 @@ class SnubaTagStorage(TagStorage):
                 cache.set(cache_key, result, 300)
                 metrics.incr("testing.tagstore.cache_tag_key.len", amount=len(result))
 
+        return self.__format_tag_keys(result, group, include_values_seen, denylist)
+
+    def __format_tag_keys(self, result, group, include_values_seen, denylist):
         if group is None:
             ctor = TagKey
         else:
@@ -737,6 +828,36 @@ class SnubaTagStorage(TagStorage):
         # of top values for each key, so the total rows returned should be
         # num_keys * limit.
 
+        if value_limit <= options.get("tagstore.summaries.top-values"):
+            days = self.__get_summary_days(group.project_id, group, **kwargs)
+            if days is not None:
+                with sentry_sdk.start_span(
+                    op="tagstore.summaries", description="get_group_tag_keys_and_top_values"
+                ):
+                    counts = tagstore_summaries.get_tag_keys(
+                        group.project_id,
+                        group.id,
+                        environment_ids,
+                        days,
+                        keys=keys,
+                        include_values_seen=False,
+                    )
+                    top_values = tagstore_summaries.get_top_values(
+                        group.project_id, group.id, environment_ids, days, list(counts), value_limit
+                    )
+                return {
+                    GroupTagKey(
+                        group_id=group.id,
+                        key=key,
+                        count=count,
+                        top_values=[
+                            GroupTagValue(group_id=group.id, key=key, **top_value._asdict())
+                            for top_value in top_values[key]
+                        ],
+                    )
+                    for key, (count, _) in counts.items()
+                }
+
         # First get totals and unique counts by key.
         keys_with_counts = self.get_group_tag_keys(
             group, environment_ids, keys=keys, tenant_ids=tenant_ids
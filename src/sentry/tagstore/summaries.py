@@ -0,0 +1,352 @@
+"""
+Materialized summaries of the tag keys and values of error events.
+
+Issue details pages and the tags pages run several tagstore queries each, all of which aggregate the tags of every
+event of a project or group in Snuba. To answer the common ones without Snuba, the tags of every error event are
+additionally recorded in Redis from post-processing, in buckets per scope (the project and the group of the event),
+environment (including a bucket across all environments) and day. Each bucket holds per tag key the number of events,
+a HyperLogLog of its values and the most frequent values with their first and last occurrence, see
+``scripts/tagstore/summaries.lua``.
+
+Summaries can only answer a query if they contain every event of the requested window, which is determined as follows:
+
+- Projects remember since when their events are summarized. This resets when no event has been summarized for
+  ``COVERAGE_TIMEOUT``, which ensures that disabling the writer or a failed write does not leave gaps behind.
+- A scope is fully summarized if its first event is not older than that. Otherwise, the requested window has to start
+  on a day boundary after it. Windows without a start cover the retention period of the organization, whose edge
+  is not exact in Snuba either. Windows starting before it are not answered.
+- Groups whose events were moved by merge, unmerge or reprocessing are marked as stale and never answered.
+- Deleting or discarding groups removes their events from the summaries of the project, which therefore start over.
+
+Events are recorded once, even if post-processing is retried within ``DEDUPE_TTL``.
+
+Counts are exact and distinct values are estimated. Top values are approximate, since values which were evicted from
+a bucket lose their count once they reappear.
+"""
+
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Collection, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from django.conf import settings
+from django.utils import timezone
+from pytz import UTC
+
+from sentry import options, quotas
+from sentry.api.utils import MAX_STATS_PERIOD
+from sentry.eventstore.models import Event, GroupEvent
+from sentry.issues.grouptype import GroupCategory
+from sentry.models import Environment, Group, Organization, Project
+from sentry.utils import metrics, redis
+from sentry.utils.dates import to_timestamp
+
+__all__ = [
+    "TopValue",
+    "record_event",
+    "mark_groups_stale",
+    "reset_projects",
+    "get_days",
+    "get_tag_keys",
+    "get_top_values",
+]
+
+DAY = 24 * 60 * 60
+
+#: Time after which a project without summarized events needs to start over.
+COVERAGE_TIMEOUT = DAY
+
+#: Buckets are retained a bit longer than the retention period to cover the default window.
+BUCKET_TTL = (MAX_STATS_PERIOD.days + 2) * DAY
+
+#: Time during which an event that was already recorded is skipped, which covers retries of post-processing.
+DEDUPE_TTL = 60 * 60
+
+#: Windows ending this close to the current time are treated as if they were open ended.
+END_TOLERANCE = timedelta(minutes=1)
+
+record_tags = redis.load_script("tagstore/summaries.lua")
+count_values = redis.load_script("tagstore/summaries_count.lua")
+
+
+class TopValue(NamedTuple):
+    value: str
+    times_seen: int
+    first_seen: datetime
+    last_seen: datetime
+
+
+def get_redis_client():
+    return redis.redis_clusters.get(settings.SENTRY_TAGSTORE_SUMMARIES_REDIS_CLUSTER)
+
+
+def _get_scope(project_id: int, group_id: Optional[int]) -> str:
+    # The scope is used as a hash tag, so that all buckets of a scope can be read at once.
+    return f"{{p:{project_id}}}" if group_id is None else f"{{g:{group_id}}}"
+
+
+def _get_bucket_key(scope: str, environment_id: Optional[int], day: int) -> str:
+    return f"tagsum:{scope}:{environment_id or 0}:{day}"
+
+
+def _get_coverage_key(project_id: int) -> str:
+    return f"tagsum:{_get_scope(project_id, None)}:since"
+
+
+def _get_stale_key(group_id: int) -> str:
+    return f"tagsum:{_get_scope(0, group_id)}:stale"
+
+
+def _get_dedupe_key(project_id: int, event_id: str) -> str:
+    return f"tagsum:{_get_scope(project_id, None)}:e:{event_id}"
+
+
+def _get_bucket_keys(
+    project_id: int,
+    group_id: Optional[int],
+    environment_ids: Optional[Sequence[int]],
+    days: Sequence[int],
+) -> List[str]:
+    scope = _get_scope(project_id, group_id)
+    return [
+        _get_bucket_key(scope, environment_id, day)
+        for environment_id in (environment_ids or [None])
+        for day in days
+    ]
+
+
+def record_event(event: Union[Event, GroupEvent]) -> None:
+    """Records the tags of an error event in the summaries of its project and group."""
+    if not options.get("tagstore.summaries.write-enabled"):
+        return
+
+    tags = [(key, value) for key, value in event.tags if value]
+    if not tags:
+        return
+
+    environment = Environment.get_for_organization_id(
+        event.project.organization_id,
+        Environment.get_name_or_default(event.get_tag("environment")),
+    )
+    timestamp = int(to_timestamp(event.datetime))
+    day = timestamp // DAY
+    args = [timestamp, options.get("tagstore.summaries.top-values"), BUCKET_TTL]
+    for key, value in tags:
+        args.extend([key, value])
+
+    client = get_redis_client()
+    if not client.set(_get_dedupe_key(event.project_id, event.event_id), 1, ex=DEDUPE_TTL, nx=True):
+        metrics.incr("tagstore.summaries.duplicate_event")
+        return
+
+    coverage_key = _get_coverage_key(event.project_id)
+    try:
+        client.set(coverage_key, int(to_timestamp(timezone.now())), ex=COVERAGE_TIMEOUT, nx=True)
+        client.expire(coverage_key, COVERAGE_TIMEOUT)
+
+        for scope in (
+            _get_scope(event.project_id, None),
+            _get_scope(event.project_id, event.group_id),
+        ):
+            for environment_id in (None, environment.id):
+                bucket_key = _get_bucket_key(scope, environment_id, day)
+                keys = [f"{bucket_key}:k"]
+                for key, _ in tags:
+                    keys.extend(
+                        [f"{bucket_key}:u:{key}", f"{bucket_key}:v:{key}", f"{bucket_key}:s:{key}"]
+                    )
+                record_tags(client, keys, args)
+    except Exception:
+        # The summaries of this project are incomplete now and must not be used anymore.
+        client.delete(coverage_key)
+        raise
+
+
+def mark_groups_stale(group_ids: Sequence[int]) -> None:
+    """Stops using the summaries of groups whose events are moved to or from other groups."""
+    client = get_redis_client()
+    for group_id in group_ids:
+        client.set(_get_stale_key(group_id), 1, ex=BUCKET_TTL)
+
+
+def reset_projects(project_ids: Collection[int]) -> None:
+    """Stops using the summaries of projects whose events were deleted, until summarizing starts over."""
+    if not project_ids:
+        return
+
+    get_redis_client().delete(*(_get_coverage_key(project_id) for project_id in project_ids))
+
+
+def _to_day(value: datetime) -> int:
+    return int(to_timestamp(value)) // DAY
+
+
+def _is_aligned(value: datetime) -> bool:
+    return int(to_timestamp(value)) % DAY == 0
+
+
+def get_days(
+    project_id: int,
+    group: Optional[Group],
+    start: Optional[datetime],
+    end: Optional[datetime],
+) -> Optional[List[int]]:
+    """
+    Returns the buckets which answer a query of the given window, or ``None`` if summaries can not answer it and
+    Snuba needs to be queried instead.
+    """
+    if not options.get("tagstore.summaries.read-enabled"):
+        return None
+
+    project = Project.objects.get_from_cache(id=project_id)
+    if group is None:
+        first_seen = project.first_event
+    elif group.issue_category == GroupCategory.ERROR:
+        first_seen = group.first_seen
+    else:
+        return None
+
+    if first_seen is None:
+        return None
+
+    now = timezone.now()
+    retention_start = now - MAX_STATS_PERIOD
+    retention = quotas.get_event_retention(
+        organization=Organization.objects.get_from_cache(id=project.organization_id)
+    )
+    if retention:
+        retention_start = max(retention_start, now - timedelta(days=retention))
+    if start is None:
+        start = retention_start
+    elif start < retention_start or (start > first_seen and not _is_aligned(start)):
+        return None
+
+    if end is None or end >= now - END_TOLERANCE:
+        last_day = _to_day(now)
+    elif _is_aligned(end):
+        last_day = _to_day(end) - 1
+    else:
+        return None
+
+    start = max(start, first_seen)
+
+    client = get_redis_client()
+    with client.pipeline(transaction=False) as pipe:
+        pipe.get(_get_coverage_key(project_id))
+        if group is not None:
+            pipe.exists(_get_stale_key(group.id))
+        covered_since, *stale = pipe.execute()
+
+    covered = (
+        covered_since is not None and int(covered_since) <= to_timestamp(start) and not any(stale)
+    )
+    metrics.incr(
+        "tagstore.summaries.covered", tags={"covered": covered, "group": group is not None}
+    )
+    if not covered:
+        return None
+
+    return list(range(_to_day(start), last_day + 1))
+
+
+def get_tag_keys(
+    project_id: int,
+    group_id: Optional[int],
+    environment_ids: Optional[Sequence[int]],
+    days: Sequence[int],
+    keys: Optional[Sequence[str]] = None,
+    include_values_seen: bool = True,
+) -> Dict[str, Tuple[int, Optional[int]]]:
+    """
+    Returns the number of events and the estimated number of distinct values of the given tag keys, or of all tag
+    keys if none are given. Tag keys without events are omitted.
+    """
+    bucket_keys = _get_bucket_keys(project_id, group_id, environment_ids, days)
+    if not bucket_keys or keys == []:
+        return {}
+
+    client = get_redis_client()
+    with client.pipeline(transaction=False) as pipe:
+        for bucket_key in bucket_keys:
+            if keys is None:
+                pipe.hgetall(f"{bucket_key}:k")
+            else:
+                pipe.hmget(f"{bucket_key}:k", keys)
+        counts: Dict[str, int] = defaultdict(int)
+        for key_counts in pipe.execute():
+            if keys is not None:
+                key_counts = dict(zip(keys, key_counts))
+            for key, count in key_counts.items():
+                if count is not None:
+                    counts[key] += int(count)
+
+    if not include_values_seen or not counts:
+        return {key: (count, None) for key, count in counts.items()}
+
+    keys = list(counts)
+    values_seen = count_values(
+        client,
+        [f"{bucket_key}:u:{key}" for key in keys for bucket_key in bucket_keys],
+        [len(bucket_keys)],
+    )
+    return {key: (counts[key], int(seen)) for key, seen in zip(keys, values_seen)}
+
+
+def get_top_values(
+    project_id: int,
+    group_id: Optional[int],
+    environment_ids: Optional[Sequence[int]],
+    days: Sequence[int],
+    keys: Sequence[str],
+    limit: int,
+) -> Dict[str, List[TopValue]]:
+    """Returns the most frequent values of each of the given tag keys, ordered by frequency."""
+    bucket_keys = _get_bucket_keys(project_id, group_id, environment_ids, days)
+    if not bucket_keys or not keys:
+        return {key: [] for key in keys}
+
+    client = get_redis_client()
+    with client.pipeline(transaction=False) as pipe:
+        for key in keys:
+            for bucket_key in bucket_keys:
+                pipe.zrange(f"{bucket_key}:v:{key}", 0, -1, withscores=True)
+        results = iter(pipe.execute())
+
+    top_values: Dict[str, List[Tuple[str, int]]] = {}
+    for key in keys:
+        counts: Dict[str, int] = defaultdict(int)
+        for _ in bucket_keys:
+            for value, count in next(results):
+                counts[value] += int(count)
+        top_values[key] = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+    with client.pipeline(transaction=False) as pipe:
+        for key, values in top_values.items():
+            for bucket_key in bucket_keys:
+                if values:
+                    pipe.hmget(f"{bucket_key}:s:{key}", [value for value, _ in values])
+        results = iter(pipe.execute())
+
+    rv: Dict[str, List[TopValue]] = {}
+    for key, values in top_values.items():
+        first_seen = [math.inf] * len(values)
+        last_seen = [-math.inf] * len(values)
+        for _ in bucket_keys if values else ():
+            for i, seen in enumerate(next(results)):
+                if seen is not None:
+                    first, last = seen.split(":")
+                    first_seen[i] = min(first_seen[i], int(first))
+                    last_seen[i] = max(last_seen[i], int(last))
+
+        rv[key] = [
+            TopValue(
+                value=value,
+                times_seen=count,
+                first_seen=datetime.fromtimestamp(first_seen[i], UTC),
+                last_seen=datetime.fromtimestamp(last_seen[i], UTC),
+            )
+            for i, (value, count) in enumerate(values)
+            if last_seen[i] != -math.inf
+        ]
+
+    return rv
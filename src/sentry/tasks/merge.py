@@ -29,6 +29,7 @@ def merge_groups(
     **kwargs,
 ):
     # TODO(mattrobenolt): Write tests for all of this
+    from sentry.grouping import grouphash_cache
     from sentry.models import (
         Activity,
         Environment,
@@ -44,6 +45,7 @@ def merge_groups(
         UserReport,
         get_group_with_redirect,
     )
+    from sentry.tagstore import summaries as tagstore_summaries
 
     if not (from_object_ids and to_object_id):
         logger.error("group.malformed.missing_params", extra={"transaction_id": transaction_id})
@@ -100,6 +102,10 @@ def merge_groups(
             GroupMeta,
         )
 
+        # The hashes are about to be moved to the new group.
+        grouphash_cache.invalidate_groups([group.id])
+        tagstore_summaries.mark_groups_stale([new_group.id])
+
         has_more = merge_objects(
             model_list, group, new_group, logger=logger, transaction_id=transaction_id
         )
@@ -945,6 +945,19 @@ def process_similarity(job: PostProcessJob) -> None:
             safe_execute(similarity.record, event.project, [event], _with_transaction=False)
 
 
+def process_tag_summaries(job: PostProcessJob) -> None:
+    # The new group of reprocessed events is marked as stale by ``start_group_reprocessing``.
+    if job["is_reprocessed"]:
+        return
+
+    from sentry.tagstore import summaries
+
+    event = job["event"]
+
+    with metrics.timer("post_process.process_tag_summaries.duration"):
+        safe_execute(summaries.record_event, event, _with_transaction=False)
+
+
 def fire_error_processed(job: PostProcessJob):
     if job["is_reprocessed"]:
         return
@@ -991,6 +1004,7 @@ GROUP_CATEGORY_POST_PROCESS_PIPELINE = {
         process_plugins,
         process_code_mappings,
         process_similarity,
+        process_tag_summaries,
         update_existing_attachments,
         fire_error_processed,
     ],
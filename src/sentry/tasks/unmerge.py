@@ -8,6 +8,7 @@ from django.db import transaction
 from sentry import eventstore, similarity, tsdb
 from sentry.constants import DEFAULT_LOGGER_NAME, LOG_LEVELS_MAP
 from sentry.event_manager import generate_culprit
+from sentry.grouping import grouphash_cache
 from sentry.models import (
     Activity,
     Environment,
@@ -21,6 +22,7 @@ from sentry.models import (
     Release,
     UserReport,
 )
+from sentry.tagstore import summaries as tagstore_summaries
 from sentry.tasks.base import instrumented_task
 from sentry.types.activity import ActivityType
 from sentry.unmerge import InitialUnmergeArgs, SuccessiveUnmergeArgs, UnmergeArgs, UnmergeArgsBase
@@ -209,6 +211,7 @@ def migrate_events(
         )
 
         args.replacement.run_postgres_replacement(project, destination_id, locked_primary_hashes)
+        tagstore_summaries.mark_groups_stale([args.source_id, destination_id])
 
         # Create activity records for the source and destination group.
         Activity.objects.create(
@@ -450,7 +453,9 @@ def lock_hashes(project_id, source_id, fingerprints):
             state=GroupHash.State.LOCKED_IN_MIGRATION
         )
 
-    return [h.hash for h in eligible_hashes]
+    locked_primary_hashes = [h.hash for h in eligible_hashes]
+    grouphash_cache.invalidate_hashes(project_id, locked_primary_hashes)
+    return locked_primary_hashes
 
 
 def unlock_hashes(project_id, locked_primary_hashes):
@@ -459,6 +464,7 @@ def unlock_hashes(project_id, locked_primary_hashes):
         hash__in=locked_primary_hashes,
         state=GroupHash.State.LOCKED_IN_MIGRATION,
     ).update(state=GroupHash.State.UNLOCKED)
+    grouphash_cache.invalidate_hashes(project_id, locked_primary_hashes)
 
 
 @instrumented_task(name="sentry.tasks.unmerge", queue="unmerge")
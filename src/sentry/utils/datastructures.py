@@ -1,3 +1,5 @@
+import threading
+from collections import OrderedDict
 from collections.abc import Hashable, MutableMapping
 
 __unset__ = object()
@@ -59,3 +61,80 @@ class BidirectionalMapping(MutableMapping):
 
     def inverse(self):
         return self.__inverse.copy()
+
+
+class LRUCache:
+    """\
+    A thread-safe, in-memory cache which evicts the least recently used
+    entries once the total size of its entries exceeds ``max_size``.
+
+    Every entry has a size, which defaults to ``1`` so that the cache is
+    bounded by its number of entries. Callers can provide a better estimate,
+    such as the amount of bytes an entry holds on to. ``max_size`` can be a
+    callable, which allows the bound to be controlled by an option.
+    """
+
+    def __init__(self, max_size):
+        self.__max_size = max_size
+        self.__data = OrderedDict()
+        self.__size = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        return self.__max_size() if callable(self.__max_size) else self.__max_size
+
+    @property
+    def size(self):
+        return self.__size
+
+    def __len__(self):
+        return len(self.__data)
+
+    def __contains__(self, key):
+        return key in self.__data
+
+    def get(self, key, default=None):
+        with self.__lock:
+            entry = self.__data.get(key, __unset__)
+            if entry is __unset__:
+                return default
+            self.__data.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value, size=1):
+        """\
+        Stores ``value`` under ``key`` and returns the number of entries that
+        had to be evicted to make room for it. Values bigger than the whole
+        cache are not stored.
+        """
+        max_size = self.max_size
+        if size > max_size:
+            return 0
+
+        evicted = 0
+        with self.__lock:
+            previous = self.__data.pop(key, __unset__)
+            if previous is not __unset__:
+                self.__size -= previous[1]
+
+            self.__data[key] = (value, size)
+            self.__size += size
+
+            while self.__size > max_size:
+                _, (_, evicted_size) = self.__data.popitem(last=False)
+                self.__size -= evicted_size
+                evicted += 1
+
+        return evicted
+
+    def delete(self, key):
+        with self.__lock:
+            previous = self.__data.pop(key, __unset__)
+            if previous is not __unset__:
+                self.__size -= previous[1]
+
+    def clear(self):
+        with self.__lock:
+            self.__data.clear()
+            self.__size = 0
@@ -1,5 +1,5 @@
-from contextlib import ExitStack
-from typing import Sequence, Union
+from contextlib import ExitStack, contextmanager
+from typing import Any, Generator, Optional, Sequence, Union
 
 import sentry_sdk
 from django.db import DEFAULT_DB_ALIAS, connections, transaction
@@ -57,3 +57,31 @@ class DjangoAtomicIntegration(Integration):
 
 def table_exists(name, using=DEFAULT_DB_ALIAS):
     return name in connections[using].introspection.table_names()
+
+
+class QueryCounter:
+    """Django execute wrapper counting the queries executed through it."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context) -> Any:
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def count_queries(using: Optional[Sequence[str]] = None) -> Generator[QueryCounter, None, None]:
+    """
+    Count the queries executed on the given databases (all of them by default) within the block.
+
+    >>> with count_queries() as counter:
+    ...     Project.objects.get(id=1)
+    >>> counter.count
+    1
+    """
+    counter = QueryCounter()
+    with ExitStack() as stack:
+        for db in using if using is not None else connections:
+            stack.enter_context(connections[db].execute_wrapper(counter))
+        yield counter
@@ -6,7 +6,7 @@ import os
 import re
 import time
 from collections import namedtuple
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from contextlib import contextmanager
 from copy import deepcopy
 from datetime import datetime, timedelta
@@ -24,6 +24,7 @@ from sentry_sdk import Hub
 from snuba_sdk import Request
 from snuba_sdk.legacy import json_to_snql
 
+from sentry import options
 from sentry.models import (
     Environment,
     Group,
@@ -366,6 +367,11 @@ _snuba_pool = connection_from_url(
     maxsize=10,
 )
 _query_thread_pool = ThreadPoolExecutor(max_workers=10)
+# Separate pool for queries that run in the background while the caller keeps
+# working, since those may themselves fan out to `_query_thread_pool`.
+_async_query_thread_pool = ThreadPoolExecutor(max_workers=10)
+# Pool for `bulk_snql_query_partial`, whose queries may outlive their caller.
+_partial_query_thread_pool = ThreadPoolExecutor(max_workers=10)
 
 
 epoch_naive = datetime(1970, 1, 1, tzinfo=None)
@@ -742,6 +748,10 @@ SnubaQueryBody = Tuple[SnubaQuery, Translator, Translator]
 ResultSet = List[Mapping[str, Any]]  # TODO: Would be nice to make this a concrete structure
 
 
+def _identity(x: Any) -> Any:
+    return x
+
+
 def raw_snql_query(
     request: Request,
     referrer: Optional[str] = None,
@@ -758,7 +768,7 @@ def raw_snql_query(
         request.tenant_ids = request.tenant_ids or dict()
         request.tenant_ids["referrer"] = referrer
 
-    params: SnubaQueryBody = (request, lambda x: x, lambda x: x)
+    params: SnubaQueryBody = (request, _identity, _identity)
     return _apply_cache_and_build_results([params], referrer=referrer, use_cache=use_cache)[0]
 
 
@@ -780,10 +790,65 @@ def bulk_snql_query(
             request.tenant_ids = request.tenant_ids or dict()
             request.tenant_ids["referrer"] = referrer
 
-    params: SnubaQuery = [(request, lambda x: x, lambda x: x) for request in requests]
+    params: SnubaQuery = [(request, _identity, _identity) for request in requests]
     return _apply_cache_and_build_results(params, referrer=referrer, use_cache=use_cache)
 
 
+def bulk_snql_query_partial(
+    requests: List[Request],
+    referrer: Optional[str] = None,
+    use_cache: bool = False,
+) -> List[Optional[Mapping[str, Any]]]:
+    """
+    Like `bulk_snql_query`, but tolerates queries which time out.
+
+    The queries run concurrently, with at most `snuba.partial-results.max-concurrency`
+    of them in flight at once. Queries which did not finish within
+    `snuba.partial-results.timeout` seconds, or which hit the execution time
+    limit of Snuba, are returned as `None` so that callers can return partial
+    results. All other errors are raised.
+    """
+    if not options.get("snuba.partial-results.enabled"):
+        return list(bulk_snql_query(requests, referrer, use_cache))
+
+    deadline = time.monotonic() + options.get("snuba.partial-results.timeout")
+    max_concurrency = max(options.get("snuba.partial-results.max-concurrency"), 1)
+
+    def run(request: Request, thread_hub: Hub) -> Optional[Mapping[str, Any]]:
+        with thread_hub:
+            try:
+                return raw_snql_query(request, referrer, use_cache)
+            except QueryExecutionTimeMaximum:
+                return None
+
+    results: List[Optional[Mapping[str, Any]]] = [None] * len(requests)
+    queue = list(enumerate(requests))
+    queue.reverse()
+    pending = {}
+    while queue or pending:
+        while queue and len(pending) < max_concurrency:
+            index, request = queue.pop()
+            pending[_partial_query_thread_pool.submit(run, request, Hub(Hub.current))] = index
+
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            break
+        done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            results[pending.pop(future)] = future.result()
+
+    timed_out = sum(result is None for result in results)
+    if timed_out:
+        # Queries which are still running are abandoned, the ones which did not
+        # start yet are skipped altogether.
+        metrics.incr(
+            "snuba.partial_results.timeout",
+            amount=timed_out,
+            tags={"referrer": referrer or "unknown"},
+        )
+    return results
+
+
 def get_cache_key(query: SnubaQuery) -> str:
     if isinstance(query, Request):
         hashable = str(query)
@@ -803,6 +868,26 @@ def bulk_raw_query(
     return _apply_cache_and_build_results(params, referrer=referrer, use_cache=use_cache)
 
 
+def bulk_raw_query_async(
+    snuba_param_list: Sequence[SnubaQueryParams],
+    referrer: Optional[str] = None,
+    use_cache: Optional[bool] = False,
+) -> Future[ResultSet]:
+    """
+    Like `bulk_raw_query`, but runs the queries in the background. The query
+    params are prepared on the calling thread, since that may access the
+    database.
+    """
+    params = [_prepare_query_params(param, referrer) for param in snuba_param_list]
+    thread_hub = Hub(Hub.current)
+
+    def run() -> ResultSet:
+        with thread_hub:
+            return _apply_cache_and_build_results(params, referrer=referrer, use_cache=use_cache)
+
+    return _async_query_thread_pool.submit(run)
+
+
 def _apply_cache_and_build_results(
     snuba_param_list: Sequence[SnubaQueryBody],
     referrer: Optional[str] = None,
@@ -888,10 +973,11 @@ def _bulk_snuba_query(
             # No need to submit to the thread pool if we're just performing a single query
             query_results = [query_fn((snuba_param_list[0], Hub(Hub.current), headers, parent_api))]
 
+    use_rapid_json = options.get("snuba.results.use-rapidjson")
     results = []
     for response, _, reverse in query_results:
         try:
-            body = json.loads(response.data)
+            body = json.loads(response.data, use_rapid_json=use_rapid_json)
             if SNUBA_INFO:
                 if "sql" in body:
                     print(  # NOQA: only prints when an env variable is set
@@ -926,8 +1012,11 @@ def _bulk_snuba_query(
             else:
                 raise SnubaError(f"HTTP {response.status}")
 
-        # Forward and reverse translation maps from model ids to snuba keys, per column
-        body["data"] = [reverse(d) for d in body["data"]]
+        # Forward and reverse translation maps from model ids to snuba keys, per column.
+        # Only SnQL queries come without a translator, legacy queries always have one since
+        # their time columns are translated as well, see `get_snuba_translators`.
+        if reverse is not _identity:
+            body["data"] = [reverse(d) for d in body["data"]]
         results.append(body)
 
     return results
@@ -1337,7 +1426,7 @@ def get_snuba_translators(filter_keys, is_grouprelease=False):
     """
 
     # Helper lambdas to compose translator functions
-    identity = lambda x: x
+    identity = _identity
     compose = lambda f, g: lambda x: f(g(x))
     replace = lambda d, key, val: d.update({key: val}) or d
 
@@ -0,0 +1,89 @@
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.signals import request_finished
+from django.http import HttpRequest
+
+from sentry import app
+from sentry.api.serializers.loader import Loader, clear_loaders, get_loader
+from sentry.models import Team
+from sentry.testutils import TestCase
+from sentry.utils.db import count_queries
+
+
+class BatchFn:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, keys):
+        self.calls.append(keys)
+        return {key: key * 2 for key in keys if key > 0}
+
+
+class LoaderTest(TestCase):
+    def test_load_many_batches_and_dedupes(self):
+        batch_fn = BatchFn()
+        loader = Loader("test", batch_fn)
+
+        assert loader.load_many([1, 2, 2, -1]) == {1: 2, 2: 4}
+        assert loader.load_many([2, 3, -1]) == {2: 4, 3: 6}
+        assert loader.load(1) == 2
+        assert loader.load(-1) is None
+
+        assert batch_fn.calls == [[1, 2, -1], [3]]
+
+    def test_prime(self):
+        batch_fn = BatchFn()
+        loader = Loader("test", batch_fn)
+        loader.prime(1, "primed")
+
+        assert loader.load_many([1]) == {1: "primed"}
+        assert batch_fn.calls == []
+
+
+class GetLoaderTest(TestCase):
+    def setUp(self):
+        self.original_receivers = request_finished.receivers
+        request_finished.receivers = []
+        request_finished.connect(clear_loaders)
+        super().setUp()
+
+    def tearDown(self):
+        app.env.request = None
+        request_finished.send(sender=WSGIHandler)
+        request_finished.receivers = self.original_receivers
+        super().tearDown()
+
+    def test_shared_within_request(self):
+        app.env.request = HttpRequest()
+        batch_fn = BatchFn()
+        assert get_loader("test", batch_fn).load(1) == 2
+        assert get_loader("test", batch_fn).load(1) == 2
+        assert batch_fn.calls == [[1]]
+
+    def test_cleared_after_request(self):
+        app.env.request = HttpRequest()
+        batch_fn = BatchFn()
+        get_loader("test", batch_fn).load(1)
+        request_finished.send(sender=WSGIHandler)
+
+        app.env.request = HttpRequest()
+        get_loader("test", batch_fn).load(1)
+        assert batch_fn.calls == [[1], [1]]
+
+    def test_no_request(self):
+        batch_fn = BatchFn()
+        get_loader("test", batch_fn).load(1)
+        get_loader("test", batch_fn).load(1)
+        assert batch_fn.calls == [[1], [1]]
+
+    def test_nested_serializer_lookups(self):
+        from sentry.api.serializers.models.group import _load_teams
+
+        app.env.request = HttpRequest()
+        team = self.create_team(organization=self.organization)
+
+        with count_queries() as counter:
+            assert _load_teams([team.id]) == {team.id: team}
+            assert _load_teams([team.id]) == {team.id: Team.objects.get(id=team.id)}
+
+        # One query for the loader and one for the explicit lookup above.
+        assert counter.count == 2
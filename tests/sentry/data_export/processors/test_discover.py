@@ -3,6 +3,7 @@ import pytest
 from sentry.data_export.base import ExportError
 from sentry.data_export.processors.discover import DiscoverProcessor
 from sentry.testutils import SnubaTestCase, TestCase
+from sentry.testutils.helpers.datetime import before_now, iso_format
 
 
 class DiscoverProcessorTest(TestCase, SnubaTestCase):
@@ -60,3 +61,20 @@ class DiscoverProcessorTest(TestCase, SnubaTestCase):
         assert new_result_list[0] != result_list
         assert new_result_list[0]["count(id) / fake(field)"] == 5
         assert new_result_list[0]["count(id) / 2"] == 8
+
+    def test_bulk_data_fn_matches_data_fn(self):
+        for environment in ("prod", "dev", "dev"):
+            self.store_event(
+                data={"environment": environment, "timestamp": iso_format(before_now(minutes=1))},
+                project_id=self.project1.id,
+            )
+        self.discover_query["field"] = ["environment", "count()"]
+        self.discover_query["sort"] = "-count"
+        processor = DiscoverProcessor(
+            organization_id=self.org.id, discover_query=self.discover_query
+        )
+
+        pages = [(0, 1), (1, 1)]
+        assert processor.bulk_data_fn(pages) == [
+            processor.data_fn(offset=offset, limit=limit) for offset, limit in pages
+        ]
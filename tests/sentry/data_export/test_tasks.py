@@ -26,6 +26,7 @@ from sentry.utils.snuba import (
     SchemaValidationError,
     SnubaError,
     UnqualifiedQueryError,
+    bulk_snql_query,
 )
 
 
@@ -610,6 +611,38 @@ class AssembleDownloadTest(TestCase, SnubaTestCase):
 
         assert emailer.called
 
+    @patch("sentry.data_export.models.ExportedData.email_success")
+    def test_discover_concurrent_fragments(self, emailer):
+        de = ExportedData.objects.create(
+            user_id=self.user.id,
+            organization=self.org,
+            query_type=ExportQueryType.DISCOVER,
+            query_info={
+                "project": [self.project.id],
+                "field": ["environment"],
+                "sort": "-environment",
+                "query": "",
+            },
+        )
+        with self.options({"dataexport.discover.fragment-concurrency": 2}), patch(
+            "sentry.data_export.processors.discover.bulk_snql_query",
+            wraps=bulk_snql_query,
+        ) as mock_query, self.tasks():
+            assemble_download(de.id, batch_size=1)
+        de = ExportedData.objects.get(id=de.id)
+        # Convert raw csv to list of line-strings
+        with de._get_file().getfile() as f:
+            header, raw1, raw2, raw3 = f.read().strip().split(b"\r\n")
+        assert header == b"environment"
+
+        assert raw1.startswith(b"prod")
+        assert raw2.startswith(b"prod")
+        assert raw3.startswith(b"dev")
+
+        # The fourth page is empty and ends the export
+        assert [len(call.args[0]) for call in mock_query.call_args_list] == [2, 2]
+        assert emailer.called
+
 
 @region_silo_test(stable=True)
 class AssembleDownloadLargeTest(TestCase, SnubaTestCase):
@@ -0,0 +1,88 @@
+import pytest
+from django.core.cache import cache
+
+from sentry.db.models.manager.base import BaseManager
+from sentry.models import Organization, Project, ProjectKey
+from sentry.testutils import TestCase
+from sentry.testutils.helpers import override_options
+
+
+class GetFromCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_negative_cache(self):
+        with override_options({"modelcache.negative-cache-ttl": 60}):
+            with pytest.raises(Project.DoesNotExist):
+                Project.objects.get_from_cache(id=0)
+
+            with self.assertNumQueries(0), pytest.raises(Project.DoesNotExist):
+                Project.objects.get_from_cache(id=0)
+
+    def test_negative_cache_disabled(self):
+        with override_options({"modelcache.negative-cache-ttl": 0}):
+            with pytest.raises(Project.DoesNotExist):
+                Project.objects.get_from_cache(id=0)
+
+            with self.assertNumQueries(1), pytest.raises(Project.DoesNotExist):
+                Project.objects.get_from_cache(id=0)
+
+    def test_negative_cache_overwritten_on_save(self):
+        with override_options({"modelcache.negative-cache-ttl": 60}):
+            with pytest.raises(ProjectKey.DoesNotExist):
+                ProjectKey.objects.get_from_cache(public_key="a" * 32)
+
+            key = ProjectKey.objects.create(project=self.project, public_key="a" * 32)
+            assert ProjectKey.objects.get_from_cache(public_key="a" * 32) == key
+
+
+class GetManyFromCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_batches_lookups(self):
+        projects = [self.create_project() for _ in range(3)]
+        ids = [p.id for p in projects]
+        cache.clear()
+
+        with self.assertNumQueries(1):
+            assert {p.id for p in Project.objects.get_many_from_cache(ids)} == set(ids)
+
+        with self.assertNumQueries(0):
+            assert {p.id for p in Project.objects.get_many_from_cache(ids)} == set(ids)
+
+    def test_secondary_key(self):
+        orgs = [self.create_organization() for _ in range(2)]
+        slugs = [o.slug for o in orgs]
+        cache.clear()
+
+        with self.assertNumQueries(1):
+            assert {o.id for o in Organization.objects.get_many_from_cache(slugs, key="slug")} == {
+                o.id for o in orgs
+            }
+
+        with self.assertNumQueries(0):
+            assert {o.id for o in Organization.objects.get_many_from_cache(slugs, key="slug")} == {
+                o.id for o in orgs
+            }
+
+    def test_negative_cache(self):
+        project = self.create_project()
+
+        with override_options({"modelcache.negative-cache-ttl": 60}):
+            assert Project.objects.get_many_from_cache([project.id, 0]) == [project]
+
+            with self.assertNumQueries(0):
+                assert Project.objects.get_many_from_cache([project.id, 0]) == [project]
+
+    def test_local_cache(self):
+        project = self.create_project()
+
+        with BaseManager.local_cache():
+            assert Project.objects.get_many_from_cache([project.id]) == [project]
+            cache.clear()
+
+            with self.assertNumQueries(0):
+                assert Project.objects.get_many_from_cache([project.id]) == [project]
@@ -1,5 +1,6 @@
 from datetime import timedelta
 
+from django.core.cache import cache
 from django.utils import timezone
 
 from sentry.db.deletion import BulkDeleteQuery
@@ -34,6 +35,53 @@ class BulkDeleteQueryTest(TestCase):
         assert not Group.objects.filter(id=group1_2.id).exists()
         assert Group.objects.filter(id=group1_3.id).exists()
 
+    def test_execute_in_ranges(self):
+        now = timezone.now()
+        project1 = self.create_project()
+        project2 = self.create_project()
+        old_groups = [
+            self.create_group(project1, last_seen=now - timedelta(days=2)) for _ in range(5)
+        ]
+        new_group = self.create_group(project1, last_seen=now)
+        other_group = self.create_group(project2, last_seen=now - timedelta(days=2))
+
+        deleted = BulkDeleteQuery(
+            model=Group, project_id=project1.id, dtfield="last_seen", days=1
+        ).execute_in_ranges(chunk_size=2)
+
+        assert deleted == 5
+        assert not Group.objects.filter(id__in=[group.id for group in old_groups]).exists()
+        assert Group.objects.filter(id=new_group.id).exists()
+        assert Group.objects.filter(id=other_group.id).exists()
+
+    def test_execute_in_ranges_resumes_from_checkpoint(self):
+        now = timezone.now()
+        groups = [self.create_group(last_seen=now - timedelta(days=2)) for _ in range(4)]
+        cache.set("cleanup-test", groups[2].id)
+
+        deleted = BulkDeleteQuery(model=Group, dtfield="last_seen", days=1).execute_in_ranges(
+            checkpoint_key="cleanup-test"
+        )
+
+        assert deleted == 2
+        assert Group.objects.filter(id__in=[groups[0].id, groups[1].id]).count() == 2
+        assert cache.get("cleanup-test") is None
+
+
+class BulkDeleteQueryConcurrencyTestCase(TransactionTestCase):
+    def test_execute_in_ranges(self):
+        now = timezone.now()
+        old_groups = [self.create_group(last_seen=now - timedelta(days=2)) for _ in range(10)]
+        new_group = self.create_group(last_seen=now)
+
+        deleted = BulkDeleteQuery(model=Group, dtfield="last_seen", days=1).execute_in_ranges(
+            chunk_size=1, concurrency=3
+        )
+
+        assert deleted == 10
+        assert not Group.objects.filter(id__in=[group.id for group in old_groups]).exists()
+        assert Group.objects.filter(id=new_group.id).exists()
+
 
 class BulkDeleteQueryIteratorTestCase(TransactionTestCase):
     def test_iteration(self):
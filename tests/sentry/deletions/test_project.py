@@ -1,4 +1,10 @@
-from sentry import eventstore
+from unittest import mock
+from uuid import uuid4
+
+import pytest
+
+from sentry import deletions, eventstore
+from sentry.deletions.base import ModelRelation
 from sentry.incidents.models import AlertRule
 from sentry.models import (
     Commit,
@@ -13,10 +19,12 @@ from sentry.models import (
     GroupResolution,
     GroupSeen,
     Project,
+    ProjectCodeOwners,
     ProjectDebugFile,
     Release,
     ReleaseCommit,
     Repository,
+    RepositoryProjectPathConfig,
     ScheduledDeletion,
     ServiceHook,
 )
@@ -130,3 +138,93 @@ class DeleteProjectTest(APITestCase, TransactionTestCase):
         conditions = eventstore.Filter(project_ids=[project.id, keeper.id], group_ids=[group.id])
         events = eventstore.get_events(conditions)
         assert len(events) == 0
+
+    def test_concurrent_relations(self):
+        project = self.create_project(name="test")
+        event = self.store_event(data={}, project_id=project.id)
+        group = event.group
+        group_seen = GroupSeen.objects.create(group=group, project=project, user_id=self.user.id)
+        env = Environment.objects.create(organization_id=project.organization_id, name="foo")
+        env.add_project(project)
+        hook = self.create_service_hook(
+            actor=self.user,
+            org=project.organization,
+            project=project,
+            url="https://example.com/webhook",
+        )
+
+        deletion = ScheduledDeletion.schedule(project, days=0)
+        deletion.update(in_progress=True)
+
+        with self.options(
+            {"deletions.relation-concurrency": 4, "deletions.checkpoint-relations": True}
+        ), self.tasks():
+            run_deletion(deletion.id)
+
+        assert not Project.objects.filter(id=project.id).exists()
+        assert not Group.objects.filter(id=group.id).exists()
+        assert not GroupSeen.objects.filter(id=group_seen.id).exists()
+        assert not EnvironmentProject.objects.filter(project_id=project.id).exists()
+        assert not ServiceHook.objects.filter(id=hook.id).exists()
+
+    def test_checkpointed_relations(self):
+        project = self.create_project(name="test")
+        group = self.create_group(project=project)
+        GroupSeen.objects.create(group=group, project=project, user_id=self.user.id)
+        self.create_service_hook(
+            actor=self.user, org=project.organization, project=project, url="https://example.com"
+        )
+
+        task = deletions.get(model=Project, query={"id": project.id}, transaction_id=uuid4().hex)
+        relations = [
+            ModelRelation(ServiceHook, {"project_id": project.id}),
+            ModelRelation(GroupSeen, {"project_id": project.id}),
+        ]
+        get_task = task.manager.get
+
+        def fail_group_seen(**kwargs):
+            if kwargs["model"] is GroupSeen:
+                raise Exception("boom")
+            return get_task(**kwargs)
+
+        with self.options({"deletions.checkpoint-relations": True}):
+            with mock.patch.object(task.manager, "get", side_effect=fail_group_seen):
+                with pytest.raises(Exception, match="boom"):
+                    task.delete_children(relations)
+            assert not ServiceHook.objects.filter(project_id=project.id).exists()
+
+            # The finished relation is skipped on retry
+            with mock.patch.object(task.manager, "get", wraps=get_task) as mock_get:
+                task.delete_children(relations)
+            assert [call.kwargs["model"] for call in mock_get.call_args_list] == [GroupSeen]
+            assert not GroupSeen.objects.filter(project_id=project.id).exists()
+
+            # Unless rows were added since
+            hook = self.create_service_hook(
+                actor=self.user,
+                org=project.organization,
+                project=project,
+                url="https://example.com",
+            )
+            task.delete_children(relations)
+            assert not ServiceHook.objects.filter(id=hook.id).exists()
+
+    def test_plan_relations(self):
+        project = self.create_project(name="test")
+        task = deletions.get(model=Project, query={"id": project.id})
+        groups = task.plan_relations(task.get_child_relations(project), 4)
+
+        models = [[relation.params["model"] for relation in group] for group in groups]
+        assert [Group] in models
+        assert all(len(group) <= 4 for group in models)
+        for group in models:
+            # Both are deleted in bulk, but one references the other
+            assert not {ProjectCodeOwners, RepositoryProjectPathConfig} <= set(group)
+
+        # Relations are only reordered within their group
+        assert [model for group in models for model in group] == [
+            relation.params["model"] for relation in task.get_child_relations(project)
+        ]
+        assert all(
+            len(group) == 1 for group in task.plan_relations(task.get_child_relations(project), 1)
+        )
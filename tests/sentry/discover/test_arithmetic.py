@@ -290,3 +290,22 @@ def test_unparseable_arithmetic(equation):
 def test_invalid_arithmetic(equation):
     with pytest.raises(ArithmeticValidationError):
         parse_arithmetic(equation)
+
+
+def test_parsed_arithmetic_is_memoized():
+    equation = "count() / count_unique(user)"
+    result, fields, functions = parse_arithmetic(equation)
+    functions.append("p50(transaction.duration)")
+
+    other_result, other_fields, other_functions = parse_arithmetic(equation)
+    assert other_result is result
+    assert other_fields == fields == []
+    assert sorted(other_functions) == ["count()", "count_unique(user)"]
+
+    # Custom measurements change the outcome of parsing, so they're part of the memoization key
+    with pytest.raises(ArithmeticValidationError):
+        parse_arithmetic("measurements.custom + 1")
+    result, fields, _ = parse_arithmetic(
+        "measurements.custom + 1", custom_measurements={"measurements.custom"}
+    )
+    assert fields == ["measurements.custom"]
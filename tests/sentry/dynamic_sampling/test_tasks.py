@@ -82,6 +82,41 @@ class TestPrioritiseProjectsTask(BaseMetricsLayerTestCase, TestCase, SnubaTestCa
         }
         assert generate_rules(proj_d)[0]["samplingValue"] == {"type": "sampleRate", "value": 1.0}
 
+    @patch("sentry.dynamic_sampling.tasks.schedule_invalidate_project_config")
+    @patch("sentry.dynamic_sampling.rules.base.quotas.get_blended_sample_rate")
+    def test_prioritise_projects_skips_unchanged_rates(
+        self, get_blended_sample_rate, schedule_invalidate_project_config
+    ):
+        get_blended_sample_rate.return_value = 0.25
+        test_org = self.create_organization(name="sample-org")
+        proj_a = self.create_project_and_add_metrics("a", 9, test_org)
+        self.create_project_and_add_metrics("b", 7, test_org)
+
+        with self.options(
+            {
+                "dynamic-sampling.prioritise_projects.sample_rate": 1.0,
+                "dynamic-sampling.rebalancing.skip-unchanged-rates": True,
+            }
+        ):
+            with self.tasks():
+                prioritise_projects()
+            assert schedule_invalidate_project_config.call_count == 2
+
+            # The volumes did not change, so the rates are the same.
+            with self.tasks():
+                prioritise_projects()
+            assert schedule_invalidate_project_config.call_count == 2
+
+            get_blended_sample_rate.return_value = 0.5
+            with self.tasks():
+                prioritise_projects()
+            assert schedule_invalidate_project_config.call_count == 4
+
+        assert generate_rules(proj_a)[0]["samplingValue"] == {
+            "type": "sampleRate",
+            "value": pytest.approx(0.4444444444444444),
+        }
+
 
 @freeze_time(MOCK_DATETIME)
 class TestPrioritiseTransactionsTask(BaseMetricsLayerTestCase, TestCase, SnubaTestCase):
@@ -196,3 +231,34 @@ class TestPrioritiseTransactionsTask(BaseMetricsLayerTestCase, TestCase, SnubaTe
                     )  # check we have some rate calculated for each transaction
                 # we do have some different rate for implicit transactions
                 assert implicit_rate != BLENDED_RATE
+
+    @patch("sentry.dynamic_sampling.tasks.schedule_invalidate_project_config")
+    @patch("sentry.dynamic_sampling.rules.base.quotas.get_blended_sample_rate")
+    def test_prioritise_transactions_skips_unchanged_rates(
+        self, get_blended_sample_rate, schedule_invalidate_project_config
+    ):
+        get_blended_sample_rate.return_value = 0.25
+        num_projects = sum(len(org["project_ids"]) for org in self.orgs_info)
+
+        with self.options(
+            {
+                "dynamic-sampling.prioritise_transactions.load_rate": 1.0,
+                "dynamic-sampling.rebalancing.skip-unchanged-rates": True,
+            }
+        ):
+            with self.feature({"organizations:ds-prioritise-by-transaction-bias": True}):
+                with self.tasks():
+                    prioritise_transactions()
+                assert schedule_invalidate_project_config.call_count == num_projects
+
+                # The volumes did not change, so the rates are the same.
+                with self.tasks():
+                    prioritise_transactions()
+                assert schedule_invalidate_project_config.call_count == num_projects
+
+        for org in self.orgs_info:
+            for proj_id in org["project_ids"]:
+                tran_rate, _ = get_transactions_resampling_rates(
+                    org_id=org["org_id"], proj_id=proj_id, default_rate=0.1
+                )
+                assert tran_rate
@@ -1,11 +1,15 @@
 import contextlib
 import time
 from threading import Thread
+from unittest import mock
 
 import pytest
 
 from sentry.event_manager import _save_aggregate
 from sentry.eventstore.models import CalculatedHashes, Event
+from sentry.models import Group, GroupHash, GroupStatus
+from sentry.testutils.helpers import override_options
+from sentry.unmerge import PrimaryHashUnmergeReplacement
 
 
 @pytest.mark.django_db(transaction=True)
@@ -87,3 +91,63 @@ def test_group_creation_race(monkeypatch, default_project, is_race_free):
         # assert many groups are new
         assert 1 < len({rv.group.id for rv in return_values}) <= CONCURRENCY
         assert 1 < sum(rv.is_new for rv in return_values) <= CONCURRENCY
+
+
+def _save_flat_aggregate(project, hashes):
+    evt = Event(project.id, "89aeed6a472e4c5fb992d14df4d7e1b6", data={"timestamp": time.time()})
+    return _save_aggregate(
+        evt,
+        hashes=CalculatedHashes(hashes=hashes, hierarchical_hashes=[], tree_labels=[]),
+        release=None,
+        metadata={},
+        received_timestamp=None,
+        level=10,
+        culprit="",
+    )
+
+
+@pytest.mark.django_db
+@override_options({"store.grouphash-cache-ttl": 60})
+def test_grouphash_cache(default_project):
+    hashes = ["a" * 32, "b" * 32]
+    group = _save_flat_aggregate(default_project, hashes).group
+    # The second event reads the hashes back, now associated with the group.
+    assert _save_flat_aggregate(default_project, hashes).group.id == group.id
+
+    with mock.patch("sentry.event_manager.GroupHash.objects.get_or_create") as get_or_create:
+        group_info = _save_flat_aggregate(default_project, hashes)
+
+    assert not get_or_create.called
+    assert group_info.group.id == group.id
+    assert not group_info.is_new
+
+
+@pytest.mark.django_db
+@override_options({"store.grouphash-cache-ttl": 60})
+def test_grouphash_cache_invalidated_on_unmerge(default_project):
+    hashes = ["a" * 32]
+    group = _save_flat_aggregate(default_project, hashes).group
+    _save_flat_aggregate(default_project, hashes)
+
+    other_group = Group.objects.create(project=default_project)
+    PrimaryHashUnmergeReplacement(fingerprints=hashes).run_postgres_replacement(
+        default_project, other_group.id, hashes
+    )
+
+    assert group.id != other_group.id
+    assert _save_flat_aggregate(default_project, hashes).group.id == other_group.id
+
+
+@pytest.mark.django_db
+@override_options({"store.grouphash-cache-ttl": 60})
+def test_grouphash_cache_ignores_stale_group(default_project):
+    hashes = ["a" * 32]
+    group = _save_flat_aggregate(default_project, hashes).group
+    _save_flat_aggregate(default_project, hashes)
+
+    # Moving the hashes without invalidating the cache, e.g. while a merge is in progress.
+    other_group = Group.objects.create(project=default_project)
+    GroupHash.objects.filter(group=group).update(group=other_group)
+    group.update(status=GroupStatus.PENDING_MERGE)
+
+    assert _save_flat_aggregate(default_project, hashes).group.id == other_group.id
@@ -35,8 +35,10 @@ from sentry.incidents.subscription_processor import (
     build_alert_rule_trigger_stat_key,
     build_trigger_stat_keys,
     get_alert_rule_stats,
+    get_many_alert_rule_stats,
     get_redis_client,
     partition,
+    process_updates,
     update_alert_rule_stats,
 )
 from sentry.models import Integration
@@ -358,6 +360,77 @@ class ProcessUpdateTest(ProcessUpdateBaseClass):
             incident, [self.action], [(trigger.alert_threshold + 1, IncidentStatus.CRITICAL)]
         )
 
+    def send_updates(self, updates):
+        self.email_action_handler.reset_mock()
+        with self.feature(
+            ["organizations:incidents", "organizations:performance-view"]
+        ), self.capture_on_commit_callbacks(execute=True):
+            process_updates(
+                [
+                    (
+                        self.build_subscription_update(
+                            subscription, value=value, time_delta=time_delta
+                        ),
+                        subscription,
+                    )
+                    for subscription, value, time_delta in updates
+                ]
+            )
+
+    def test_batch(self):
+        rule = self.rule
+        trigger = self.trigger
+        rule.update(threshold_period=2)
+
+        self.send_updates(
+            [
+                (self.sub, trigger.alert_threshold + 1, timedelta(minutes=-3)),
+                (self.other_sub, trigger.alert_threshold + 1, timedelta(minutes=-3)),
+                (self.sub, trigger.alert_threshold + 1, timedelta(minutes=-2)),
+                # Already processed updates are skipped within a batch as well.
+                (self.sub, trigger.alert_threshold + 1, timedelta(minutes=-3)),
+            ]
+        )
+        self.assert_trigger_counts(SubscriptionProcessor(self.sub), trigger, 0, 0)
+        self.assert_trigger_counts(SubscriptionProcessor(self.other_sub), trigger, 1, 0)
+        incident = self.assert_active_incident(rule)
+        self.assert_no_active_incident(rule, self.other_sub)
+        self.assert_trigger_exists_with_status(incident, trigger, TriggerStatus.ACTIVE)
+        self.assert_actions_fired_for_incident(
+            incident, [self.action], [(trigger.alert_threshold + 1, IncidentStatus.CRITICAL)]
+        )
+
+        self.send_updates(
+            [
+                (self.sub, rule.resolve_threshold - 1, timedelta(minutes=-1)),
+                (self.sub, rule.resolve_threshold - 1, timedelta()),
+            ]
+        )
+        self.assert_trigger_counts(SubscriptionProcessor(self.sub), trigger, 0, 0)
+        self.assert_no_active_incident(rule)
+        self.assert_trigger_exists_with_status(incident, trigger, TriggerStatus.RESOLVED)
+        self.assert_actions_resolved_for_incident(
+            incident, [self.action], [(rule.resolve_threshold - 1, IncidentStatus.CLOSED)]
+        )
+
+    def test_batch_stores_counts_reset_by_trigger(self):
+        rule = self.rule
+        trigger = self.trigger
+        rule.update(threshold_period=2)
+
+        # The first update stores an alert count of 1, the second one fires the trigger and
+        # resets the count to its value before the batch.
+        self.send_updates(
+            [
+                (self.sub, trigger.alert_threshold + 1, timedelta(minutes=-2)),
+                (self.sub, trigger.alert_threshold + 1, timedelta(minutes=-1)),
+            ]
+        )
+        self.assert_active_incident(rule)
+        alert_stats, resolve_stats = get_alert_rule_stats(rule, self.sub, [trigger])[1:]
+        assert alert_stats[trigger.id] == 0
+        assert resolve_stats[trigger.id] == 0
+
     def test_alert_dedupe(self):
         # Verify that an alert rule that only expects a single update to be over the
         # alert threshold triggers correctly
@@ -2301,6 +2374,24 @@ class TestGetAlertRuleStats(TestCase):
         assert resolve_counts == {3: 2, 4: 4}
 
 
+class TestGetManyAlertRuleStats(TestCase):
+    def test(self):
+        alert_rule = AlertRule(id=1)
+        sub = QuerySubscription(project_id=2)
+        other_sub = QuerySubscription(project_id=3)
+        triggers = [AlertRuleTrigger(id=3), AlertRuleTrigger(id=4)]
+        date = datetime.utcnow().replace(tzinfo=pytz.utc, microsecond=0)
+        update_alert_rule_stats(alert_rule, sub, date, {3: 1, 4: 3}, {3: 2, 4: 4})
+
+        assert get_many_alert_rule_stats(
+            [(alert_rule, sub, triggers), (alert_rule, other_sub, triggers)]
+        ) == [
+            (date, {3: 1, 4: 3}, {3: 2, 4: 4}),
+            (datetime.fromtimestamp(0, pytz.utc), {3: 0, 4: 0}, {3: 0, 4: 0}),
+        ]
+        assert get_many_alert_rule_stats([]) == []
+
+
 class TestUpdateAlertRuleStats(TestCase):
     def test(self):
         alert_rule = AlertRule(id=1)
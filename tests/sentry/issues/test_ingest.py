@@ -15,6 +15,7 @@ from sentry.issues.grouptype import (
 from sentry.issues.ingest import (
     _create_issue_kwargs,
     materialize_metadata,
+    prefetch_groups,
     process_occurrence_data,
     save_issue_from_occurrence,
     save_issue_occurrence,
@@ -185,6 +186,28 @@ class SaveIssueFromOccurrenceTest(OccurrenceTestMixin, TestCase):  # type: ignor
                 },
             )
 
+    def test_prefetched_groups(self) -> None:
+        event = self.store_event(data={}, project_id=self.project.id)
+        occurrence = self.build_occurrence()
+        group_info = save_issue_from_occurrence(occurrence, event, None)
+        assert group_info is not None
+
+        new_occurrence = self.build_occurrence(fingerprint=["another-fingerprint"])
+        keys = [
+            (self.project.id, occurrence.fingerprint[0]),
+            (self.project.id, new_occurrence.fingerprint[0]),
+        ]
+        groups = prefetch_groups(keys)
+        assert groups == {keys[0]: group_info.group, keys[1]: None}
+
+        # New groups are remembered for the following occurrences of the batch.
+        new_event = self.store_event(data={}, project_id=self.project.id)
+        new_group_info = save_issue_from_occurrence(new_occurrence, new_event, None, groups)
+        assert new_group_info is not None
+        assert new_group_info.is_new
+        assert groups[keys[1]] == new_group_info.group
+        assert prefetch_groups([keys[1]]) == {keys[1]: new_group_info.group}
+
     def test_rate_limited(self) -> None:
         event = self.store_event(data={}, project_id=self.project.id)
         occurrence = self.build_occurrence()
@@ -15,6 +15,7 @@ from sentry.issues.occurrence_consumer import (
     EventLookupError,
     InvalidEventPayloadError,
     _get_kwargs,
+    _process_batch,
     _process_message,
 )
 from sentry.models import Group
@@ -139,6 +140,51 @@ class IssueOccurrenceProcessMessageTest(IssueOccurrenceTestBase):
                 _process_message(message)
 
 
+class IssueOccurrenceProcessBatchTest(IssueOccurrenceTestBase):
+    @pytest.mark.django_db
+    def test_process_batch(self) -> None:
+        messages = [get_test_message(self.project.id) for _ in range(3)]
+        messages.append(get_test_message(self.project.id, fingerprint=["face-id"]))
+        messages.append(get_test_message(self.project.id, type=300))
+        with self.feature("organizations:profile-file-io-main-thread-ingest"):
+            _process_batch(messages)
+
+        occurrences = [
+            IssueOccurrence.fetch(message["id"], self.project.id) for message in messages
+        ]
+        assert all(occurrences[:4])
+        assert occurrences[4] is None
+
+        # Occurrences with the same fingerprint end up in a single group.
+        groups = {
+            self.eventstore.get_event_by_id(self.project.id, occurrence.event_id).group_id
+            for occurrence in occurrences[:3]
+        }
+        assert groups == {
+            Group.objects.get(grouphash__hash=occurrences[0].fingerprint[0]).id,
+        }
+        assert Group.objects.filter(grouphash__hash=occurrences[3].fingerprint[0]).exists()
+        assert Group.objects.filter(project=self.project).count() == 2
+
+    @pytest.mark.django_db
+    def test_process_batch_lookup_event(self) -> None:
+        message = get_test_message(self.project.id)
+        with self.feature("organizations:profile-file-io-main-thread-ingest"):
+            _process_message(message)
+
+        lookup_message = get_test_message(
+            self.project.id, include_event=False, event_id=message["event_id"]
+        )
+        missing_message = get_test_message(self.project.id, include_event=False)
+        with self.feature("organizations:profile-file-io-main-thread-ingest"):
+            _process_batch([lookup_message, missing_message])
+
+        occurrence = IssueOccurrence.fetch(lookup_message["id"], self.project.id)
+        assert occurrence is not None
+        assert occurrence.event_id == message["event_id"]
+        assert IssueOccurrence.fetch(missing_message["id"], self.project.id) is None
+
+
 class IssueOccurrenceLookupEventIdTest(IssueOccurrenceTestBase):
     def test_lookup_event_doesnt_exist(self) -> None:
         message = get_test_message(self.project.id, include_event=False)
@@ -0,0 +1,67 @@
+from io import BytesIO
+
+from sentry.lang.java.plugin import JavaStacktraceProcessor
+from sentry.models import File
+from sentry.stacktraces.processing import frame_memoization_cache, process_stacktraces
+from sentry.testutils import TestCase
+
+PROGUARD_UUID = "6dc7fdb0-d2fb-4c8e-9d6b-bb1aa98929b1"
+PROGUARD_SOURCE = """\
+org.slf4j.helpers.Util$ClassContextSecurityManager -> org.a.b.g$a:
+    65:65:void <init>() -> <init>
+    67:67:java.lang.Class[] %s() -> a
+"""
+
+
+class JavaStacktraceProcessorMemoizationTest(TestCase):
+    def setUp(self):
+        frame_memoization_cache.clear()
+        self.addCleanup(frame_memoization_cache.clear)
+
+    def upload_mapping(self, project, method):
+        file = File.objects.create(
+            name="proguard.txt",
+            type="project.dif",
+            headers={"Content-Type": "text/x-proguard+plain"},
+        )
+        file.putfile(BytesIO((PROGUARD_SOURCE % method).encode()))
+        return self.create_dif_file(
+            project=project,
+            debug_id=PROGUARD_UUID,
+            object_name="proguard-mapping",
+            features=["mapping"],
+            file=file,
+        )
+
+    def process(self, project):
+        data = {
+            "platform": "java",
+            "project": project.id,
+            "debug_meta": {"images": [{"type": "proguard", "uuid": PROGUARD_UUID}]},
+            "exception": {
+                "values": [
+                    {
+                        "type": "RuntimeException",
+                        "module": "java.lang",
+                        "stacktrace": {
+                            "frames": [{"function": "a", "module": "org.a.b.g$a", "lineno": 67}]
+                        },
+                    }
+                ]
+            },
+        }
+        process_stacktraces(
+            data,
+            make_processors=lambda data, infos: [JavaStacktraceProcessor(data, infos, project)],
+        )
+        return data["exception"]["values"][0]["stacktrace"]["frames"][0]["function"]
+
+    def test_memoization_per_project(self):
+        other_project = self.create_project(organization=self.organization)
+        self.upload_mapping(self.project, "getClassContext")
+        self.upload_mapping(other_project, "getExtraClassContext")
+
+        with self.options({"processing.frame-memoization-cache-size": 100}):
+            assert self.process(self.project) == "getClassContext"
+            assert self.process(other_project) == "getExtraClassContext"
+            assert self.process(self.project) == "getClassContext"
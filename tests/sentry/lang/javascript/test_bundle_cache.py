@@ -0,0 +1,143 @@
+import os
+import zipfile
+from io import BytesIO
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from sentry.lang.javascript.bundle_cache import ArtifactBundleDiskCache
+from sentry.models import ArtifactBundleArchive, SourceFileType
+from sentry.testutils import TestCase
+from sentry.testutils.helpers.options import override_options
+from sentry.utils import json
+
+DEBUG_ID = "c941d872-af1f-4f0c-a7ff-ad3d295fe153"
+
+
+def make_bundle_archive(files):
+    compressed = BytesIO()
+    with zipfile.ZipFile(compressed, mode="w") as zip_file:
+        for file_path, (content, _) in files.items():
+            zip_file.writestr(file_path, content)
+        zip_file.writestr(
+            "manifest.json",
+            json.dumps({"files": {file_path: info for file_path, (_, info) in files.items()}}),
+        )
+    compressed.seek(0)
+    return ArtifactBundleArchive(compressed)
+
+
+class ArtifactBundleDiskCacheTest(TestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.cache = ArtifactBundleDiskCache()
+        self.archive = make_bundle_archive(
+            {
+                "files/_/_/index.js": (
+                    b"console.log('hello')",
+                    {
+                        "url": "~/index.js",
+                        "type": "minified_source",
+                        "headers": {"debug-id": DEBUG_ID, "sourcemap": "index.js.map"},
+                    },
+                ),
+                "files/_/_/index.js.map": (
+                    b'{"version": 3}',
+                    {
+                        "url": "~/index.js.map",
+                        "type": "source_map",
+                        "headers": {"debug-id": DEBUG_ID},
+                    },
+                ),
+                "files/_/_/empty.js": (b"", {"url": "~/empty.js", "type": "source"}),
+            }
+        )
+        self.addCleanup(self.archive.close)
+
+    def options(self, **kwargs):
+        return override_options(
+            {
+                "sourcemaps.artifact-bundle-cache.path": self.temp_dir.name,
+                "sourcemaps.artifact-bundle-cache.max-size": kwargs.get("max_size", 1024 * 1024),
+            }
+        )
+
+    def test_store_and_get(self):
+        with self.options():
+            assert self.cache.get(1) is None
+
+            self.cache.store(1, self.archive).close()
+            bundle = self.cache.get(1)
+
+        assert bundle is not None
+        try:
+            fp, headers = bundle.get_file_by_url("~/index.js")
+            assert fp.read() == b"console.log('hello')"
+            assert headers["sourcemap"] == "index.js.map"
+
+            fp, _ = bundle.get_file_by_debug_id(DEBUG_ID, SourceFileType.SOURCE_MAP)
+            with fp:
+                assert fp.read() == b'{"version": 3}'
+            assert (
+                bundle.get_file_url_by_debug_id(DEBUG_ID, SourceFileType.MINIFIED_SOURCE)
+                == "~/index.js"
+            )
+            assert bundle.get_file_url_by_debug_id(DEBUG_ID, SourceFileType.SOURCE) is None
+
+            fp, _ = bundle.get_file_by_url("~/empty.js")
+            assert fp.read() == b""
+        finally:
+            bundle.close()
+
+    def test_partial_reads(self):
+        with self.options():
+            bundle = self.cache.store(1, self.archive)
+
+        try:
+            fp, _ = bundle.get_file_by_url("~/index.js")
+            assert fp.read(7) == b"console"
+            assert fp.tell() == 7
+            fp.seek(-2, os.SEEK_END)
+            assert fp.read() == b"')"
+        finally:
+            bundle.close()
+
+    def test_missing_file(self):
+        with self.options():
+            bundle = self.cache.store(1, self.archive)
+
+        try:
+            with pytest.raises(KeyError):
+                bundle.get_file_by_url("~/missing.js")
+        finally:
+            bundle.close()
+
+    def test_evicts_least_recently_used(self):
+        with self.options():
+            self.cache.store(1, self.archive).close()
+            self.cache.store(2, self.archive).close()
+            entry_size = sum(size for _, size, _ in self.cache._list_entries()) // 2
+
+        # Make bundle 1 the most recently used one.
+        os.utime(os.path.join(self.temp_dir.name, "2", "index.json"), (0, 0))
+
+        with self.options(max_size=entry_size * 2):
+            self.cache.store(3, self.archive).close()
+
+            assert self.cache.get(2) is None
+            bundle = self.cache.get(1)
+            assert bundle is not None
+            bundle.close()
+            bundle = self.cache.get(3)
+            assert bundle is not None
+            bundle.close()
+
+    def test_corrupted_entry_is_removed(self):
+        with self.options():
+            self.cache.store(1, self.archive).close()
+            with open(os.path.join(self.temp_dir.name, "1", "index.json"), "wb") as f:
+                f.write(b"{")
+
+            assert self.cache.get(1) is None
+            assert not os.path.exists(os.path.join(self.temp_dir.name, "1"))
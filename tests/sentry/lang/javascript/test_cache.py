@@ -1,6 +1,7 @@
 from unittest import TestCase
 
-from sentry.lang.javascript.cache import SourceCache
+from sentry.lang.javascript.cache import SharedProcessingCache, SourceCache
+from sentry.testutils.helpers.options import override_options
 
 
 class BasicCacheTest(TestCase):
@@ -34,3 +35,47 @@ class BasicCacheTest(TestCase):
         # fall back to utf-8
         cache.add(url, "foobar".encode("utf-32"), encoding="utf-32")
         assert cache.get(url)[0] == "foobar"
+
+
+class SharedProcessingCacheTest(TestCase):
+    @override_options({"processing.javascript.shared-cache-max-size": 10})
+    def test_get_or_create(self):
+        cache = SharedProcessingCache()
+        calls = []
+
+        def create():
+            calls.append(1)
+            return "value"
+
+        assert cache.get_or_create("key", "sourceview", create, 4) == "value"
+        assert cache.get_or_create("key", "sourceview", create, 4) == "value"
+        assert len(calls) == 1
+        assert cache.size == 4
+
+    @override_options({"processing.javascript.shared-cache-max-size": 10})
+    def test_evicts_least_recently_used(self):
+        cache = SharedProcessingCache()
+        cache.set("a", 1, 4)
+        cache.set("b", 2, 4)
+        # Touch "a" so that "b" becomes the least recently used entry.
+        assert cache.get("a", "smcache") == 1
+
+        cache.set("c", 3, 4)
+        assert cache.get("b", "smcache") is None
+        assert cache.get("a", "smcache") == 1
+        assert cache.get("c", "smcache") == 3
+        assert cache.size == 8
+        assert len(cache) == 2
+
+    @override_options({"processing.javascript.shared-cache-max-size": 10})
+    def test_oversized_entry_is_not_cached(self):
+        cache = SharedProcessingCache()
+        cache.set("a", 1, 4)
+        cache.set("b", 2, 11)
+
+        assert cache.get("a", "smcache") == 1
+        assert cache.get("b", "smcache") is None
+
+    @override_options({"processing.javascript.shared-cache-max-size": 0})
+    def test_disabled(self):
+        assert not SharedProcessingCache().enabled
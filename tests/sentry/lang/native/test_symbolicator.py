@@ -7,7 +7,9 @@ from sentry.lang.native.sources import (
     redact_internal_sources,
     reverse_aliases_map,
 )
+from sentry.lang.native.symbolicator import SymbolicatorSession
 from sentry.testutils.helpers import Feature
+from sentry.testutils.helpers.options import override_options
 
 CUSTOM_SOURCE_CONFIG = """
 [{
@@ -267,3 +269,13 @@ class TestAliasReversion:
         reverse_aliases = reverse_aliases_map(builtin_sources)
         expected = {"sentry:ios-source": "sentry:ios", "sentry:tvos-source": "sentry:ios"}
         assert reverse_aliases == expected
+
+
+def test_pooled_session_is_reused():
+    with override_options({"symbolicator.pooled-sessions": True}):
+        with SymbolicatorSession(url="http://localhost:3021") as first:
+            first_session = first.session
+        with SymbolicatorSession(url="http://localhost:3021") as second:
+            assert second.session is first_session
+
+        assert first.session is None
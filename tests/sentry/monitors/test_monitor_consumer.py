@@ -9,7 +9,11 @@ from arroyo.backends.kafka import KafkaPayload
 from arroyo.types import BrokerValue, Message, Partition, Topic
 from django.utils import timezone
 
-from sentry.monitors.consumers.check_in import StoreMonitorCheckInStrategyFactory, _process_message
+from sentry.monitors.consumers.check_in import (
+    StoreMonitorCheckInStrategyFactory,
+    _process_batch,
+    _process_message,
+)
 from sentry.monitors.models import (
     CheckInStatus,
     Monitor,
@@ -234,3 +238,82 @@ class MonitorConsumerTest(TestCase):
         assert monitor.status == MonitorStatus.OK
         assert monitor.last_checkin == checkin.date_added
         assert monitor.next_checkin == monitor.get_next_scheduled_checkin(checkin.date_added)
+
+    @pytest.mark.django_db
+    def test_batch(self):
+        monitor = self._create_monitor(slug="my-monitor")
+        other_monitor = self._create_monitor(slug="other-monitor")
+
+        in_progress = self.get_message(monitor.slug, status="in_progress")
+        guid = self.guid
+        ok = self.get_message(monitor.slug, check_in_id=guid, duration=1.5)
+        error = self.get_message(other_monitor.slug, status="error")
+        other_guid = self.guid
+        invalid = self.get_message(monitor.slug, check_in_id="invalid")
+
+        _process_batch([in_progress, invalid, ok, error])
+
+        checkin = MonitorCheckIn.objects.get(guid=guid)
+        assert checkin.status == CheckInStatus.OK
+        assert checkin.duration == 1500
+
+        monitor = Monitor.objects.get(id=monitor.id)
+        assert monitor.status == MonitorStatus.OK
+        assert monitor.next_checkin == monitor.get_next_scheduled_checkin(monitor.last_checkin)
+
+        other_checkin = MonitorCheckIn.objects.get(guid=other_guid)
+        assert other_checkin.status == CheckInStatus.ERROR
+        assert Monitor.objects.get(id=other_monitor.id).status == MonitorStatus.ERROR
+        assert MonitorEnvironment.objects.get(monitor=other_monitor).status == MonitorStatus.ERROR
+
+    @pytest.mark.django_db
+    def test_batch_out_of_order(self):
+        def get_messages(monitor):
+            in_progress = self.get_message(monitor.slug, status="in_progress")
+            # Arrives after the in-progress check-in, but started before it
+            ok = self.get_message(monitor.slug)
+            ok["start_time"] = in_progress["start_time"] - 60
+            return [in_progress, ok]
+
+        monitor = self._create_monitor(slug="my-monitor", status=MonitorStatus.ERROR)
+        batched_monitor = self._create_monitor(slug="batched-monitor", status=MonitorStatus.ERROR)
+
+        for message in get_messages(monitor):
+            _process_message(message)
+        _process_batch(get_messages(batched_monitor))
+
+        monitor = Monitor.objects.get(id=monitor.id)
+        batched_monitor = Monitor.objects.get(id=batched_monitor.id)
+        assert monitor.status == batched_monitor.status == MonitorStatus.ERROR
+        assert abs(monitor.last_checkin - batched_monitor.last_checkin) < timedelta(seconds=10)
+        assert MonitorEnvironment.objects.get(monitor=batched_monitor).status != MonitorStatus.OK
+
+    def test_batched_strategy(self):
+        monitor = self._create_monitor(slug="my-monitor")
+        commit = mock.Mock()
+        partition = Partition(Topic("test"), 0)
+        strategy = StoreMonitorCheckInStrategyFactory(max_batch_size=2).create_with_partitions(
+            commit, {partition: 0}
+        )
+
+        guids = []
+        for offset in range(2):
+            strategy.submit(
+                Message(
+                    BrokerValue(
+                        KafkaPayload(
+                            b"fake-key",
+                            msgpack.packb(self.get_valid_wrapper(monitor.slug)),
+                            [],
+                        ),
+                        partition,
+                        offset,
+                        datetime.now(),
+                    )
+                )
+            )
+            guids.append(self.message_guid)
+        strategy.join()
+
+        assert MonitorCheckIn.objects.filter(guid__in=guids).count() == 2
+        commit.assert_any_call({partition: 2})
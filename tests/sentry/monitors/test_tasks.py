@@ -1,7 +1,10 @@
 from datetime import timedelta
+from unittest import mock
 
+import pytest
 from django.utils import timezone
 
+from sentry.monitors import schedule
 from sentry.monitors.models import (
     CheckInStatus,
     Monitor,
@@ -11,6 +14,8 @@ from sentry.monitors.models import (
 )
 from sentry.monitors.tasks import check_monitors
 from sentry.testutils import TestCase
+from sentry.testutils.helpers.options import override_options
+from sentry.utils.dates import to_timestamp
 
 
 class CheckMonitorsTest(TestCase):
@@ -222,3 +227,139 @@ class CheckMonitorsTest(TestCase):
         assert MonitorCheckIn.objects.filter(id=checkin.id, status=CheckInStatus.ERROR).exists()
 
         assert Monitor.objects.filter(id=monitor.id, status=MonitorStatus.ERROR).exists()
+
+
+class ScheduledCheckMonitorsTest(CheckMonitorsTest):
+    def setUp(self):
+        super().setUp()
+        options = override_options({"monitors.schedule.deadline-index": True})
+        options.__enter__()
+        self.addCleanup(options.__exit__, None, None, None)
+        schedule.rebuild()
+
+    def test_rebuilds_schedule(self):
+        org = self.create_organization()
+        project = self.create_project(organization=org)
+
+        with override_options({"monitors.schedule.deadline-index": False}):
+            monitor = Monitor.objects.create(
+                organization_id=org.id,
+                project_id=project.id,
+                next_checkin=timezone.now() + timedelta(minutes=1),
+                type=MonitorType.CRON_JOB,
+                config={"schedule": "* * * * *"},
+                status=MonitorStatus.OK,
+            )
+            check_monitors()
+
+        assert not schedule.is_initialized()
+        assert not schedule.get_redis_client().zscore(schedule.NEXT_CHECKIN_KEY, monitor.id)
+
+        # The rebuild is started in a separate task, while this run scans the database.
+        with self.tasks(), mock.patch("sentry.monitors.tasks._check_scheduled") as check_scheduled:
+            check_monitors()
+        assert not check_scheduled.called
+
+        assert schedule.is_initialized()
+        assert schedule.get_redis_client().zscore(
+            schedule.NEXT_CHECKIN_KEY, monitor.id
+        ) == to_timestamp(monitor.next_checkin)
+
+    def test_keeps_deadline_on_failure(self):
+        org = self.create_organization()
+        project = self.create_project(organization=org)
+
+        monitor = Monitor.objects.create(
+            organization_id=org.id,
+            project_id=project.id,
+            next_checkin=timezone.now() - timedelta(minutes=1),
+            type=MonitorType.CRON_JOB,
+            config={"schedule": "* * * * *"},
+            status=MonitorStatus.OK,
+        )
+
+        with mock.patch(
+            "sentry.monitors.tasks._mark_missed", side_effect=Exception("boom")
+        ), pytest.raises(Exception):
+            check_monitors()
+        assert schedule.get_redis_client().zscore(schedule.NEXT_CHECKIN_KEY, monitor.id)
+
+        check_monitors()
+
+        assert Monitor.objects.filter(id=monitor.id, status=MonitorStatus.MISSED_CHECKIN).exists()
+        assert MonitorCheckIn.objects.filter(
+            monitor=monitor.id, status=CheckInStatus.MISSED
+        ).exists()
+        # The missed check-in scheduled the next deadline, which is kept.
+        monitor.refresh_from_db()
+        assert schedule.get_redis_client().zscore(
+            schedule.NEXT_CHECKIN_KEY, monitor.id
+        ) == to_timestamp(monitor.next_checkin)
+
+    def test_removes_processed_deadline(self):
+        org = self.create_organization()
+        project = self.create_project(organization=org)
+
+        monitor = Monitor.objects.create(
+            organization_id=org.id,
+            project_id=project.id,
+            next_checkin=timezone.now() - timedelta(minutes=1),
+            type=MonitorType.CRON_JOB,
+            config={"schedule": "* * * * *"},
+            status=MonitorStatus.OK,
+        )
+
+        # Disabled monitors are not checked, but the outdated deadline is processed anyway.
+        Monitor.objects.filter(id=monitor.id).update(status=MonitorStatus.DISABLED)
+
+        check_monitors()
+
+        assert not schedule.get_redis_client().zscore(schedule.NEXT_CHECKIN_KEY, monitor.id)
+
+    def test_reschedules_outdated_deadline(self):
+        org = self.create_organization()
+        project = self.create_project(organization=org)
+
+        next_checkin = timezone.now().replace(microsecond=0) + timedelta(minutes=1)
+        monitor = Monitor.objects.create(
+            organization_id=org.id,
+            project_id=project.id,
+            next_checkin=next_checkin,
+            type=MonitorType.CRON_JOB,
+            config={"schedule": "* * * * *"},
+            status=MonitorStatus.OK,
+        )
+        schedule.schedule_next_checkin(monitor.id, next_checkin - timedelta(minutes=2))
+
+        check_monitors()
+
+        assert Monitor.objects.filter(id=monitor.id, status=MonitorStatus.OK).exists()
+        assert not MonitorCheckIn.objects.filter(monitor=monitor.id).exists()
+        assert schedule.get_redis_client().zscore(
+            schedule.NEXT_CHECKIN_KEY, monitor.id
+        ) == to_timestamp(next_checkin)
+
+    def test_mark_ok_reschedules(self):
+        org = self.create_organization()
+        project = self.create_project(organization=org)
+
+        monitor = Monitor.objects.create(
+            organization_id=org.id,
+            project_id=project.id,
+            next_checkin=timezone.now() - timedelta(minutes=1),
+            type=MonitorType.CRON_JOB,
+            config={"schedule": "* * * * *"},
+            status=MonitorStatus.OK,
+        )
+
+        checkin = MonitorCheckIn.objects.create(
+            monitor=monitor, project_id=project.id, status=CheckInStatus.OK
+        )
+        monitor.mark_ok(checkin, checkin.date_added)
+
+        check_monitors()
+
+        assert Monitor.objects.filter(id=monitor.id, status=MonitorStatus.OK).exists()
+        assert not MonitorCheckIn.objects.filter(
+            monitor=monitor.id, status=CheckInStatus.MISSED
+        ).exists()
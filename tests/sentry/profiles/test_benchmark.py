@@ -0,0 +1,66 @@
+from copy import deepcopy
+from os.path import join
+
+import pytest
+
+from sentry.profiles.task import _process_symbolicator_results_for_sample
+from sentry.testutils.factories import get_fixture_path
+from sentry.testutils.skips import requires_benchmark
+from sentry.utils import json
+
+# Sampled profiles carry tens of thousands of stacks.
+STACKS = 20000
+
+
+def build_sample_profile(platform, inlines):
+    """
+    Converts the samples of a real iOS profile into the sample format and repeats its stacks, with
+    the frames symbolicator would return for them.
+    """
+    with open(join(get_fixture_path("profiles"), "valid_ios_profile.json")) as f:
+        samples = json.loads(f.read())["profile"]["samples"]
+
+    frames = []
+    frame_indices = {}
+    stacks = []
+    for sample in samples:
+        stack = []
+        for frame in sample["frames"]:
+            index = frame_indices.get(frame["instruction_addr"])
+            if index is None:
+                index = frame_indices[frame["instruction_addr"]] = len(frames)
+                frames.append(frame)
+            stack.append(index)
+        stacks.append(stack)
+
+    symbolicated_frames = []
+    for index, frame in enumerate(frames):
+        if inlines and index % 4 == 0:
+            symbolicated_frames.append(
+                {**frame, "function": f"{frame['function']}_inline", "original_index": index}
+            )
+        symbolicated_frames.append({**frame, "original_index": index})
+
+    profile = {
+        "platform": platform,
+        "profile": {
+            "frames": frames,
+            # Stacks of a profile are unique, but share most of their frames.
+            "stacks": [
+                stacks[i % len(stacks)][i % 8 :] or stacks[i % len(stacks)] for i in range(STACKS)
+            ],
+        },
+    }
+    return profile, [{"frames": symbolicated_frames}]
+
+
+@requires_benchmark
+@pytest.mark.parametrize("platform", ["cocoa", "rust"])
+@pytest.mark.parametrize("inlines", [True, False], ids=["inlines", "no-inlines"])
+def test_benchmark_process_symbolicator_results_for_sample(platform, inlines, benchmark):
+    profile, stacktraces = build_sample_profile(platform, inlines)
+
+    def setup():
+        return (deepcopy(profile), deepcopy(stacktraces)), {}
+
+    benchmark.pedantic(_process_symbolicator_results_for_sample, setup=setup, rounds=20)
@@ -1,15 +1,23 @@
 from functools import cached_property
 from io import BytesIO
 from os.path import join
+from unittest import mock
 from zipfile import ZipFile
 
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
+from symbolic import ProguardMapper
 
 from sentry.models import Project
-from sentry.profiles.task import _deobfuscate, _normalize, _process_symbolicator_results_for_sample
+from sentry.profiles.task import (
+    _deobfuscate,
+    _normalize,
+    _process_symbolicator_results_for_sample,
+    proguard_mapper_cache,
+)
 from sentry.testutils import TestCase
 from sentry.testutils.factories import get_fixture_path
+from sentry.testutils.helpers.options import override_options
 from sentry.utils import json
 
 PROFILES_FIXTURES_PATH = get_fixture_path("profiles")
@@ -152,6 +160,121 @@ class ProfilesProcessTaskTest(TestCase):
         assert frames[1]["name"] == "getExtraClassContext"
         assert frames[1]["class_name"] == "org.slf4j.helpers.Util$ClassContextSecurityManager"
 
+    def test_cached_deobfuscation(self):
+        out = BytesIO()
+        with ZipFile(out, "w") as f:
+            f.writestr(f"proguard/{PROGUARD_UUID}.txt", PROGUARD_SOURCE)
+
+        response = self.client.post(
+            self.upload_dsym_files_url,
+            {
+                "file": SimpleUploadedFile(
+                    "symbols.zip", out.getvalue(), content_type="application/zip"
+                )
+            },
+            format="multipart",
+        )
+        assert response.status_code == 201, response.content
+
+        project = Project.objects.get_from_cache(id=self.project.id)
+        self.addCleanup(proguard_mapper_cache.clear)
+
+        with override_options(
+            {"profiling.proguard.mapper-cache-max-size": 1024 * 1024}
+        ), mock.patch(
+            "sentry.profiles.task.ProguardMapper.open", wraps=ProguardMapper.open
+        ) as open_mapper:
+            for _ in range(2):
+                profile = dict(self.android_profile)
+                profile.update(
+                    {
+                        "build_id": PROGUARD_UUID,
+                        "project_id": self.project.id,
+                        "profile": {
+                            "methods": [
+                                {
+                                    "name": "a",
+                                    "abs_path": None,
+                                    "class_name": "org.a.b.g$a",
+                                    "source_file": None,
+                                    "source_line": 67,
+                                },
+                            ],
+                        },
+                    }
+                )
+                _deobfuscate(profile, project)
+
+                frames = profile["profile"]["methods"]
+                assert frames[0]["name"] == "getClassContext"
+                assert (
+                    frames[0]["class_name"] == "org.slf4j.helpers.Util$ClassContextSecurityManager"
+                )
+
+        assert open_mapper.call_count == 1
+
+    def test_cached_deobfuscation_per_project(self):
+        other_project = self.create_project(organization=self.organization)
+        other_source = b"""\
+com.example.Other -> org.a.b.g$a:
+    67:67:void other() -> a
+"""
+        for project, source in ((self.project, PROGUARD_SOURCE), (other_project, other_source)):
+            out = BytesIO()
+            with ZipFile(out, "w") as f:
+                f.writestr(f"proguard/{PROGUARD_UUID}.txt", source)
+
+            response = self.client.post(
+                reverse(
+                    "sentry-api-0-dsym-files",
+                    kwargs={
+                        "organization_slug": project.organization.slug,
+                        "project_slug": project.slug,
+                    },
+                ),
+                {
+                    "file": SimpleUploadedFile(
+                        "symbols.zip", out.getvalue(), content_type="application/zip"
+                    )
+                },
+                format="multipart",
+            )
+            assert response.status_code == 201, response.content
+
+        self.addCleanup(proguard_mapper_cache.clear)
+
+        with override_options({"profiling.proguard.mapper-cache-max-size": 1024 * 1024}):
+            for project, (class_name, name) in (
+                (
+                    self.project,
+                    ("org.slf4j.helpers.Util$ClassContextSecurityManager", "getClassContext"),
+                ),
+                (other_project, ("com.example.Other", "other")),
+            ):
+                profile = dict(self.android_profile)
+                profile.update(
+                    {
+                        "build_id": PROGUARD_UUID,
+                        "project_id": project.id,
+                        "profile": {
+                            "methods": [
+                                {
+                                    "name": "a",
+                                    "abs_path": None,
+                                    "class_name": "org.a.b.g$a",
+                                    "source_file": None,
+                                    "source_line": 67,
+                                },
+                            ],
+                        },
+                    }
+                )
+                _deobfuscate(profile, Project.objects.get_from_cache(id=project.id))
+
+                frames = profile["profile"]["methods"]
+                assert frames[0]["class_name"] == class_name
+                assert frames[0]["name"] == name
+
     def test_inline_deobfuscation(self):
         out = BytesIO()
         with ZipFile(out, "w") as f:
@@ -347,3 +470,29 @@ class ProfilesProcessTaskTest(TestCase):
         _process_symbolicator_results_for_sample(profile, stacktraces)
 
         assert profile["profile"]["stacks"] == [[0, 1, 2, 3, 4, 5]]
+
+    def test_process_symbolicator_results_for_sample_truncates_stacks(self):
+        profile = {
+            "platform": "rust",
+            "profile": {
+                "frames": [{"instruction_addr": hex(i)} for i in range(5)],
+                "stacks": [[0, 1, 2, 3, 4], [2, 3, 4], [3]],
+            },
+        }
+
+        # returned from symbolicator, without inlines
+        stacktraces = [
+            {
+                "frames": [
+                    {"function": "perf_signal_handler", "original_index": 0},
+                    {"function": "profiler", "original_index": 1},
+                    {"function": "C", "original_index": 2},
+                    {"function": "", "original_index": 3},
+                    {"function": "", "original_index": 4},
+                ],
+            },
+        ]
+
+        _process_symbolicator_results_for_sample(profile, stacktraces)
+
+        assert profile["profile"]["stacks"] == [[2], [2], [3]]
@@ -1,18 +1,25 @@
+import threading
 import time
 import uuid
 import zlib
 from datetime import datetime
 from typing import Any, Dict, List
-from unittest.mock import ANY, patch
+from unittest.mock import ANY, Mock, patch
 
 import msgpack
+import pytest
 from arroyo.backends.kafka import KafkaPayload
+from arroyo.processing.strategies import MessageRejected
 from arroyo.types import BrokerValue, Message, Partition, Topic
 
 from sentry import options
 from sentry.models import File
 from sentry.models.organizationonboardingtask import OnboardingTask, OnboardingTaskStatus
-from sentry.replays.consumers.recording import ProcessReplayRecordingStrategyFactory
+from sentry.replays.consumers.recording import (
+    MessageContext,
+    ProcessReplayRecordingStrategyFactory,
+    RunTaskPerReplay,
+)
 from sentry.replays.lib.storage import FilestoreBlob, RecordingSegmentStorageMeta, StorageBlob
 from sentry.replays.models import ReplayRecordingSegment
 from sentry.testutils import TransactionTestCase
@@ -202,6 +209,17 @@ class RecordingTestCaseMixin:
             user_id=self.organization.default_owner_id,
         )
 
+    @patch("sentry.replays.usecases.ingest.replay_click_post_processor")
+    def test_post_processing_is_deferred(self, mock_post_processor):
+        self.submit(self.nonchunked_messages(segment_id=0))
+
+        # Post-processing runs in its own step with the stored segment.
+        assert mock_post_processor.call_count == 1
+        message, headers, segment_bytes, _ = mock_post_processor.call_args[0]
+        assert message.replay_id == self.replay_id
+        assert headers == {"segment_id": 0}
+        assert segment_bytes == b'[{"hello":"world"}]'
+
 
 # The "filestore" and "storage" drivers should behave identically barring some tweaks to how
 # metadata is tracked and where the data is stored.  The tests are abstracted into a mixin to
@@ -275,3 +293,62 @@ class StorageRecordingTestCase(RecordingTestCaseMixin, TransactionTestCase):
             retention_days=30,
         )
         return StorageBlob().get(recording_segment)
+
+
+def make_message(replay_id: str, offset: int) -> Message[MessageContext]:
+    return Message(
+        BrokerValue(
+            MessageContext({"replay_id": replay_id}, Mock(), Mock()),
+            Partition(Topic("ingest-replay-recordings"), 0),
+            offset,
+            datetime.now(),
+        )
+    )
+
+
+def test_run_task_per_replay_ordering():
+    # The first segment of replay "a" is slow.  The second segment of replay "a" must wait for it
+    # while replay "b" is processed concurrently.
+    release = threading.Event()
+    processed = []
+
+    def process(message):
+        payload = message.payload.message
+        if message.value.offset == 0:
+            assert release.wait(5)
+        processed.append(message.value.offset)
+        if payload["replay_id"] == "b":
+            release.set()
+        return message.value.offset
+
+    next_step = Mock()
+    strategy = RunTaskPerReplay(process, concurrency=2, max_pending_futures=10, next_step=next_step)
+
+    with patch("sentry.replays.consumers.recording.hash", create=True, side_effect=ord):
+        # "a" and "b" are assigned to different executors.
+        strategy.submit(make_message("a", 0))
+        strategy.submit(make_message("a", 1))
+        strategy.submit(make_message("b", 2))
+        strategy.join(5)
+
+    assert processed.index(0) < processed.index(1)
+    assert processed.index(2) < processed.index(0)
+
+    # Results are forwarded in the order the messages were received.
+    assert [call[0][0].payload for call in next_step.submit.call_args_list] == [0, 1, 2]
+
+
+def test_run_task_per_replay_backpressure():
+    next_step = Mock()
+    strategy = RunTaskPerReplay(
+        lambda message: None, concurrency=1, max_pending_futures=1, next_step=next_step
+    )
+
+    strategy.submit(make_message("a", 0))
+    with pytest.raises(MessageRejected):
+        strategy.submit(make_message("a", 1))
+
+    # A rejected message is kept and forwarded once the next step accepts it.
+    next_step.submit.side_effect = [MessageRejected, None]
+    strategy.join(5)
+    assert next_step.submit.call_count == 2
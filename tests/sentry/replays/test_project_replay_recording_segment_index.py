@@ -4,10 +4,12 @@ import zlib
 from collections import namedtuple
 
 from django.urls import reverse
+from django.utils import timezone
 
 from sentry.replays.lib.storage import FilestoreBlob, RecordingSegmentStorageMeta, StorageBlob
 from sentry.replays.testutils import mock_replay
 from sentry.testutils import APITestCase, ReplaysSnubaTestCase, TransactionTestCase
+from sentry.testutils.helpers.datetime import iso_format
 from sentry.testutils.silo import region_silo_test
 
 Message = namedtuple("Message", ["project_id", "replay_id"])
@@ -79,6 +81,53 @@ class ProjectReplayRecordingSegmentIndexMixin:
             response.streaming_content
         )
 
+    def test_index_download_prefetch(self):
+        for i in range(0, 5):
+            self.save_recording_segment(i, f'[{{"test":"hello {i}"}}]'.encode())
+
+        with self.feature("organizations:session-replay"), self.options(
+            {"replay.reader.prefetch-segments": 2}
+        ):
+            response = self.client.get(self.url + "?download")
+
+        assert response.status_code == 200
+        assert b"".join(response.streaming_content) == b"[%s]" % b",".join(
+            f'[{{"test":"hello {i}"}}]'.encode() for i in range(0, 5)
+        )
+
+    def test_index_download_time_range(self):
+        self.save_recording_segment(0, b'[{"test":"hello 0"}]')
+        now = timezone.now()
+
+        with self.feature("organizations:session-replay"):
+            response = self.client.get(
+                self.url,
+                {
+                    "download": "true",
+                    "start": iso_format(now - datetime.timedelta(hours=1)),
+                    "end": iso_format(now + datetime.timedelta(hours=1)),
+                },
+            )
+        assert response.status_code == 200
+        assert b"".join(response.streaming_content) == b'[[{"test":"hello 0"}]]'
+
+        with self.feature("organizations:session-replay"):
+            response = self.client.get(
+                self.url,
+                {
+                    "download": "true",
+                    "start": iso_format(now + datetime.timedelta(hours=1)),
+                    "end": iso_format(now + datetime.timedelta(hours=2)),
+                },
+            )
+        assert response.status_code == 200
+        assert b"".join(response.streaming_content) == b"[]"
+
+    def test_index_download_invalid_time_range(self):
+        with self.feature("organizations:session-replay"):
+            response = self.client.get(self.url, {"download": "true", "start": "yesterday"})
+        assert response.status_code == 400
+
 
 @region_silo_test
 class FilestoreProjectReplayRecordingSegmentIndexTestCase(
@@ -1,6 +1,9 @@
 import uuid
+import zlib
 from unittest import mock
 
+from sentry.replays.usecases.ingest import iter_decompressed
+from sentry.replays.usecases.ingest.dom_index import iter_segment_events
 from sentry.utils import json
 from src.sentry.replays.usecases.ingest.dom_index import (
     encode_as_uuid,
@@ -304,3 +307,36 @@ def test_parse_request_response_old_format_request_and_response():
             mock.call("replays.usecases.ingest.request_body_size", 1002),
             mock.call("replays.usecases.ingest.response_body_size", 8001),
         ]
+
+
+def test_iter_segment_events():
+    events = [
+        {"type": 2, "data": {"node": {"textContent": 'breadcrumb "}]' * 100}}},
+        {"type": 5, "data": {"tag": "breadcrumb", "payload": {"message": 'a\\"}{['}}},
+        {"type": 3, "data": {"source": 2, "positions": [{"x": 1}, {"y": 2}]}},
+        {"type": 5, "data": {"tag": "performanceSpan", "payload": {"op": "resource.xhr"}}},
+    ]
+    data = json.dumps(events).encode()
+
+    for segment in (data, zlib.compress(data)):
+        # Chunks end within strings and escape sequences.
+        with mock.patch("sentry.replays.usecases.ingest.DECOMPRESS_CHUNK_SIZE", 3):
+            chunks = list(iter_decompressed(segment))
+        assert b"".join(chunks) == data
+
+        assert list(iter_segment_events(chunks)) == [events[1], events[3]]
+
+
+def test_iter_segment_events_too_large():
+    events = [
+        {"type": 5, "data": {"tag": "breadcrumb", "payload": {"message": "a" * 100}}},
+        {"type": 5, "data": {"tag": "breadcrumb", "payload": {"message": "b"}}},
+    ]
+    data = json.dumps(events).encode()
+    chunks = [data[i : i + 10] for i in range(0, len(data), 10)]
+
+    with mock.patch(
+        "sentry.replays.usecases.ingest.dom_index.MAX_STREAMED_EVENT_SIZE", 100
+    ), mock.patch("sentry.utils.metrics.incr") as incr:
+        assert list(iter_segment_events(chunks)) == [events[1]]
+        incr.assert_called_once_with("replays.usecases.ingest.dom_index.event_too_large")
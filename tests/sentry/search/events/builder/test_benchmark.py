@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from sentry.api.event_search import _parse_search_grammar
+from sentry.discover.arithmetic import _parse_arithmetic, categorize_columns
+from sentry.models.dashboard import PREBUILT_DASHBOARDS
+from sentry.search.events.builder import QueryBuilder
+from sentry.testutils.skips import requires_benchmark
+from sentry.utils.snuba import Dataset
+
+# Widgets of performance dashboards typically combine several aggregates with
+# equations on top of them.
+EQUATION_WIDGETS = [
+    {
+        "fields": [
+            "transaction",
+            "count()",
+            "count_if(transaction.duration,greater,300)",
+            "p50(transaction.duration)",
+            "p95(transaction.duration)",
+            "failure_count()",
+            "equation|count_if(transaction.duration,greater,300) / count()",
+            "equation|p95(transaction.duration) - p50(transaction.duration)",
+            "equation|failure_count() / count() * 100",
+            "equation|(p95(transaction.duration) + p50(transaction.duration)) / 2",
+        ],
+        "conditions": "event.type:transaction transaction.op:http.server !transaction:/health*",
+        "orderby": "-count()",
+    },
+    {
+        "fields": [
+            "release",
+            "count()",
+            "count_unique(user)",
+            "equation|count() / count_unique(user)",
+        ],
+        "conditions": "!event.type:transaction (level:error OR level:fatal) has:release",
+        "orderby": "-count_unique(user)",
+    },
+    {
+        "fields": [
+            "avg(measurements.lcp)",
+            "avg(measurements.fcp)",
+            "p75(measurements.cls)",
+            "equation|avg(measurements.lcp) - avg(measurements.fcp)",
+            "equation|avg(measurements.lcp) / 1000",
+        ],
+        "conditions": "event.type:transaction has:measurements.lcp measurements.lcp:<10000",
+        "orderby": "",
+    },
+]
+
+WIDGET_QUERIES = [
+    (query["fields"], query["conditions"], query["orderby"])
+    for dashboard in PREBUILT_DASHBOARDS.values()
+    for widget in dashboard["widgets"]
+    if widget["widgetType"] == "discover"
+    for query in widget["queries"]
+] + [(widget["fields"], widget["conditions"], widget["orderby"]) for widget in EQUATION_WIDGETS]
+
+
+@requires_benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("memoized", [True, False], ids=["memoized", "cold"])
+def test_benchmark_dashboard_widgets(default_project, memoized, benchmark):
+    def setup():
+        if not memoized:
+            _parse_search_grammar.cache_clear()
+            _parse_arithmetic.cache_clear()
+
+        # Only the time range changes between requests of the same dashboard.
+        end = timezone.now()
+        params = {
+            "organization_id": default_project.organization_id,
+            "project_id": [default_project.id],
+            "start": end - timedelta(days=1),
+            "end": end,
+        }
+        return (params,), {}
+
+    benchmark.pedantic(build_widget_queries, setup=setup, rounds=50)
+
+
+def build_widget_queries(params):
+    for fields, conditions, orderby in WIDGET_QUERIES:
+        equations, selected_columns = categorize_columns(fields)
+        QueryBuilder(
+            Dataset.Discover,
+            params,
+            query=conditions,
+            selected_columns=selected_columns,
+            equations=equations,
+            orderby=orderby or None,
+        )
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+import pytz
+
+from sentry.api.serializers.snuba import SnubaTSResultSerializer
+from sentry.snuba.discover import zerofill
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.skips import requires_benchmark
+from sentry.utils import json
+from sentry.utils.snuba import SnubaTSResult, _bulk_snuba_query, _identity
+
+ROLLUP = 60
+BUCKETS = 1000
+TOP_EVENTS = 10
+
+END = datetime(2022, 11, 1, tzinfo=pytz.utc)
+START = END - timedelta(seconds=ROLLUP * BUCKETS)
+
+# A top events timeseries response: one row per event and bucket.
+RESPONSE = json.dumps(
+    {
+        "data": [
+            {
+                "transaction": f"/api/{event}/",
+                "time": (START + timedelta(seconds=ROLLUP * bucket)).isoformat(),
+                "count": bucket * event,
+            }
+            for bucket in range(BUCKETS)
+            for event in range(TOP_EVENTS)
+        ],
+        "meta": [
+            {"name": "transaction", "type": "String"},
+            {"name": "time", "type": "DateTime('Universal')"},
+            {"name": "count", "type": "UInt64"},
+        ],
+    }
+).encode("utf-8")
+
+
+@requires_benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("fast", [True, False], ids=["rapidjson", "simplejson"])
+def test_benchmark_top_events_results(fast, benchmark):
+    # Translating rows that don't need any translation is skipped for `_identity`.
+    reverse = _identity if fast else lambda row: row
+    response = mock.Mock(status=200, data=RESPONSE)
+
+    with override_options({"snuba.results.use-rapidjson": fast}), mock.patch(
+        "sentry.utils.snuba._legacy_snql_query", return_value=(response, _identity, reverse)
+    ):
+        benchmark.pedantic(build_top_events_results, rounds=20)
+
+
+def build_top_events_results():
+    [result] = _bulk_snuba_query([({}, _identity, _identity)], {"referer": "benchmark"})
+
+    rows_by_event = {}
+    for row in result["data"]:
+        rows_by_event.setdefault(row["transaction"], []).append(row)
+
+    serializer = SnubaTSResultSerializer(None, None, None)
+    return {
+        event: serializer.serialize(
+            SnubaTSResult({"data": zerofill(rows, START, END, ROLLUP, "time")}, START, END, ROLLUP),
+            "count",
+        )
+        for event, rows in rows_by_event.items()
+    }
@@ -20,6 +20,7 @@ from sentry.snuba.query_subscription_consumer import (
     InvalidSchemaError,
     QuerySubscriptionStrategyFactory,
     parse_message_value,
+    register_batch_subscriber,
     register_subscriber,
     subscriber_registry,
 )
@@ -117,6 +118,57 @@ class HandleMessageTest(BaseQuerySubscriptionTest, TestCase):
         )
         mock_callback.assert_called_once_with(data["payload"], sub)
 
+    def test_arroyo_consumer_batched(self):
+        registration_key = "registered_test_batched"
+        mock_callback = mock.Mock()
+        mock_batch_callback = mock.Mock()
+        register_subscriber(registration_key)(mock_callback)
+        register_batch_subscriber(registration_key)(mock_batch_callback)
+        with self.tasks():
+            snuba_query = create_snuba_query(
+                SnubaQuery.Type.ERROR,
+                Dataset.Events,
+                "hello",
+                "count()",
+                timedelta(minutes=10),
+                timedelta(minutes=1),
+                None,
+            )
+            sub = create_snuba_subscription(self.project, registration_key, snuba_query)
+        sub.refresh_from_db()
+
+        commit = mock.Mock()
+        partition = Partition(Topic("test"), 0)
+        strategy = QuerySubscriptionStrategyFactory(
+            self.topic, max_batch_size=2
+        ).create_with_partitions(commit, {partition: 0})
+
+        payloads = []
+        for offset, timestamp in enumerate(["2020-01-01T01:23:45", "2020-01-01T01:24:45"]):
+            data = deepcopy(self.valid_wrapper)
+            data["payload"]["subscription_id"] = sub.subscription_id
+            data["payload"]["timestamp"] = timestamp
+            strategy.submit(
+                Message(
+                    BrokerValue(
+                        KafkaPayload(b"key", json.dumps(data).encode("utf-8"), []),
+                        partition,
+                        offset,
+                        datetime.now(),
+                    )
+                )
+            )
+
+            payload = data["payload"]
+            payload["values"] = payload["result"]
+            payload["timestamp"] = parse_date(timestamp).replace(tzinfo=pytz.utc)
+            payloads.append(payload)
+        strategy.join()
+
+        mock_batch_callback.assert_called_once_with([(payload, sub) for payload in payloads])
+        assert not mock_callback.called
+        commit.assert_any_call({partition: 2})
+
 
 class ParseMessageValueTest(BaseQuerySubscriptionTest, unittest.TestCase):
     def run_test(self, message):
@@ -0,0 +1,88 @@
+from unittest import mock
+
+import pytest
+
+from sentry.stacktraces.processing import (
+    StacktraceProcessor,
+    frame_memoization_cache,
+    process_stacktraces,
+)
+from sentry.testutils.helpers.options import override_options
+
+
+class MemoizingProcessor(StacktraceProcessor):
+    process_frame_calls = 0
+
+    def handles_frame(self, frame, stacktrace_info):
+        return "function" in frame
+
+    def get_frame_memoization_key(self, processable_frame):
+        if processable_frame.frame["function"] == "volatile":
+            return None
+        return [processable_frame.frame]
+
+    def process_frame(self, processable_frame, processing_task):
+        MemoizingProcessor.process_frame_calls += 1
+        frame = processable_frame.frame
+        if frame["function"] == "noop":
+            return None
+        new_frame = dict(frame, function=frame["function"].upper())
+        return [new_frame], [frame], []
+
+
+def make_event(project_id, functions):
+    return {
+        "project": project_id,
+        "platform": "python",
+        "stacktrace": {"frames": [{"function": function} for function in functions]},
+    }
+
+
+@pytest.fixture
+def memoization():
+    MemoizingProcessor.process_frame_calls = 0
+    frame_memoization_cache.clear()
+    with override_options({"processing.frame-memoization-cache-size": 100}):
+        yield
+    frame_memoization_cache.clear()
+
+
+@pytest.mark.django_db
+@mock.patch("sentry.stacktraces.processing.metrics")
+def test_frame_results_are_memoized_across_events(mock_metrics, memoization, default_project):
+    def process(functions):
+        data = make_event(default_project.id, functions)
+        process_stacktraces(
+            data,
+            make_processors=lambda data, infos: [MemoizingProcessor(data, infos, default_project)],
+        )
+        return [frame["function"] for frame in data["stacktrace"]["frames"]]
+
+    assert process(["foo", "noop", "volatile"]) == ["FOO", "noop", "VOLATILE"]
+    assert MemoizingProcessor.process_frame_calls == 3
+
+    assert process(["foo", "noop", "volatile"]) == ["FOO", "noop", "VOLATILE"]
+    # Only the frame without a memoization key is processed again.
+    assert MemoizingProcessor.process_frame_calls == 4
+
+    hits = [
+        call[1]["tags"]["hit"]
+        for call in mock_metrics.incr.call_args_list
+        if call[0][0] == "stacktraces.processing.frame_memoization"
+    ]
+    assert hits == [False, False, True, True]
+
+
+@pytest.mark.django_db
+def test_memoized_frames_are_copied(memoization, default_project):
+    first = make_event(default_project.id, ["foo"])
+    second = make_event(default_project.id, ["foo"])
+
+    for data in (first, second):
+        process_stacktraces(
+            data,
+            make_processors=lambda data, infos: [MemoizingProcessor(data, infos, default_project)],
+        )
+
+    first["stacktrace"]["frames"][0]["in_app"] = True
+    assert "in_app" not in second["stacktrace"]["frames"][0]
@@ -1,6 +1,6 @@
 import pytest
 
-from sentry.utils.datastructures import BidirectionalMapping
+from sentry.utils.datastructures import BidirectionalMapping, LRUCache
 
 
 def test_bidirectional_mapping():
@@ -30,3 +30,46 @@ def test_bidirectional_mapping():
     del value["c"]
 
     assert len(value) == len(value.inverse()) == 2
+
+
+def test_lru_cache():
+    cache = LRUCache(max_size=3)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    # Touch "a" so that "b" becomes the least recently used entry.
+    assert cache.get("a") == 1
+
+    assert cache.set("d", 4) == 1
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.get("b", "default") == "default"
+    assert [cache.get(key) for key in "acd"] == [1, 3, 4]
+
+    cache.delete("a")
+    assert len(cache) == cache.size == 2
+
+
+def test_lru_cache_sizes():
+    max_size = [10]
+    cache = LRUCache(max_size=lambda: max_size[0])
+
+    cache.set("a", 1, size=4)
+    cache.set("b", 2, size=4)
+    # Entries bigger than the whole cache are not stored.
+    assert cache.set("c", 3, size=11) == 0
+    assert "c" not in cache
+    assert cache.size == 8
+
+    # Replacing an entry accounts for the size of the previous one.
+    cache.set("b", 2, size=6)
+    assert cache.size == 10
+    assert len(cache) == 2
+
+    max_size[0] = 6
+    assert cache.set("d", 4, size=1) == 2
+    assert cache.size == 1
+
+    cache.clear()
+    assert len(cache) == cache.size == 0
@@ -1,3 +1,4 @@
+import threading
 import unittest
 from datetime import datetime, timedelta
 from unittest import mock
@@ -8,11 +9,14 @@ from django.utils import timezone
 
 from sentry.models import GroupRelease, Project, Release
 from sentry.testutils import TestCase
+from sentry.testutils.helpers.options import override_options
 from sentry.utils.snuba import (
     Dataset,
+    QueryExecutionTimeMaximum,
     SnubaQueryParams,
     UnqualifiedQueryError,
     _prepare_query_params,
+    bulk_snql_query_partial,
     get_json_type,
     get_query_params_to_update_for_projects,
     get_snuba_column_name,
@@ -296,6 +300,62 @@ class PrepareQueryParamsTest(TestCase):
         assert kwargs == snuba_params.kwargs
 
 
+@override_options(
+    {
+        "snuba.partial-results.enabled": True,
+        "snuba.partial-results.timeout": 0.5,
+        "snuba.partial-results.max-concurrency": 2,
+    }
+)
+class BulkSnqlQueryPartialTest(TestCase):
+    def test_all_queries_finish(self):
+        with mock.patch(
+            "sentry.utils.snuba.raw_snql_query",
+            side_effect=lambda request, *args: {"data": request},
+        ) as mock_query:
+            assert bulk_snql_query_partial(["a", "b", "c"], "referrer") == [
+                {"data": "a"},
+                {"data": "b"},
+                {"data": "c"},
+            ]
+        assert mock_query.call_count == 3
+
+    def test_timed_out_queries(self):
+        released = threading.Event()
+
+        def query(request, *args):
+            if request == "slow":
+                released.wait()
+            elif request == "limited":
+                raise QueryExecutionTimeMaximum()
+            return {"data": request}
+
+        try:
+            with mock.patch("sentry.utils.snuba.raw_snql_query", side_effect=query) as mock_query:
+                results = bulk_snql_query_partial(
+                    ["slow", "limited", "fast", "slow", "skipped"], "referrer"
+                )
+        finally:
+            released.set()
+
+        assert results == [None, None, {"data": "fast"}, None, None]
+        # The last query never started since the slow queries occupied all slots until the deadline
+        assert "skipped" not in [call.args[0] for call in mock_query.call_args_list]
+
+    def test_errors(self):
+        with mock.patch(
+            "sentry.utils.snuba.raw_snql_query", side_effect=UnqualifiedQueryError()
+        ), pytest.raises(UnqualifiedQueryError):
+            bulk_snql_query_partial(["a"], "referrer")
+
+    def test_disabled(self):
+        with override_options({"snuba.partial-results.enabled": False}), mock.patch(
+            "sentry.utils.snuba.bulk_snql_query", return_value=[{"data": "a"}]
+        ) as mock_query:
+            assert bulk_snql_query_partial(["a"], "referrer") == [{"data": "a"}]
+        mock_query.assert_called_once_with(["a"], "referrer", False)
+
+
 class QuantizeTimeTest(unittest.TestCase):
     def setUp(self):
         self.now = timezone.now().replace(microsecond=0)
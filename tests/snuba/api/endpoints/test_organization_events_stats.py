@@ -19,6 +19,7 @@ from sentry.testutils import APITestCase, SnubaTestCase
 from sentry.testutils.helpers.datetime import before_now, iso_format
 from sentry.testutils.silo import region_silo_test
 from sentry.utils.samples import load_data
+from sentry.utils.snuba import QueryExecutionTimeMaximum, raw_snql_query
 from tests.sentry.issues.test_utils import SearchIssueTestMixin
 
 pytestmark = pytest.mark.sentry_metrics
@@ -797,7 +798,7 @@ class OrganizationEventsStatsEndpointTest(APITestCase, SnubaTestCase, SearchIssu
 
         assert mock_query.call_count == 1
 
-    @mock.patch("sentry.snuba.discover.bulk_snql_query", return_value=[{"data": []}])
+    @mock.patch("sentry.snuba.discover.bulk_snql_query_partial", return_value=[{"data": []}])
     def test_invalid_interval(self, mock_query):
         self.do_request(
             data={
@@ -941,6 +942,37 @@ class OrganizationEventsStatsEndpointTest(APITestCase, SnubaTestCase, SearchIssu
             [{"count": 2, "comparisonCount": 1}],
         ]
 
+    def test_comparison_timed_out(self):
+        self.store_event(
+            data={
+                "timestamp": iso_format(self.day_ago + timedelta(days=-1, minutes=1)),
+            },
+            project_id=self.project.id,
+        )
+
+        # With a concurrency of 1, the comparison query is the second one to run
+        query_fns = iter([raw_snql_query, mock.Mock(side_effect=QueryExecutionTimeMaximum)])
+        with self.options(
+            {"snuba.partial-results.enabled": True, "snuba.partial-results.max-concurrency": 1}
+        ), mock.patch(
+            "sentry.utils.snuba.raw_snql_query", side_effect=lambda *args: next(query_fns)(*args)
+        ):
+            response = self.do_request(
+                data={
+                    "start": iso_format(self.day_ago),
+                    "end": iso_format(self.day_ago + timedelta(hours=2)),
+                    "interval": "1h",
+                    "comparisonDelta": int(timedelta(days=1).total_seconds()),
+                }
+            )
+        assert response.status_code == 200, response.content
+
+        assert [attrs for time, attrs in response.data["data"]] == [
+            [{"count": 1, "comparisonCount": 0}],
+            [{"count": 2, "comparisonCount": 0}],
+        ]
+        assert response.data["errors"] == [{"query": "comparison", "type": "timeout"}]
+
     def test_comparison_invalid(self):
         response = self.do_request(
             data={
@@ -2315,7 +2347,9 @@ class OrganizationEventsStatsTopNEvents(APITestCase, SnubaTestCase):
         assert other["order"] == 5
         assert [{"count": 0.03}] in [attrs for _, attrs in other["data"]]
 
-    @mock.patch("sentry.snuba.discover.bulk_snql_query", return_value=[{"data": [], "meta": []}])
+    @mock.patch(
+        "sentry.snuba.discover.bulk_snql_query_partial", return_value=[{"data": [], "meta": []}]
+    )
     @mock.patch(
         "sentry.search.events.builder.discover.raw_snql_query",
         return_value={"data": [], "meta": []},
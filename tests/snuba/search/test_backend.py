@@ -32,7 +32,7 @@ from sentry.search.snuba.backend import (
     CdcEventsDatasetSnubaSearchBackend,
     EventsDatasetSnubaSearchBackend,
 )
-from sentry.search.snuba.executors import InvalidQueryForExecutor
+from sentry.search.snuba.executors import InvalidQueryForExecutor, PostgresSnubaQueryExecutor
 from sentry.testutils import SnubaTestCase, TestCase, xfail_if_not_postgres
 from sentry.testutils.helpers import Feature
 from sentry.testutils.helpers.datetime import before_now, iso_format
@@ -1349,6 +1349,41 @@ class EventsSnubaSearchTest(SharedSnubaTest):
         finally:
             options.set("snuba.search.max-pre-snuba-candidates", prev_max_pre)
 
+    def test_streaming_post_filtering(self):
+        with self.options(
+            {
+                "snuba.search.max-pre-snuba-candidates": 1,
+                "snuba.search.streaming-post-filter": True,
+            }
+        ):
+            results = self.make_query(sort_by="freq", count_hits=True)
+            assert set(results) == {self.group1, self.group2}
+            assert results.hits == 2
+
+            results = self.make_query(sort_by="freq", limit=1)
+            assert len(results) == 1
+            assert results.next.has_results
+
+    def test_hits_estimate_cache(self):
+        with self.options(
+            {
+                "snuba.search.max-pre-snuba-candidates": 1,
+                "snuba.search.hits-estimate-cache-ttl": 60,
+            }
+        ):
+            assert self.make_query(sort_by="freq", count_hits=True).hits == 2
+
+            original_snuba_search = PostgresSnubaQueryExecutor.snuba_search
+            with mock.patch.object(
+                PostgresSnubaQueryExecutor,
+                "snuba_search",
+                side_effect=original_snuba_search,
+                autospec=True,
+            ) as snuba_search:
+                assert self.make_query(sort_by="freq", count_hits=True).hits == 2
+
+            assert not any(call.kwargs.get("get_sample") for call in snuba_search.call_args_list)
+
     def test_optimizer_enabled(self):
         prev_optimizer_enabled = options.get("snuba.search.pre-snuba-candidates-optimizer")
         options.set("snuba.search.pre-snuba-candidates-optimizer", True)
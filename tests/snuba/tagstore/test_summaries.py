@@ -0,0 +1,146 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.utils import timezone
+from freezegun import freeze_time
+
+from sentry.models import Environment
+from sentry.tagstore import summaries
+from sentry.tagstore.snuba.backend import SnubaTagStorage
+from sentry.tasks.deletion.groups import delete_groups
+from sentry.testutils import SnubaTestCase, TestCase
+from sentry.testutils.helpers.datetime import iso_format
+from sentry.testutils.helpers.options import override_options
+
+
+def summarize_key(tag_key):
+    return (
+        tag_key.key,
+        tag_key.count,
+        tag_key.values_seen,
+        sorted(
+            (v.value, v.times_seen, v.first_seen, v.last_seen) for v in tag_key.top_values or []
+        ),
+    )
+
+
+class TagSummariesTest(TestCase, SnubaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ts = SnubaTagStorage()
+        self.now = timezone.now().replace(microsecond=0)
+        self.project.update(first_event=self.now - timedelta(seconds=30))
+
+        self.events = events = [
+            self.store_event(
+                data={
+                    "message": "message",
+                    "environment": environment,
+                    "fingerprint": [fingerprint],
+                    "timestamp": iso_format(self.now - timedelta(seconds=seconds)),
+                    "tags": tags,
+                },
+                project_id=self.project.id,
+            )
+            for environment, fingerprint, seconds, tags in [
+                ("production", "group-1", 1, {"foo": "bar", "baz": "quux"}),
+                ("production", "group-1", 2, {"foo": "bar", "baz": "corge"}),
+                ("staging", "group-1", 3, {"foo": "qux"}),
+                ("production", "group-2", 4, {"browser": "chrome"}),
+            ]
+        ]
+        self.group = events[0].group
+        self.environment = Environment.objects.get(
+            organization_id=self.organization.id, name="production"
+        )
+
+        # Summarizing started shortly before the first event of the project.
+        with override_options({"tagstore.summaries.write-enabled": True}), freeze_time(
+            self.now - timedelta(minutes=1)
+        ):
+            for event in events:
+                summaries.record_event(event)
+
+    def query_all(self):
+        return [
+            sorted(map(summarize_key, self.ts.get_tag_keys(self.project.id, None))),
+            sorted(map(summarize_key, self.ts.get_tag_keys(self.project.id, self.environment.id))),
+            summarize_key(self.ts.get_tag_key(self.project.id, self.environment.id, "foo")),
+            summarize_key(self.ts.get_group_tag_key(self.group, None, "foo")),
+            sorted(map(summarize_key, self.ts.get_group_tag_keys(self.group, []))),
+            sorted(
+                map(
+                    summarize_key,
+                    self.ts.get_group_tag_keys_and_top_values(self.group, [self.environment.id]),
+                )
+            ),
+        ]
+
+    def test_matches_snuba(self):
+        expected = self.query_all()
+
+        with override_options({"tagstore.summaries.read-enabled": True}), mock.patch(
+            "sentry.utils.snuba.query", side_effect=AssertionError("snuba was queried")
+        ):
+            assert self.query_all() == expected
+
+    def test_get_days(self):
+        today = int(self.now.timestamp()) // summaries.DAY
+        first_day = int(self.group.first_seen.timestamp()) // summaries.DAY
+        midnight = self.now.replace(hour=0, minute=0, second=0)
+
+        with override_options({"tagstore.summaries.read-enabled": True}):
+            assert summaries.get_days(self.project.id, self.group, None, None) == list(
+                range(first_day, today + 1)
+            )
+            assert summaries.get_days(self.project.id, None, midnight, None) == [today]
+
+            # Windows starting after the first event have to be aligned with the buckets.
+            start = self.now - timedelta(seconds=1)
+            assert summaries.get_days(self.project.id, None, start, None) is None
+
+    def test_falls_back_without_coverage(self):
+        expected = self.query_all()
+        summaries.get_redis_client().delete(summaries._get_coverage_key(self.project.id))
+
+        with override_options({"tagstore.summaries.read-enabled": True}):
+            assert summaries.get_days(self.project.id, None, None, None) is None
+            assert self.query_all() == expected
+
+    def test_falls_back_for_stale_group(self):
+        expected = self.query_all()
+        summaries.mark_groups_stale([self.group.id])
+
+        with override_options({"tagstore.summaries.read-enabled": True}):
+            assert summaries.get_days(self.project.id, self.group, None, None) is None
+            assert summaries.get_days(self.project.id, None, None, None) is not None
+            assert self.query_all() == expected
+
+    def test_respects_retention(self):
+        today = int(self.now.timestamp()) // summaries.DAY
+        first_day = int(self.group.first_seen.timestamp()) // summaries.DAY
+        start = self.now.replace(hour=0, minute=0, second=0) - timedelta(days=2)
+
+        with override_options({"tagstore.summaries.read-enabled": True}), mock.patch(
+            "sentry.quotas.get_event_retention", return_value=1
+        ):
+            assert summaries.get_days(self.project.id, None, start, None) is None
+            assert summaries.get_days(self.project.id, self.group, None, None) == list(
+                range(first_day, today + 1)
+            )
+
+    def test_records_events_once(self):
+        with override_options({"tagstore.summaries.read-enabled": True}):
+            expected = self.query_all()
+
+            with override_options({"tagstore.summaries.write-enabled": True}):
+                summaries.record_event(self.events[0])
+
+            assert self.query_all() == expected
+
+    def test_falls_back_after_group_deletion(self):
+        with self.tasks():
+            delete_groups(object_ids=[self.group.id])
+
+        with override_options({"tagstore.summaries.read-enabled": True}):
+            assert summaries.get_days(self.project.id, None, None, None) is None